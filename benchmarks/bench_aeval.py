@@ -0,0 +1,65 @@
+"""Benchmark for `Stacker.aeval`.
+
+Usage:
+    python benchmarks/bench_aeval.py [n]
+
+Runs `n fib` (24 by default) inside an asyncio event loop next to a task
+that wakes up every millisecond, once with `eval`, which blocks the loop,
+and once with `aeval`. Reports the time the job took and how late the
+ticking task woke up (median and maximum), which is the latency other
+requests in the process would see.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+
+from stacker.stacker import Stacker
+
+FIB = "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun"
+
+
+async def measure(job, label: str) -> None:
+    lags = []
+
+    async def tick() -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0.01)
+    lags.clear()
+    start = time.perf_counter()
+    await job()
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.002)  # the tick that was due during the job
+    ticker.cancel()
+    print(
+        f"{label:<6} job {elapsed:6.2f} s   loop lag: median "
+        f"{statistics.median(lags) * 1e3:6.2f} ms, max {max(lags) * 1e3:7.1f} ms"
+    )
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    stacker = Stacker()
+    stacker.process_expression(FIB)
+    expression = f"{n} fib drop"
+
+    async def blocking() -> None:
+        stacker.eval(expression)
+
+    async def cooperative() -> None:
+        await stacker.aeval(expression)
+
+    await measure(blocking, "eval")
+    await measure(cooperative, "aeval")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""Benchmark for the ahead-of-time compiler.
+
+Usage:
+    python benchmarks/bench_aot.py
+
+Runs a recursive Fibonacci and a loop calling a function, interpreted
+and compiled with `stacker compile`.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from stacker.engine import aot
+from stacker.engine.aot import compile_script
+from stacker.stacker import Stacker
+
+SCRIPTS = {
+    "fib": "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun\n20 fib",
+    "loop": (
+        "{x} {x 3 % 0 == {x} {0} ifelse} $f defun\n"
+        "0 $s set\n1 20000 $i {s i f + $s set} do"
+    ),
+}
+
+
+def bench_interpreted(source: str, number: int = 1, repeat: int = 3) -> float:
+    """Returns the best time of one run in milliseconds."""
+    statements = aot.split_statements(source)
+
+    def run():
+        stacker = Stacker()
+        for statement in statements:
+            stacker.process_expression(statement)
+
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / number * 1e3
+
+
+def bench_compiled(source: str, number: int = 1, repeat: int = 3) -> float:
+    """Returns the best time of one run in milliseconds."""
+    namespace = {"__name__": "compiled"}
+    exec(compile_script(source, "bench.stk"), namespace)
+
+    def run():
+        namespace["run"](Stacker())
+
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / number * 1e3
+
+
+def main() -> None:
+    for name, source in SCRIPTS.items():
+        print(f"{name}: interpreted {bench_interpreted(source):8.1f} ms")
+        print(f"{name}: compiled    {bench_compiled(source):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark for `Stacker.eval_many`.
+
+Usage:
+    python benchmarks/bench_batch.py [items]
+
+Evaluates `items` short expressions (20000 by default) that call a function
+three ways: `Stacker.eval` in a loop, each on a fresh stack; `eval_many` on
+the list of expressions; and `eval_many` on one expression with a binding
+per item. Reports the time per item of each.
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from stacker.data_type import stack_data
+from stacker.stacker import Stacker
+
+
+def main() -> None:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    stacker = Stacker()
+    stacker.process_expression("{x y} {x y * 2 +} $f defun")
+    expressions = [f"{i % 100} 3 f 1 +" for i in range(items)]
+    bindings = [{"n": i % 100} for i in range(items)]
+
+    def loop():
+        return [stacker.eval(e, stack=stack_data())[-1] for e in expressions]
+
+    def batch():
+        return [result.value for result in stacker.eval_many(expressions)]
+
+    def template():
+        return [result.value for result in stacker.eval_many("n 3 f 1 +", bindings)]
+
+    assert loop() == batch() == template()
+    for label, run in (
+        ("eval loop", loop),
+        ("eval_many", batch),
+        ("template", template),
+    ):
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        print(
+            f"{label:10s} {seconds:8.3f} s  ({seconds / items * 1e6:6.1f} us per item)"
+        )
+
+
+if __name__ == "__main__":
+    main()
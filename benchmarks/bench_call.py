@@ -0,0 +1,38 @@
+"""Benchmark for user-defined function calls.
+
+Usage:
+    python benchmarks/bench_call.py
+
+Times the naive recursive Fibonacci of examples/ex09_fibonacci.stk, which
+is dominated by the cost of calling a `defun` function.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from stacker.stacker import Stacker
+
+FIB = "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun"
+
+
+def bench(n: int, number: int = 3) -> float:
+    """Returns the best time of `n fib` in milliseconds."""
+    stacker = Stacker()
+    stacker.process_expression(FIB)
+    code = stacker.compiler.compile_expression(f"{n} fib")
+
+    def run():
+        stacker.stack.clear()
+        stacker.evaluate(code, stack=stacker.stack)
+
+    return min(timeit.repeat(run, number=1, repeat=number)) * 1e3
+
+
+def main() -> None:
+    for n in (10, 15, 20):
+        print(f"fib {n:>2}: {bench(n):10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
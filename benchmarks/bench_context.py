@@ -0,0 +1,58 @@
+"""Benchmark for evaluation contexts.
+
+Usage:
+    python benchmarks/bench_context.py [requests] [threads]
+
+Evaluates `requests` short expressions (5000 by default) that call a shared
+function, each on a new `Stacker()` and on a new `Stacker.context()`, and
+then with contexts on a pool of `threads` threads (4 by default). Also
+reports what creating one interpreter or one context costs.
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+from stacker.stacker import Stacker
+
+DEFINITIONS = "{x y} {x y * 2 +} $f defun {n} {n 1 +} $inc defun"
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    shared = Stacker()
+    shared.process_expression(DEFINITIONS)
+    expressions = [f"{i} 3 f inc" for i in range(requests)]
+
+    def fresh(expression: str):
+        stacker = Stacker()
+        stacker.process_expression(DEFINITIONS)
+        return stacker.eval(expression)[-1]
+
+    def context(expression: str):
+        return shared.context().eval(expression)[-1]
+
+    def pooled():
+        with ThreadPoolExecutor(threads) as pool:
+            return list(pool.map(context, expressions))
+
+    create = timeit.timeit(Stacker, number=1000) / 1000
+    create_context = timeit.timeit(shared.context, number=1000) / 1000
+    print(f"Stacker():          {create * 1e6:8.1f} us")
+    print(f"Stacker.context():  {create_context * 1e6:8.1f} us")
+    for label, run in (
+        ("new Stacker each", lambda: list(map(fresh, expressions))),
+        ("new context each", lambda: list(map(context, expressions))),
+        (f"contexts, {threads} threads", pooled),
+    ):
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        print(
+            f"{label:22s} {seconds:8.3f} s  ({seconds / requests * 1e6:6.1f} us each)"
+        )
+
+
+if __name__ == "__main__":
+    main()
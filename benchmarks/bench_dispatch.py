@@ -0,0 +1,46 @@
+"""Micro benchmarks for operator dispatch.
+
+Usage:
+    python benchmarks/bench_dispatch.py
+
+Each case compiles an expression once and then evaluates it repeatedly,
+so the numbers show the steady-state cost of one operator call (as in a
+loop body), not the cost of parsing.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from stacker.stacker import Stacker
+
+N = 1000
+
+CASES = {
+    "+": "0" + " 1 +" * N,
+    "dup": "1" + " dup drop" * N,
+    "if": " true 1 if drop" * N,
+    "do": "1 %d $i {} do" % N,
+}
+
+
+def bench(expression: str, number: int = 20, repeat: int = 5) -> float:
+    """Returns the best time per operator call in microseconds."""
+    stacker = Stacker()
+    code = stacker.compiler.compile_expression(expression)
+
+    def run():
+        stacker.stack.clear()
+        stacker.evaluate(code, stack=stacker.stack)
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / number / N * 1e6
+
+
+def main() -> None:
+    for name, expression in CASES.items():
+        print(f"{name:>4}: {bench(expression):8.3f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark for higher-order operators given a block.
+
+Usage:
+    python benchmarks/bench_hof.py [n]
+
+Times `xs {2 *} map` and `xs {2 % 0 ==} filter` over a list of `n` numbers
+(1000 by default), on a fresh interpreter and on one with a few hundred
+definitions, and reports the cost per element. The body of the block runs
+once per element, so this is dominated by what it takes to start a call of
+a block; it should not depend on how much the interpreter holds.
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from stacker.stacker import Stacker
+
+
+def bench(stacker: Stacker, expression: str, n: int, number: int = 5) -> float:
+    """Returns the best time per element of `expression` in microseconds."""
+    code = stacker.compiler.compile_expression(expression)
+
+    def run():
+        stacker.evaluate(code, stack=stacker.stack)
+        stacker.stack.clear()
+
+    return min(timeit.repeat(run, number=1, repeat=number)) / n * 1e6
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    fresh = Stacker()
+    warm = Stacker()
+    for i in range(300):
+        warm.process_expression(f"{i} $v{i} set {{x}} {{x {i} +}} $f{i} defun")
+    for stacker in (fresh, warm):
+        stacker.variables["xs"] = list(range(n))
+    for label, expression in (
+        ("map", "xs {2 *} map"),
+        ("filter", "xs {2 % 0 ==} filter"),
+    ):
+        print(
+            f"{label:<7} fresh {bench(fresh, expression, n):7.2f} us/element   "
+            f"warm {bench(warm, expression, n):7.2f} us/element"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark for startup images.
+
+Usage:
+    python benchmarks/bench_image.py [functions] [repeat]
+
+Writes a dotfile that defines `functions` functions (2000 by default) and
+reports the best of `repeat` runs (5 by default) of `stacker -e` loading it
+normally and with `--image`, after one run to write the image. Each run is
+a fresh interpreter with the dotfile as its only user file.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def command_time(args: list[str], env: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, capture_output=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    home = tempfile.mkdtemp()
+    env = dict(os.environ, PYTHONPATH=ROOT, HOME=home)
+    with open(os.path.join(home, ".stackerrc"), "w") as f:
+        for i in range(functions):
+            f.write(f"{{x y}} {{\n    x y * {i} + x -\n}} $f{i} defun\n")
+            f.write(f"{{dup {i} +}} $m{i} defmacro\n")
+    command = [sys.executable, "-m", "stacker", "-e", f"1 2 f{functions - 1}"]
+    subprocess.run([*command, "--image"], check=True, capture_output=True, env=env)
+    cold = command_time(command, env, repeat)
+    warm = command_time([*command, "--image"], env, repeat)
+    print(f"dotfile with {functions} functions and {functions} macros")
+    print(f"load:           {cold * 1e3:8.1f} ms")
+    print(f"restore image:  {warm * 1e3:8.1f} ms  ({cold / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark for startup.
+
+Usage:
+    python benchmarks/bench_import.py [repeat]
+
+Reports the time to import `stacker.stacker` as measured by
+`python -X importtime`, the modules that take longest to import, and the
+wall-clock time of `stacker -e "1 2 +"` (best of `repeat` runs, 5 by
+default). Each measurement runs in a fresh interpreter.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def environment() -> dict:
+    # An empty home directory, so no dotfile or user cache is loaded.
+    home = tempfile.mkdtemp()
+    return dict(os.environ, PYTHONPATH=ROOT, HOME=home)
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    """(self us, cumulative us, module) for every module imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=environment(),
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        times.append((int(own), int(cumulative), name.strip()))
+    return times
+
+
+def command_time(args: list[str], repeat: int) -> float:
+    env = environment()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, capture_output=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    times = import_times("stacker.stacker")
+    total = next(c for _, c, name in times if name == "stacker.stacker") / 1e3
+    print(f"import stacker.stacker: {total:8.1f} ms ({len(times)} modules)")
+    for own, _, name in sorted(times, reverse=True)[:10]:
+        print(f"    {own / 1e3:8.1f} ms  {name}")
+    python = command_time([sys.executable, "-c", "pass"], repeat)
+    stacker = command_time([sys.executable, "-m", "stacker", "-e", "1 2 +"], repeat)
+    print(f"python -c pass:         {python * 1e3:8.1f} ms")
+    print(f'stacker -e "1 2 +":     {stacker * 1e3:8.1f} ms')
+
+
+if __name__ == "__main__":
+    main()
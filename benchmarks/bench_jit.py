@@ -0,0 +1,51 @@
+"""Benchmark for the loop compiler.
+
+Usage:
+    python benchmarks/bench_jit.py
+
+Runs the loop of examples/ex02_square_sum.stk (sum of i^2) interpreted,
+compiled, and as the equivalent Python loop.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from stacker.stacker import Stacker
+
+N = 100000
+LOOP = "0 $s set 1 %d $i {s i 2 ^ + $s set} do s" % N
+
+
+def bench_stacker(jit: bool, number: int = 1, repeat: int = 3) -> float:
+    """Returns the best time per loop iteration in microseconds."""
+    stacker = Stacker(jit=jit)
+    code = stacker.compiler.compile_expression(LOOP)
+
+    def run():
+        stacker.stack.clear()
+        stacker.evaluate(code, stack=stacker.stack)
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / number / N * 1e6
+
+
+def bench_python(number: int = 1, repeat: int = 3) -> float:
+    def run():
+        s = 0
+        for i in range(1, N + 1):
+            s = s + i**2
+        return s
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / number / N * 1e6
+
+
+def main() -> None:
+    print(f"interpreted: {bench_stacker(False):8.3f} us/iteration")
+    print(f"compiled:    {bench_stacker(True):8.3f} us/iteration")
+    print(f"python:      {bench_python():8.3f} us/iteration")
+
+
+if __name__ == "__main__":
+    main()
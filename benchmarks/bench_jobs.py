@@ -0,0 +1,60 @@
+"""Benchmark for `stacker --jobs`.
+
+Usage:
+    python benchmarks/bench_jobs.py [scripts] [jobs]
+
+Writes `scripts` small scripts (48 by default) and runs them twice: once
+with one `stacker script.stk` process per script, one after the other, as a
+shell loop would, and once with `stacker --jobs jobs` (the number of CPUs by
+default), which loads plugins and the library once per worker. Reports the
+wall-clock time of each.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """\
+{{n}} {{n 2 < {{n}} {{n 1 - fib n 2 - fib +}} ifelse}} $fib defun
+{n} fib echo
+"""
+
+
+def run(args: list[str], env: dict, cwd: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "stacker", *args],
+        check=True,
+        capture_output=True,
+        env=env,
+        cwd=cwd,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    tmp = tempfile.mkdtemp()
+    env = dict(os.environ, PYTHONPATH=ROOT, HOME=tmp)
+    scripts = []
+    for i in range(count):
+        scripts.append(f"job{i}.stk")
+        with open(os.path.join(tmp, scripts[-1]), "w") as f:
+            f.write(SCRIPT.format(n=12 + i % 4))
+
+    sequential = sum(run([script], env, tmp) for script in scripts)
+    parallel = run(["--jobs", str(jobs), *scripts], env, tmp)
+    print(f"{count} scripts")
+    print(f"    {'one process each':<18}{sequential:7.2f} s")
+    print(f"    {f'--jobs {jobs}':<18}{parallel:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
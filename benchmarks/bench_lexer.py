@@ -0,0 +1,95 @@
+"""Benchmark for the lexer.
+
+Usage:
+    python benchmarks/bench_lexer.py [megabytes]
+
+Tokenizes a generated script of the given size (4 MB by default) with
+`UnifiedLexer.tokenize` and with the per-character loop it replaced.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+
+from stacker.syntax.parser import UnifiedLexer
+
+STATEMENTS = [
+    "0 $s set",
+    "1 100 $i {s i 2 ^ + $s set} do",
+    "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun",
+    "[1 2 3; 4 5 6] (7 8.5 -9) 'a string' \"another one\" concat",
+    "x 3.14159 * 2 / dup sqrt swap drop",
+]
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """A script of about `size` characters."""
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        line = rng.choice(STATEMENTS)
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def per_character(text: str) -> list[str]:
+    """The per-character tokenizer `UnifiedLexer.tokenize` replaced."""
+    delimiter_mapping = {"[": "]", "(": ")", "{": "}", "'": "'", '"': '"'}
+    tokens = []
+    current_token = ""
+    bracket_stack = []
+    for char in text:
+        if char in delimiter_mapping:
+            if current_token and current_token.strip().isdigit():
+                tokens.append(current_token)
+                current_token = ""
+            if bracket_stack and delimiter_mapping[bracket_stack[-1]] == char:
+                current_token += char
+                bracket_stack.pop()
+                if not bracket_stack:
+                    tokens.append(current_token)
+                    current_token = ""
+            else:
+                bracket_stack.append(char)
+                current_token += char
+        elif bracket_stack:
+            current_token += char
+            if char == delimiter_mapping[bracket_stack[-1]]:
+                bracket_stack.pop()
+                if not bracket_stack:
+                    tokens.append(current_token)
+                    current_token = ""
+        elif char.isspace():
+            if current_token:
+                tokens.append(current_token)
+                current_token = ""
+        else:
+            current_token += char
+    if current_token:
+        tokens.append(current_token)
+    return tokens
+
+
+def bench(tokenize, text: str, repeat: int = 3) -> float:
+    """Returns the best throughput in MB/s."""
+    best = min(timeit.repeat(lambda: tokenize(text), number=1, repeat=repeat))
+    return len(text) / best / 1e6
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    text = generate(int(megabytes * 1e6))
+    assert UnifiedLexer(text).tokenize() == per_character(text)
+    print(f"input:         {len(text) / 1e6:8.1f} MB")
+    print(f"per-character: {bench(per_character, text):8.1f} MB/s")
+    print(
+        f"regex:         {bench(lambda t: UnifiedLexer(t).tokenize(), text):8.1f} MB/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
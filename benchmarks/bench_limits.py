@@ -0,0 +1,76 @@
+"""Benchmark for `Stacker.set_limits`.
+
+Usage:
+    python benchmarks/bench_limits.py [n]
+
+Times `n fib` (20 by default) and a loop of 200000 iterations with no
+limits and with every limit set too high to be reached, which is the
+overhead of the checks, and then how long a runaway loop runs before each
+limit stops it.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from stacker.error import ResourceLimitError
+from stacker.stacker import Stacker
+
+FIB = "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun"
+GENEROUS = dict(
+    max_instructions=10**12,
+    timeout=3600.0,
+    max_stack_depth=10**6,
+    max_call_depth=10**4,
+    max_memory=1 << 34,
+)
+RUNAWAY = "{1} 1000000000 times"
+
+
+def best(stacker: Stacker, expression: str, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        stacker.stack.clear()
+        start = time.perf_counter()
+        stacker.eval(expression)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    stacker = Stacker()
+    stacker.process_expression(FIB)
+    for label, expression in (
+        (f"{n} fib", f"{n} fib"),
+        ("loop", "0 {1 +} 200000 times"),
+    ):
+        stacker.set_limits()
+        plain = best(stacker, expression)
+        stacker.set_limits(**GENEROUS)
+        limited = best(stacker, expression)
+        print(
+            f"{label:<10} no limits {plain * 1e3:8.1f} ms   "
+            f"limits {limited * 1e3:8.1f} ms ({limited / plain - 1:+.1%})"
+        )
+
+    for limit, value in (
+        ("max_instructions", 100_000),
+        ("timeout", 0.1),
+        ("max_stack_depth", 100_000),
+        ("max_memory", 50 << 20),
+    ):
+        stacker.set_limits(**{limit: value})
+        stacker.stack.clear()
+        start = time.perf_counter()
+        try:
+            stacker.eval(RUNAWAY)
+        except ResourceLimitError:
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"runaway stopped by {limit:<16} after {elapsed * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
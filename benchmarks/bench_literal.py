@@ -0,0 +1,59 @@
+"""Benchmark for list literals.
+
+Usage:
+    python benchmarks/bench_literal.py [rows] [columns]
+
+Parses a generated numeric matrix literal (1000 x 50 by default) with
+`parse_literal` and with the format-and-`literal_eval` round trip it
+replaced, then evaluates it as a script.
+"""
+
+from __future__ import annotations
+
+import ast
+import random
+import sys
+import timeit
+
+from stacker.stacker import Stacker
+from stacker.syntax.parser import convert_custom_array_to_proper_list, parse_literal
+
+
+def generate(rows: int, columns: int, seed: int = 0) -> str:
+    """A matrix literal of ints and floats."""
+    rng = random.Random(seed)
+
+    def number() -> str:
+        if rng.random() < 0.5:
+            return str(rng.randint(-999, 999))
+        return f"{rng.uniform(-1e3, 1e3):.6f}"
+
+    lines = (" ".join(number() for _ in range(columns)) for _ in range(rows))
+    return "[" + ";\n".join(lines) + "]"
+
+
+def round_trip(text: str):
+    """The parsing `parse_literal` replaced."""
+    return ast.literal_eval(convert_custom_array_to_proper_list(text))
+
+
+def bench(function, text: str, repeat: int = 3) -> float:
+    """Returns the best time in seconds."""
+    return min(timeit.repeat(lambda: function(text), number=1, repeat=repeat))
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    text = generate(rows, columns)
+    assert parse_literal(text) == round_trip(text)
+    print(f"input:         {len(text) / 1e6:8.2f} MB")
+    print(f"round trip:    {bench(round_trip, text):8.3f} s")
+    print(f"parse_literal: {bench(parse_literal, text):8.3f} s")
+    print(
+        f"script:        {bench(lambda t: Stacker().process_expression(t), text):8.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
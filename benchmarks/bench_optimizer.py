@@ -0,0 +1,39 @@
+"""Benchmark for the constant folding pass.
+
+Usage:
+    python benchmarks/bench_optimizer.py
+
+Runs a loop whose body is made of constant subexpressions at each
+optimization level.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from stacker.stacker import Stacker
+
+N = 10000
+LOOP = "1 %d $i {2 3 + 4 * pi 2 / + [1 2 3] sum + drop} do" % N
+
+
+def bench(opt_level: int, number: int = 3, repeat: int = 3) -> float:
+    """Returns the best time per loop iteration in microseconds."""
+    stacker = Stacker(opt_level=opt_level)
+    code = stacker.compiler.compile_expression(LOOP)
+
+    def run():
+        stacker.stack.clear()
+        stacker.evaluate(code, stack=stacker.stack)
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / number / N * 1e6
+
+
+def main() -> None:
+    for opt_level in (0, 1, 2):
+        print(f"opt-level {opt_level}: {bench(opt_level):8.3f} us/iteration")
+
+
+if __name__ == "__main__":
+    main()
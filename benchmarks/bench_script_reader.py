@@ -0,0 +1,69 @@
+"""Benchmark for splitting scripts into statements.
+
+Usage:
+    python benchmarks/bench_script_reader.py [lines]
+
+Splits a generated script whose body is one block of the given number of
+lines (5000 by default) with `iter_statements` and with the accumulate
+and recount loop it replaced. The old loop is quadratic in the length of
+the block; `iter_statements` is linear.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import timeit
+
+from stacker.include.stk_file_read import iter_statements, read_lines, readtxt
+from stacker.syntax.parser import (
+    is_array_balanced,
+    is_brace_balanced,
+    is_tuple_balanced,
+)
+
+
+def generate(lines: int) -> str:
+    body = "\n".join(f"  s {i} + $s set" for i in range(lines))
+    return f"0 $s set\n{{\n{body}\n}} $f defun\nf s\n"
+
+
+def accumulating(path: str) -> list[str]:
+    """The statement splitting `iter_statements` replaced."""
+    statements = []
+    expression = ""
+    for line in readtxt(path).splitlines():
+        expression += line.strip() + " "
+        if (
+            is_array_balanced(expression)
+            and is_tuple_balanced(expression)
+            and is_brace_balanced(expression)
+            and expression.count('"""') % 2 == 0
+            and expression.count("'''") % 2 == 0
+        ):
+            statements.append(expression)
+            expression = ""
+    return statements
+
+
+def streaming(path: str) -> list[str]:
+    return list(iter_statements(read_lines(path)))
+
+
+def main() -> None:
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    fd, path = tempfile.mkstemp(suffix=".stk")
+    with os.fdopen(fd, "w") as f:
+        f.write(generate(lines))
+    try:
+        assert streaming(path) == accumulating(path)
+        for name, split in (("accumulating", accumulating), ("streaming", streaming)):
+            best = min(timeit.repeat(lambda: split(path), number=1, repeat=3))
+            print(f"{name + ':':14}{best:8.3f} s")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
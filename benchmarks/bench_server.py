@@ -0,0 +1,68 @@
+"""Benchmark for `stacker --serve`.
+
+Usage:
+    python benchmarks/bench_server.py [repeat] [requests]
+
+Starts a server on a temporary socket and reports the best of `repeat`
+runs (5 by default) of `stacker -e "1 2 +"`, of the same expression sent
+with `python -m stacker.client`, and the mean round trip of `requests`
+(10000 by default) expressions sent over one `Client` session.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from stacker.client import Client
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def command_time(args: list[str], env: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, capture_output=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    home = tempfile.mkdtemp()
+    env = dict(os.environ, PYTHONPATH=ROOT, HOME=home)
+    path = os.path.join(home, "stacker.sock")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "stacker", "--serve", path],
+        env=env,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while not os.path.exists(path):
+            time.sleep(0.01)
+        one_shot = command_time(
+            [sys.executable, "-m", "stacker", "-e", "1 2 +"], env, repeat
+        )
+        client = command_time(
+            [sys.executable, "-m", "stacker.client", path, "1 2 +"], env, repeat
+        )
+        with Client(path) as session:
+            start = time.perf_counter()
+            for i in range(requests):
+                session.eval(f"{i} 2 + drop")
+            round_trip = (time.perf_counter() - start) / requests
+    finally:
+        server.terminate()
+        server.wait()
+    print(f'stacker -e "1 2 +":        {one_shot * 1e3:8.1f} ms')
+    print(f"python -m stacker.client:  {client * 1e3:8.1f} ms")
+    print(f"Client.eval round trip:    {round_trip * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
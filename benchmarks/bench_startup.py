@@ -0,0 +1,90 @@
+"""Benchmark for one-shot startup, with a time budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N] [--budget MS]
+
+Runs `stacker -e "1 2 +"` and a one-line script `repeat` times each (10 by
+default), each in a fresh interpreter with an empty home directory, and
+reports the minimum and median wall-clock times. Also checks that neither
+path imports the modules only the REPL needs. Exits with status 1 when the
+median of either command exceeds `budget` milliseconds (250 by default) or
+an interactive dependency was imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the REPL needs but one-shot evaluation must not import.
+INTERACTIVE_MODULES = ("prompt_toolkit", "pkg_resources")
+
+_CHECK = (
+    "import sys, runpy; sys.argv = ['stacker', *sys.argv[1:]]\n"
+    "try:\n"
+    "    runpy.run_module('stacker', run_name='__main__')\n"
+    "finally:\n"
+    "    print(*sorted(m for m in {modules} if m in sys.modules), file=sys.stderr)\n"
+)
+
+
+def run_times(args: list[str], env: dict, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, capture_output=True, env=env)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def imported_interactive(args: list[str], env: dict) -> list[str]:
+    code = _CHECK.format(modules=INTERACTIVE_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    return result.stderr.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=250.0, help="ms")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp()
+    env = dict(os.environ, PYTHONPATH=ROOT, HOME=home)
+    script = os.path.join(home, "bench.stk")
+    with open(script, "w") as f:
+        f.write("1 2 + echo\n")
+
+    ok = True
+    commands = {'stacker -e "1 2 +"': ["-e", "1 2 +"], "stacker script.stk": [script]}
+    for label, command in commands.items():
+        times = run_times([sys.executable, "-m", "stacker", *command], env, args.repeat)
+        median = statistics.median(times) * 1e3
+        loaded = imported_interactive(command, env)
+        over = median > args.budget
+        ok = ok and not over and not loaded
+        print(
+            f"{label:20s} min {min(times) * 1e3:7.1f} ms  median {median:7.1f} ms"
+            + ("  OVER BUDGET" if over else "")
+        )
+        if loaded:
+            print(f"    imported: {' '.join(loaded)}")
+    print(f"budget: {args.budget:.0f} ms")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark for superinstructions.
+
+Usage:
+    python benchmarks/bench_superinstruction.py
+
+Profiles a recursive fib and a square-sum loop, then runs them with and
+without the recorded superinstructions.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import timeit
+
+from stacker.stacker import Stacker
+
+FIB = "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun"
+PROGRAMS = {
+    "fib 18": "18 fib",
+    "square sum": "0 $s set 1 20000 $i {s i dup * + $s set} do s",
+}
+
+
+def new_stacker(profile: str | None) -> Stacker:
+    stacker = Stacker()
+    if profile is not None:
+        stacker.compiler.load_superinstructions(profile)
+    stacker.process_expression(FIB)
+    return stacker
+
+
+def record_profile(path: str) -> None:
+    stacker = Stacker()
+    profiler = stacker.compiler.start_profiling()
+    stacker.process_expression(FIB)
+    for program in PROGRAMS.values():
+        stacker.process_expression(program)
+    profiler.save(path)
+
+
+def bench(program: str, profile: str | None, number: int = 1, repeat: int = 5) -> float:
+    """Returns the best time in milliseconds."""
+    stacker = new_stacker(profile)
+    code = stacker.compiler.compile_expression(program)
+
+    def run():
+        stacker.stack.clear()
+        stacker.evaluate(code, stack=stacker.stack)
+
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / number * 1e3
+
+
+def main() -> None:
+    fd, profile = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        record_profile(profile)
+        for name, program in PROGRAMS.items():
+            plain = bench(program, None)
+            fused = bench(program, profile)
+            print(
+                f"{name:12s} plain {plain:8.2f} ms  fused {fused:8.2f} ms"
+                f"  ({plain / fused:.2f}x)"
+            )
+    finally:
+        os.remove(profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,7 @@ setup(
             "plugins/*",
             "include/*",
             "exec_modes/*",
+            "engine/*",
             "util/*",
             "syntax/*",
             "slib/*",
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
+import importlib
 import os
 
-from stacker import constant, error, stacker
-from stacker.stacker import Stacker
-
 __all__ = ["stacker", "error", "constant", "include", "Stacker"]
 
 # リソースフォルダへのパスを取得する
@@ -15,3 +13,15 @@ plugins_path = os.path.join(os.path.dirname(__file__), "plugins")
 # モジュールにパスを追加する
 __path__.append(resource_path)
 __path__.append(plugins_path)
+
+
+def __getattr__(name: str):
+    # Imported on first use, so that light modules such as `stacker.client`
+    # do not load the interpreter.
+    if name == "Stacker":
+        from stacker.stacker import Stacker
+
+        return Stacker
+    if name in ("stacker", "error", "constant", "include"):
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
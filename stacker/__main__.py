@@ -1,5 +1,7 @@
 import argparse
-import importlib
+import atexit
+import functools
+import hashlib
 import logging
 import os
 import shutil
@@ -7,88 +9,87 @@ import sys
 import traceback
 from pathlib import Path
 
-from pkg_resources import get_distribution
-
 # from stacker.error import LoadPluginError
-from stacker.exec_modes import CommandLineMode, ReplMode, ScriptMode
+from stacker.exec_modes import CommandLineMode, ScriptMode
 
 # from stacker.execution_mode import ScriptMode, ReplMode
-from stacker.lib import disp_logo
-from stacker.lib.config import plugins_dir_path, stacker_dotfile_path
+from stacker.include.image import restore_image, save_image
+from stacker.include.startup import load_startup_state
+from stacker.include.stkc import compiled_cache
+from stacker.lib.config import compiled_cache_dir_path, stacker_dotfile_path
 from stacker.stacker import Stacker
-from stacker.util import colored
-
-parser = argparse.ArgumentParser(description="Stacker command line interface.")
-parser.add_argument(
-    "--addplugin", metavar="path", type=str, help="Path to the plugin to add."
-)
-parser.add_argument("--debug", action="store_true", help="Enable debug mode")
-parser.add_argument("-e", default=None, help="Execute the given command.")
-parser.add_argument("script", nargs="?", default=None, help="Script file to run.")
-argv = parser.parse_args()
+from stacker.syntax.parser import DEFAULT_PARSE_CACHE_SIZE
+from stacker.util.diskcache import DEFAULT_MAX_ENTRIES, DiskCache
 
 sys.setrecursionlimit(1 << 30)
 
 
-def load_stacker_lib(stacker: Stacker, dir_path) -> bool:
-    """Load the Stacker library from the specified directory.
-    :param stacker: The Stacker instance to pass to the plugins.
-    :param dir_path: The directory to load the Stacker library from.
-    :return: None
-    """
-    # Add the library directory path
-    sys.path.insert(0, dir_path)
-    for filename in os.listdir(dir_path):
-        try:
-            if filename.endswith(".stk"):
-                include_stacker_script = Path(dir_path) / filename
-                stacker.include(str(include_stacker_script))
-        except Exception as e:
-            print(colored(f"Failed load slib ({filename}). {e}", "red"))
-            sys.path.pop(0)
-            return False
-    sys.path.pop(0)
-    return True
-
-
-def load_plugins(stacker: Stacker, plugins_dir_path) -> bool:
-    """Load plugins from the plugins directory.
-    :param stacker: The Stacker instance to pass to the plugins.
-    :return: None
+def default_image_path() -> Path:
+    """The startup image for the current directory's plugins and the dotfile."""
+    key = f"{os.getcwd()}\0{stacker_dotfile_path}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return compiled_cache_dir_path / f"startup-{digest}.image"
+
+
+def create_stacker(argv: argparse.Namespace) -> Stacker:
+    """Create a Stacker with the given command line options.
+    :param argv: The parsed command line.
+    :return: The Stacker, with the startup state loaded.
     """
-    # Add the plugin directory path
-    sys.path.insert(0, plugins_dir_path)
-    for filename in os.listdir(plugins_dir_path):
-        try:
-            if filename.endswith(".py") and not filename.startswith("__"):
-                module_name = os.path.splitext(filename)[0]  # remove .py extension
-                plugin_module = importlib.import_module(module_name)
-                plugin_module.setup(stacker)
-                logging.debug(f"Loaded plugin '{module_name}'.")
-        except Exception as e:
-            print(colored(f"Failed load plugin ({filename}). {e}", "red"))
-            sys.path.pop(0)
-            return False
-    sys.path.pop(0)
-    return True
-
-
-def load_dotfile(stacker: Stacker, dotfile_path: str | Path) -> None:
-    """Load the dotfile.
-    :param stacker: The Stacker instance to pass to the plugins.
-    :param dotfile_path: The path to the dotfile.
-    :return: None
+    if argv.no_compiled_cache:
+        compiled_cache.enabled = False
+    rpn_calculator = Stacker(vm=argv.vm, opt_level=argv.opt_level, jit=not argv.no_jit)
+    if argv.memo_cache_dir is not None:
+        rpn_calculator.set_memo_store(
+            DiskCache(argv.memo_cache_dir, max_entries=argv.memo_cache_size)
+        )
+    rpn_calculator.set_parse_cache_size(argv.parse_cache_size)
+    if argv.superinstructions is not None:
+        rpn_calculator.compiler.load_superinstructions(argv.superinstructions)
+    if argv.profile_out is not None:
+        profiler = rpn_calculator.compiler.start_profiling()
+        atexit.register(profiler.save, argv.profile_out)
+
+    if argv.image or argv.image_file is not None:
+        image_file = argv.image_file or default_image_path()
+        if not restore_image(rpn_calculator, image_file):
+            sources = load_startup_state(rpn_calculator)
+            if not save_image(rpn_calculator, image_file, sources):
+                logging.debug(f"Could not write the startup image '{image_file}'.")
+    else:
+        load_startup_state(rpn_calculator)
+    return rpn_calculator
+
+
+def run_batch(parser: argparse.ArgumentParser, argv: argparse.Namespace) -> int:
+    """Run the scripts or the --batch file on a pool of worker processes.
+    :return: The exit status.
     """
-    try:
-        if not os.path.isfile(dotfile_path):
-            print(f"Error: The file '{dotfile_path}' does not exist.")
-            return
-        stacker.include(str(dotfile_path))
-    except Exception as e:
-        print(f"An error occurred while loading the dotfile: {str(e)}")
+    from stacker.exec_modes.batch_mode import BatchMode
+
+    if argv.e is not None or argv.serve is not None:
+        parser.error("-e and --serve cannot be combined with --jobs or --batch")
+    if argv.batch is not None and argv.script:
+        parser.error("--batch cannot be combined with scripts")
+    if argv.profile_out is not None:
+        parser.error("--profile-out cannot be combined with --jobs or --batch")
+    jobs = argv.jobs if argv.jobs is not None else os.cpu_count() or 1
+    if jobs <= 0:
+        parser.error("--jobs must be positive")
+
+    # Each worker creates its own Stacker, once.
+    batch_mode = BatchMode(functools.partial(create_stacker, argv), jobs)
+    if argv.batch is None:
+        return batch_mode.run_scripts(argv.script)
+    if argv.batch == "-":
+        return batch_mode.run_lines(sys.stdin)
+    with open(argv.batch, encoding="utf-8") as lines:
+        return batch_mode.run_lines(lines)
 
 
 def copy_plugin_to_install_dir(plugin_path: str, debug_mode: bool) -> None:
+    from pkg_resources import get_distribution
+
     try:
         # Get the installation directory of Stacker
         stacker_dist = get_distribution("pystacker")
@@ -112,60 +113,252 @@ def copy_plugin_to_install_dir(plugin_path: str, debug_mode: bool) -> None:
             traceback.print_exc()
 
 
-def main():
+def compile_stacker_script(script_path: str, output_path: str | None) -> None:
+    """Compile a Stacker script to a Python module (`stacker compile`)."""
+    from stacker.engine.aot import compile_script
+    from stacker.include.stk_file_read import readtxt
+
+    path = Path(script_path)
+    output = Path(output_path) if output_path else path.with_suffix(".py")
+    try:
+        source = compile_script(readtxt(path), str(path))
+    except Exception as e:
+        print(f"File: {path.resolve()}")
+        print(f"{type(e).__name__}: {e}")
+        sys.exit(1)
+    output.write_text(source, encoding="utf-8")
+    print(f"Compiled '{path}' to '{output}'.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """The parser of the command line, except `stacker compile`."""
+    parser = argparse.ArgumentParser(description="Stacker command line interface.")
+    parser.add_argument(
+        "--addplugin", metavar="path", type=str, help="Path to the plugin to add."
+    )
+    parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument("-e", default=None, help="Execute the given command.")
+    parser.add_argument(
+        "--vm",
+        action="store_true",
+        help="Evaluate with the frame-stack VM (no Python recursion for nested calls).",
+    )
+    parser.add_argument(
+        "--no-jit",
+        action="store_true",
+        help="Do not compile hot do/dolist/times loops to Python.",
+    )
+    parser.add_argument(
+        "script",
+        nargs="*",
+        help="Script file to run. With several, they are run as with --jobs.",
+    )
+    parser.add_argument(
+        "--opt-level",
+        type=int,
+        choices=[0, 1, 2],
+        default=1,
+        help=(
+            "Optimization level: 0 = none, 1 = constant folding (default), "
+            "2 = also drop no-op pairs such as 'dup drop'."
+        ),
+    )
+    parser.add_argument(
+        "--memo-cache-dir",
+        metavar="dir",
+        default=None,
+        help="Keep the results of memoized functions on disk in this directory.",
+    )
+    parser.add_argument(
+        "--memo-cache-size",
+        metavar="n",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="Maximum number of entries in the on-disk memo cache.",
+    )
+    parser.add_argument(
+        "--parse-cache-size",
+        metavar="n",
+        type=int,
+        default=DEFAULT_PARSE_CACHE_SIZE,
+        help="Number of parsed expressions and block bodies to keep in memory.",
+    )
+    parser.add_argument(
+        "--no-compiled-cache",
+        action="store_true",
+        help="Do not read or write compiled scripts (.stkc files).",
+    )
+    parser.add_argument(
+        "--clear-compiled-cache",
+        action="store_true",
+        help=f"Remove the compiled scripts in {compiled_cache_dir_path}.",
+    )
+    parser.add_argument(
+        "--image",
+        action="store_true",
+        help=(
+            "Restore the state left by plugins, the library and the dotfile from "
+            "a startup image, and write the image when it is missing or stale."
+        ),
+    )
+    parser.add_argument(
+        "--image-file",
+        metavar="file",
+        default=None,
+        help=f"Startup image to use with --image (default: in {compiled_cache_dir_path}).",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="socket",
+        default=None,
+        help="Serve evaluation requests on this Unix domain socket.",
+    )
+    parser.add_argument(
+        "--workers",
+        metavar="n",
+        type=int,
+        default=None,
+        help="Number of sessions --serve evaluates at once (default: 4).",
+    )
+    parser.add_argument(
+        "--client",
+        metavar="socket",
+        default=None,
+        help=(
+            "Send the -e expression, or each line of standard input, to the "
+            "server on this socket and print the resulting stack as JSON."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        metavar="n",
+        type=int,
+        default=None,
+        help=(
+            "Run the scripts, or the lines of --batch, on n worker processes "
+            "(default: the number of CPUs)."
+        ),
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="file",
+        default=None,
+        help=(
+            "Evaluate each line of this file ('-' for standard input) on its own "
+            "and print the resulting stack or error, in order."
+        ),
+    )
+    parser.add_argument(
+        "--profile-out",
+        metavar="file",
+        default=None,
+        help="Record the hottest instruction sequences to this superinstruction profile.",
+    )
+    parser.add_argument(
+        "--superinstructions",
+        metavar="file",
+        default=None,
+        help="Fuse the instruction sequences listed in this profile (see --profile-out).",
+    )
+    return parser
+
+
+def build_compile_parser() -> argparse.ArgumentParser:
+    """The parser of `stacker compile`."""
+    compile_parser = argparse.ArgumentParser(
+        prog="stacker compile",
+        description="Compile a Stacker script to a Python module.",
+    )
+    compile_parser.add_argument("script", help="Script file to compile.")
+    compile_parser.add_argument(
+        "-o",
+        "--output",
+        metavar="file",
+        default=None,
+        help="Python file to write (default: the script with a .py suffix).",
+    )
+    return compile_parser
+
+
+def main(args: list[str] | None = None):
     """Main entry point for the Stacker CLI."""
+    if args is None:
+        args = sys.argv[1:]
+    if args[:1] == ["compile"]:
+        argv = build_compile_parser().parse_args(args[1:])
+        compile_stacker_script(argv.script, argv.output)
+        return
+    parser = build_parser()
+    argv = parser.parse_args(args)
+
     # add plugin
     if argv.addplugin:
         copy_plugin_to_install_dir(argv.addplugin, argv.debug)
         return
 
+    if argv.client is not None and (
+        argv.script
+        or argv.serve is not None
+        or argv.batch is not None
+        or argv.jobs is not None
+    ):
+        parser.error(
+            "--client cannot be combined with scripts, --serve, --jobs or --batch"
+        )
+    if argv.serve is not None and (argv.script or argv.e is not None):
+        parser.error("--serve cannot be combined with scripts or -e")
+
+    if argv.client is not None:
+        from stacker.client import run
+
+        sys.exit(run(argv.client, [argv.e] if argv.e is not None else sys.stdin))
+
+    if argv.clear_compiled_cache:
+        compiled_cache.clear()
+        if argv.e is None and not argv.script and argv.batch is None:
+            return
+
     if argv.debug:
         logging.basicConfig(level=logging.DEBUG)
     else:
         logging.basicConfig(level=logging.INFO)
 
-    rpn_calculator = Stacker()
+    if argv.parse_cache_size <= 0:
+        parser.error("--parse-cache-size must be positive")
 
-    # load plugins from the Stacker's installation directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    plugins_dir = os.path.join(script_dir, plugins_dir_path)
-    if not load_plugins(rpn_calculator, plugins_dir):
-        sys.exit(1)
+    if argv.batch is not None or argv.jobs is not None or len(argv.script) > 1:
+        sys.exit(run_batch(parser, argv))
 
-    # load plugins from current directory
-    plugins_dir = os.path.join(os.getcwd(), plugins_dir_path)
-    if Path(plugins_dir).exists():
-        if not load_plugins(rpn_calculator, plugins_dir):
-            sys.exit(1)
+    rpn_calculator = create_stacker(argv)
 
-    # load the Stacker library
-    library_dir = os.path.join(script_dir, "slib")
-    if not load_stacker_lib(rpn_calculator, library_dir):
-        sys.exit(1)
+    if argv.serve is not None:
+        from stacker.exec_modes.server_mode import DEFAULT_WORKERS, ServerMode
+
+        workers = argv.workers if argv.workers is not None else DEFAULT_WORKERS
+        if workers <= 0:
+            parser.error("--workers must be positive")
+        ServerMode(rpn_calculator, workers).run(argv.serve)
+        return
 
     if argv.e is not None:
         # Execute the given command
         commandline_mode = CommandLineMode(rpn_calculator)
-        if stacker_dotfile_path.exists():
-            commandline_mode.execute_stacker_dotfile(stacker_dotfile_path)
         commandline_mode.run(argv.e)
         return
 
     if argv.script:
         # Script Mode
         script_mode = ScriptMode(rpn_calculator)
-        if stacker_dotfile_path.exists():
-            script_mode.execute_stacker_dotfile(stacker_dotfile_path)
         if argv.debug:
             script_mode.debug_mode()
         rpn_calculator.clear_trace()
-        script_mode.run(argv.script)
+        script_mode.run(argv.script[0])
     else:
         # REPL mode
+        from stacker.exec_modes.repl_mode import ReplMode
+        from stacker.lib import disp_logo
+
         repl_mode = ReplMode(rpn_calculator)
-        # execute the dotfile
-        if stacker_dotfile_path.exists():
-            repl_mode.execute_stacker_dotfile(stacker_dotfile_path)
         if argv.debug:
             repl_mode.debug_mode()
         if repl_mode.rpn_calculator.disp_logo_mode:
@@ -0,0 +1,106 @@
+"""Evaluation from asyncio code (see `Stacker.aeval`)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING
+
+from stacker.data_type import stack_data
+from stacker.engine.limits import Guard, Limits
+from stacker.engine.monitor import DEFAULT_INTERVAL
+from stacker.error import EvaluationInterrupted
+
+if TYPE_CHECKING:
+    from stacker.stacker import Stacker
+
+# id of a Stacker -> the lock that makes its `aeval`s run one at a time. Not
+# an attribute, so that a Stacker can still be deep-copied.
+_locks: dict[int, threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+
+class _Interruptible(Guard):
+    """Lets other threads run at every check, and stops the evaluation once
+    it is cancelled or past the deadline of `aeval`. The limits of the
+    Stacker apply as well."""
+
+    def __init__(
+        self, limits: Limits | None, timeout: float | None, interval: int
+    ) -> None:
+        if limits is not None:
+            interval = min(interval, limits.interval)
+        super().__init__(limits, interval)
+        self.stop_at = None if timeout is None else time.monotonic() + timeout
+        self.cancelled = False
+
+    def check(self, stack: stack_data) -> None:
+        time.sleep(0)  # gives up the GIL, so the event loop can run
+        if self.cancelled:
+            raise EvaluationInterrupted("The evaluation was cancelled.")
+        if self.stop_at is not None and time.monotonic() >= self.stop_at:
+            raise EvaluationInterrupted("The evaluation timed out.")
+        super().check(stack)
+
+
+def _lock(stacker: Stacker) -> threading.Lock:
+    with _locks_lock:
+        lock = _locks.get(id(stacker))
+        if lock is None:
+            lock = _locks[id(stacker)] = threading.Lock()
+            weakref.finalize(stacker, _locks.pop, id(stacker), None)
+        return lock
+
+
+def _run(
+    stacker: Stacker, expression: str, stack: stack_data, monitor: _Interruptible
+) -> stack_data:
+    with _lock(stacker):
+        saved = list(stack)
+        with monitor.watching():
+            try:
+                monitor.check(stack)  # it may have been cancelled while waiting
+                result = stacker.eval(expression, stack=stack)
+                Guard.check(monitor, stack)  # as `guarded` does at the end
+                return result
+            except EvaluationInterrupted:
+                stack.clear()
+                stack.extend(saved)
+                raise
+
+
+async def aeval(
+    stacker: Stacker,
+    expression: str,
+    stack: stack_data | None = None,
+    timeout: float | None = None,
+    interval: int = DEFAULT_INTERVAL,
+) -> stack_data:
+    """Evaluates `expression` on a thread of the event loop's default
+    executor and waits for it without blocking the loop.
+
+    See `Stacker.aeval`.
+    """
+    if stack is None:
+        stack = stacker.stack
+    monitor = _Interruptible(stacker.limits, timeout, interval)
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(None, _run, stacker, expression, stack, monitor)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # Let the evaluation stop at its next check before giving up, so
+        # that the Stacker is not changed any more once this returns.
+        monitor.cancelled = True
+        while not future.done():
+            try:
+                await asyncio.shield(future)
+            except asyncio.CancelledError:
+                continue
+            except BaseException:
+                break
+        raise
+    except EvaluationInterrupted as e:
+        raise TimeoutError(str(e)) from None
@@ -0,0 +1,113 @@
+"""Batch evaluation (see `Stacker.eval_many`)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import TYPE_CHECKING, Any
+
+from stacker.engine import Scope
+from stacker.engine.limits import guarded
+
+if TYPE_CHECKING:
+    from stacker.stacker import Stacker
+
+
+class EvalResult:
+    """The outcome of one item of `Stacker.eval_many`.
+
+    `stack` is the stack the item left, or had when it failed, and `error`
+    the exception it raised, if any.
+    """
+
+    __slots__ = ("index", "expression", "stack", "error")
+
+    def __init__(
+        self,
+        index: int,
+        expression: str,
+        stack: list,
+        error: Exception | None = None,
+    ) -> None:
+        self.index = index
+        self.expression = expression
+        self.stack = stack
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def value(self) -> Any:
+        """The top of the stack, or None if it is empty."""
+        return self.stack[-1] if self.stack else None
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f"EvalResult({self.index}, error={self.error!r})"
+        return f"EvalResult({self.index}, stack={self.stack!r})"
+
+
+def iter_eval(
+    stacker: Stacker,
+    expressions: str | Iterable[str],
+    bindings: Iterable[Mapping[str, Any]] | None = None,
+) -> Iterator[EvalResult]:
+    """Evaluates each expression, or one expression once per set of bindings.
+
+    Each distinct expression is compiled once (see
+    `Compiler.compile_expression`). Every item runs in its own activation of
+    `stacker`, with a fresh stack and its bindings as variables, so items see
+    the definitions of `stacker` but not each other. An activation is reused
+    by the next item as long as the items define nothing.
+    """
+    if bindings is None:
+        if isinstance(expressions, str):
+            raise TypeError("expressions must be an iterable of strings")
+        items = ((expression, None) for expression in expressions)
+    else:
+        if not isinstance(expressions, str):
+            raise TypeError("bindings need a single expression")
+        items = ((expressions, binding) for binding in bindings)
+
+    compile_expression = stacker.compiler.compile_expression
+    frame = None
+    for index, (expression, binding) in enumerate(items):
+        binding = binding or {}
+        try:
+            code = compile_expression(expression)
+            if frame is None:
+                frame = stacker._activation(binding)
+                frame.labels = Scope(stacker.labels)
+            else:
+                frame.variables.update(binding)
+            with guarded(stacker.limits, frame.stack):
+                frame._evaluate(code, stack=frame.stack)
+        except Exception as e:
+            stack = list(frame.stack) if frame is not None else []
+            yield EvalResult(index, expression, stack, e)
+        else:
+            yield EvalResult(index, expression, list(frame.stack))
+        frame = _reusable(frame, binding)
+
+
+def _reusable(frame: Stacker | None, binding: Mapping[str, Any]) -> Stacker | None:
+    """`frame`, emptied for the next item, or None if it cannot be reused.
+
+    A frame in which the item defined something is dropped, so that the
+    next item does not see it.
+    """
+    if frame is None or frame.macros or frame.sfunctions or frame.labels:
+        return None
+    variables = frame.variables
+    if len(variables) != len(binding):
+        return None
+    for name, value in binding.items():
+        if dict.get(variables, name, _missing) is not value:
+            return None
+    variables.clear()
+    frame.stack = type(frame.stack)()
+    return frame
+
+
+_missing = object()
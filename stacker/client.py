@@ -0,0 +1,103 @@
+"""A client for `stacker --serve`.
+
+It only needs the standard library, so it starts much faster than Stacker
+itself:
+
+    python -m stacker.client /path/to.sock "1 2 +" "3 *"
+
+sends each expression to the server in one session and prints what it
+printed and the resulting stack as JSON. Without expressions, it sends each
+line read from standard input.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import sys
+from typing import Any, Iterable
+
+from stacker.error import ServerError
+
+
+class Client:
+    """A session on a Stacker server.
+
+    ``` python
+    with Client("/tmp/stacker.sock") as client:
+        client.eval("{x} {x 2 *} $double defun")
+        client.eval("21 double")  # [42]
+    ```
+    """
+
+    def __init__(self, path: str, timeout: float | None = None) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        self.socket.connect(path)
+        self._file = self.socket.makefile("rb")
+        self._next_id = 0
+
+    def request(self, expression: str) -> dict[str, Any]:
+        """Sends an expression and returns the server's response."""
+        self._next_id += 1
+        request = {"id": self._next_id, "expr": expression}
+        try:
+            self.socket.sendall(json.dumps(request).encode() + b"\n")
+            line = self._file.readline()
+        except (BrokenPipeError, ConnectionResetError):
+            line = b""
+        if not line:
+            raise ServerError("The server closed the connection.")
+        return json.loads(line)
+
+    def eval(self, expression: str) -> list:
+        """Evaluates an expression and returns the stack of the session."""
+        response = self.request(expression)
+        if not response["ok"]:
+            error = response["error"]
+            raise ServerError(error["message"], error["type"])
+        return response["stack"]
+
+    def close(self) -> None:
+        self._file.close()
+        self.socket.close()
+
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def run(path: str, expressions: Iterable[str]) -> int:
+    """Evaluates `expressions` in one session and prints the results.
+
+    Returns the exit status: 1 if an expression failed, 0 otherwise.
+    """
+    with Client(path) as client:
+        for expression in expressions:
+            if not expression.strip():
+                continue
+            response = client.request(expression)
+            sys.stdout.write(response["output"])
+            if not response["ok"]:
+                error = response["error"]
+                print(f"{error['type']}: {error['message']}", file=sys.stderr)
+                return 1
+            print(json.dumps(response["stack"]))
+            if response.get("exit"):
+                break
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python -m stacker.client socket [expression ...]")
+        sys.exit(2)
+    path, expressions = argv[0], argv[1:]
+    sys.exit(run(path, expressions or sys.stdin))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from stacker.engine.compiler import Code, Compiler
+from stacker.engine.scope import Scope
+from stacker.engine.vm import Continuation, VirtualMachine
+
+__all__ = ["Code", "Compiler", "Continuation", "Scope", "VirtualMachine"]
@@ -0,0 +1,668 @@
+"""Ahead-of-time compilation of Stacker scripts to Python modules.
+
+`compile_script` translates every statement of a script, and every block
+in it (function and macro bodies, loop bodies, ...), into a Python
+generator function that follows the continuation protocol of
+`stacker.engine.vm`. Operators are called through the implementations of
+the running Stacker's `OperatorManager` without going through the
+instruction loop, and `if`, `ifelse`, `iferror`, `do`, `dolist` and
+`$name set` with literal blocks and names become Python control flow.
+
+Names are still resolved at run time: every inlined operator is guarded
+by the same shadowing checks as `CallOperator`, and falls back to the
+regular instruction when a macro, variable, function or plugin of the
+same name exists. Anything without a translation (`eval` of a string,
+`read-from-string`, `include`, ...) runs through its usual handler, which
+uses the embedded interpreter, so a compiled script behaves like the
+interpreted one.
+
+The generated module looks like:
+
+    def _build(core):           # binds operators of `core`
+        ...
+        return [statement codes]
+
+    def run(stacker=None):      # runs the script on `stacker`
+        return aot.run(_build, SOURCE, stacker)
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from stacker.data_type import String
+from stacker.engine.compiler import Code
+from stacker.engine.jit import LoopTrace
+from stacker.engine.instruction import (
+    CallOperator,
+    Instruction,
+    LoadName,
+    MakeBlock,
+    PushLiteral,
+)
+from stacker.engine.optimizer import Folded
+from stacker.reserved import __BREAK__
+
+if TYPE_CHECKING:
+    from stacker.core import StackerCore
+    from stacker.engine.compiler import Compiler
+    from stacker.data_type import stack_data
+    from stacker.engine.vm import Continuation
+    from stacker.stacker import Stacker
+
+
+FORMAT_VERSION = 1
+
+_numeric_types = frozenset((int, float, complex, bool))
+_call_kinds = ("regular", "file")
+_handler_kinds = ("priority", "hof", "transform", "aggregate", "settings")
+_control_flow = {
+    # operator: instruction types that must precede it
+    "set": (PushLiteral,),
+    "if": (MakeBlock,),
+    "ifelse": (MakeBlock, MakeBlock),
+    "iferror": (MakeBlock, MakeBlock),
+    "do": (PushLiteral, MakeBlock),
+    "dolist": (PushLiteral, MakeBlock),
+}
+
+
+class Incompatible(Exception):
+    """The operators of a Stacker differ from those a module was compiled for."""
+
+
+class Compiled(Instruction):
+    """A compiled body: `function(core, stack)` returns a continuation."""
+
+    __slots__ = ("function",)
+
+    def __init__(self, token: Any, function: Callable[..., Continuation]) -> None:
+        super().__init__(token)
+        self.function = function
+
+    def run(self, core: StackerCore, stack: stack_data) -> Continuation:
+        return self.function(core, stack)
+
+
+############################
+# Runtime support (used by generated modules)
+############################
+
+
+def code(tokens: list, function: Callable[..., Continuation]) -> Code:
+    """The `Code` of a compiled block or statement."""
+    return Code(tokens, [Compiled(" ".join(map(str, tokens)), function)])
+
+
+def trace(compiler: Compiler, tokens: list) -> LoopTrace:
+    """The loop JIT state of a loop body (see `stacker.engine.jit`)."""
+    return LoopTrace(compiler.compile(list(tokens)))
+
+
+def bind(core: StackerCore, name: str, kind: str) -> tuple[Callable, Any]:
+    """The dispatch handler and function of an operator of `core`."""
+    operator_manager = core.operator_manager
+    actual, op = operator_manager.resolve(name)
+    if actual != kind:
+        raise Incompatible(f"operator {name!r} is {actual}, expected {kind}")
+    return operator_manager.handler(name), op["func"]
+
+
+def run(
+    build: Callable[[StackerCore], list[Code]],
+    source: str,
+    stacker: Stacker | None = None,
+) -> Stacker:
+    """Runs a compiled script on `stacker` (a new one by default).
+
+    If the operators of `stacker` are not those the module was compiled
+    for, `source` is interpreted instead.
+    """
+    if stacker is None:
+        from stacker.stacker import Stacker
+
+        stacker = Stacker()
+    try:
+        statements = build(stacker)
+    except Incompatible:
+        for statement in split_statements(source):
+            stacker.process_expression(statement)
+        return stacker
+    for statement in statements:
+        stacker.evaluate(statement, stack=stacker.stack)
+    return stacker
+
+
+def main(run: Callable[[Stacker], Stacker], filename: str) -> None:
+    """Runs a compiled script like `stacker script.stk` does: on a Stacker
+    with the plugins, the Stacker library and the dotfile loaded.
+
+    `filename` is the path of the script, which errors are reported against.
+    """
+    from stacker.include.startup import load_startup_state
+    from stacker.stacker import Stacker
+
+    stacker = Stacker()
+    load_startup_state(stacker)
+    try:
+        run(stacker)
+    except Exception as e:
+        print(f"File: {Path(filename).resolve()}")
+        print(f"{type(e).__name__}: {e}")
+        sys.exit(1)
+
+
+def split_statements(source: str) -> list[str]:
+    """Splits a script into the statements script mode evaluates one by one."""
+    from stacker.include.stk_file_read import iter_statements
+
+    return list(iter_statements(source.splitlines(), strip_comments=True))
+
+
+############################
+# Code generation
+############################
+
+
+class Unsupported(Exception):
+    """A value that cannot be written as Python source."""
+
+
+def _source(value: Any) -> str:
+    """Python source that evaluates to `value`."""
+    kind = type(value)
+    if kind is String:
+        return f"String({value.value!r})"
+    if kind in (int, bool, str) or value is None:
+        return repr(value)
+    if kind is float:
+        return repr(value) if math.isfinite(value) else f"float({repr(value)!r})"
+    if kind is complex:
+        return f"complex({repr(value)!r})"
+    if kind is list:
+        return "[" + ", ".join(map(_source, value)) + "]"
+    if kind is tuple:
+        return "(" + "".join(_source(item) + ", " for item in value) + ")"
+    raise Unsupported(f"cannot write {value!r} as Python source")
+
+
+class _Module:
+    """Collects the functions and bindings of `_build`."""
+
+    def __init__(self, stacker: Stacker) -> None:
+        self.compiler = stacker.compiler
+        self.operator_manager = stacker.operator_manager
+        self.bindings: dict[str, int] = {}  # operator -> index of H{i}/F{i}
+        self.binding_lines: list[str] = []
+        self.constants: list[str] = []  # I{i}: generic instructions
+        self.functions: list[list[str]] = []
+        # Keyed by the instruction itself, which keeps it alive: an id could
+        # be reused by a block compiled later.
+        self.blocks: dict[MakeBlock, tuple[str, str]] = {}  # -> (code, function)
+        self._labels = 0
+
+    def label(self) -> int:
+        self._labels += 1
+        return self._labels
+
+    def binding(self, name: str) -> tuple[str, str, str]:
+        """(kind, handler variable, function variable) of an operator."""
+        kind, _ = self.operator_manager.resolve(name)
+        if name not in self.bindings:
+            i = self.bindings[name] = len(self.bindings)
+            self.binding_lines.append(
+                f"H{i}, F{i} = aot.bind(core, {name!r}, {kind!r})"
+            )
+        i = self.bindings[name]
+        return kind, f"H{i}", f"F{i}"
+
+    def instruction(self, instruction: Instruction) -> str:
+        """A variable holding a copy of `instruction`, built at load time."""
+        source = _source(instruction.token)
+        self.constants.append(f"compiler.compile_token({source})")
+        return f"I{len(self.constants) - 1}"
+
+    def function(self, code: Code) -> str:
+        """Defines a generator function running `code`; returns its name."""
+        name = f"f{len(self.functions)}"
+        lines: list[str] = []
+        self.functions.append(lines)  # reserve the slot for nested blocks
+        body = _Body(self)
+        body.emit_code(code.instructions, 2)
+        lines.append(f"    def {name}(core, stack):")
+        lines.extend(
+            [
+                "        macros = core.macros",
+                "        variables = core.variables",
+                "        sfunctions = core.sfunctions",
+                "        plugins = core.plugins",
+                "        pe = core._pop_and_eval",
+            ]
+        )
+        lines.extend(body.lines)
+        lines.append("        return")
+        lines.append("        yield")
+        return name
+
+    def trace(self, instruction: MakeBlock) -> str:
+        """A variable holding the `LoopTrace` of a loop body."""
+        tokens = _source(instruction.tokens)
+        self.constants.append(f"aot.trace(compiler, {tokens})")
+        return f"I{len(self.constants) - 1}"
+
+    def block(self, instruction: MakeBlock) -> tuple[str, str]:
+        """Variables holding the `Code` and the function of a block literal."""
+        if instruction not in self.blocks:
+            tokens = _source(instruction.tokens)
+            function = self.function(instruction.code)
+            self.constants.append(f"aot.code({tokens}, {function})")
+            code = f"I{len(self.constants) - 1}"
+            self.blocks[instruction] = (code, function)
+        return self.blocks[instruction]
+
+
+class _Body:
+    """The statements of one generated function."""
+
+    def __init__(self, module: _Module) -> None:
+        self.module = module
+        self.lines: list[str] = []
+        # Names checked once before the loop being emitted (see `_hoisted`).
+        self.operators: frozenset[str] = frozenset()
+        self.loaded: frozenset[str] = frozenset()
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def emit_code(self, instructions: list[Instruction], indent: int) -> None:
+        i = 0
+        while i < len(instructions):
+            n = self._control_flow(instructions, i, indent)
+            if n:
+                i += n
+                continue
+            self.emit_instruction(instructions[i], indent)
+            i += 1
+
+    ############################
+    # Instructions
+    ############################
+
+    def emit_instruction(self, instruction: Instruction, indent: int) -> None:
+        kind = type(instruction)
+        try:
+            if kind is PushLiteral:
+                self.emit(indent, f"stack.append({_source(instruction.value)})")
+                return
+            if kind is LoadName and not instruction.has_fallback:
+                self.emit_load(instruction, indent)
+                return
+            if kind is CallOperator:
+                self.emit_call(instruction, indent)
+                return
+            if kind is MakeBlock:
+                block, _ = self.module.block(instruction)
+                tokens = f"list({block}.tokens)"
+                self.emit(indent, f"core._substack_with_code({tokens}, {block}, stack)")
+                return
+            if kind is Folded:
+                self.emit_folded(instruction, indent)
+                return
+        except Unsupported:
+            pass
+        self.emit_generic(instruction, indent)
+
+    def emit_generic(self, instruction: Instruction, indent: int) -> None:
+        variable = self.module.instruction(instruction)
+        self.emit_continuation(f"{variable}.run(core, stack)", indent)
+
+    def emit_continuation(self, call: str, indent: int) -> None:
+        self.emit(indent, f"r = {call}")
+        self.emit(indent, "if r is not None:")
+        self.emit(indent + 1, "yield from r")
+
+    def emit_load(self, instruction: LoadName, indent: int) -> None:
+        name = instruction.name
+        label = self.module.label()
+        self.emit(indent, f"v{label} = variables.get({name!r}, MISSING)")
+        if name in self.loaded:
+            self.emit(indent, f"if type(v{label}) in NUMERIC:")
+        else:
+            condition = f"type(v{label}) in NUMERIC and {name!r} not in macros"
+            self.emit(indent, f"if {condition}:")
+        self.emit(indent + 1, f"stack.append(v{label})")
+        self.emit(indent, "else:")
+        self.emit_generic(instruction, indent + 1)
+
+    def shadowed(self, name: str) -> str:
+        """A condition that is true when `name` no longer calls the operator."""
+        _, handler, _ = self.module.binding(name)
+        return (
+            f"{name!r} in macros or {name!r} in variables"
+            f" or {name!r} in sfunctions or {name!r} in plugins"
+            f" or table.get({name!r}) is not {handler}"
+        )
+
+    def emit_pop_eval(self, variable: str, indent: int) -> None:
+        """`variable = core._pop_and_eval(stack)`, with its fast path inlined."""
+        self.emit(indent, f"{variable} = stack.pop()")
+        self.emit(indent, f"if type({variable}) not in NUMERIC:")
+        self.emit(indent + 1, f"stack.append({variable})")
+        self.emit(indent + 1, f"{variable} = pe(stack)")
+
+    def emit_call(self, instruction: CallOperator, indent: int) -> None:
+        name = instruction.name
+        kind, handler, func = self.module.binding(name)
+        if kind not in _call_kinds + ("stack",) + _handler_kinds:
+            raise Unsupported(f"operator {name!r}")
+        if name in self.operators:
+            self.emit_operator(name, indent)
+            return
+        self.emit(indent, f"if {self.shadowed(name)}:")
+        self.emit_generic(instruction, indent + 1)
+        self.emit(indent, "else:")
+        self.emit_operator(name, indent + 1)
+
+    def emit_operator(self, name: str, indent: int) -> None:
+        """Calls an operator that is known not to be shadowed."""
+        kind, handler, func = self.module.binding(name)
+        _, op = self.module.operator_manager.resolve(name)
+        if kind in _handler_kinds:
+            self.emit_continuation(f"{handler}(core, stack)", indent)
+            return
+        label = self.module.label()
+        args = [f"a{label}_{j}" for j in range(op["arg_count"])]
+        for arg in reversed(args):
+            self.emit_pop_eval(arg, indent)
+        if kind == "stack":
+            args.append("stack")
+        call = f"{func}({', '.join(args)})"
+        if op["push_result_to_stack"]:
+            self.emit(indent, f"stack.append({call})")
+        else:
+            self.emit(indent, call)
+
+    def emit_folded(self, instruction: Folded, indent: int) -> None:
+        if instruction.variables or any(
+            type(value) not in _numeric_types for value in instruction.values
+        ):
+            raise Unsupported("folded constants")
+        conditions = " or ".join(
+            f"({self.shadowed(name)})" for name in instruction.operators
+        )
+        self.emit(indent, f"if {conditions}:")
+        self.emit_code(instruction.originals, indent + 1)
+        self.emit(indent, "else:")
+        if instruction.values:
+            values = "".join(f"{_source(value)}, " for value in instruction.values)
+            self.emit(indent + 1, f"stack.extend(({values}))")
+        else:
+            self.emit(indent + 1, "pass")
+
+    ############################
+    # Control flow
+    ############################
+
+    def _control_flow(
+        self, instructions: list[Instruction], i: int, indent: int
+    ) -> int:
+        """Emits a control flow pattern starting at `i`; returns its length."""
+        for name, operands in _control_flow.items():
+            n = len(operands) + 1
+            window = instructions[i : i + n]
+            if len(window) < n:
+                continue
+            call = window[-1]
+            if type(call) is not CallOperator or call.name != name:
+                continue
+            if any(type(ins) is not t for ins, t in zip(window, operands)):
+                continue
+            kind, _ = self.module.operator_manager.resolve(name)
+            if kind != "priority":
+                continue
+            if operands[0] is PushLiteral and type(window[0].value) is not str:
+                continue
+            try:
+                _source([ins.tokens for ins in window if type(ins) is MakeBlock])
+            except Unsupported:
+                continue
+            conditions = [self.shadowed(name)]
+            hoisted = self._hoisted(window) if name in ("do", "dolist") else None
+            if hoisted is not None:
+                operators, loaded = hoisted
+                conditions.extend(self.shadowed(op) for op in sorted(operators))
+                conditions.extend(f"{n!r} in macros" for n in sorted(loaded))
+            self.emit(indent, f"if {' or '.join(conditions)}:")
+            for instruction in window[:-1]:
+                self.emit_instruction(instruction, indent + 1)
+            self.emit_generic(call, indent + 1)
+            self.emit(indent, "else:")
+            saved = self.operators, self.loaded
+            if hoisted is not None:
+                self.operators = saved[0] | operators
+                self.loaded = saved[1] | loaded
+            try:
+                getattr(self, f"_emit_{name}")(window, indent + 1)
+            finally:
+                self.operators, self.loaded = saved
+            return n
+        return 0
+
+    def _hoisted(self, window: list) -> tuple[frozenset, frozenset] | None:
+        """The operators and names of a loop body that can be checked once.
+
+        A body made of literals, variable reads, `$name set` and operators
+        that cannot define anything (pure regular and stack operators) can
+        not shadow its own operators, so they are checked before the loop
+        instead of at every iteration. Returns None for other bodies.
+        """
+        operators = set()
+        loaded = set()
+        written = {self._variable_name(window[0].value)}
+        instructions = window[1].code.instructions
+        for j, instruction in enumerate(instructions):
+            kind = type(instruction)
+            if kind is PushLiteral:
+                continue
+            if kind is LoadName and not instruction.has_fallback:
+                loaded.add(instruction.name)
+                continue
+            if kind is not CallOperator:
+                return None
+            name = instruction.name
+            if name == "set":
+                symbol = instructions[j - 1] if j > 0 else None
+                if type(symbol) is not PushLiteral or type(symbol.value) is not str:
+                    return None
+                written.add(self._variable_name(symbol.value))
+                operators.add(name)
+                continue
+            op_kind, op = self.module.operator_manager.resolve(name)
+            if not (op_kind == "stack" or op_kind == "regular" and op.get("pure")):
+                return None
+            operators.add(name)
+        if written & operators:
+            return None
+        return frozenset(operators), frozenset(loaded)
+
+    def _variable_name(self, symbol: str) -> str:
+        # `StackerCore._dollar_to_var_name` of a string
+        return (
+            symbol[1:]
+            if symbol.startswith("$") and not symbol.endswith("$")
+            else symbol
+        )
+
+    def _emit_set(self, window: list, indent: int) -> None:
+        label = self.module.label()
+        name = self._variable_name(window[0].value)
+        self.emit_pop_eval(f"x{label}", indent)
+        self.emit(indent, f"variables[{name!r}] = x{label}")
+
+    def _emit_condition(self, label: int, indent: int) -> None:
+        # `_if` / `_if_else` in stacker.lib.function.if_else
+        c = f"c{label}"
+        self.emit(indent, f"{c} = stack.pop()")
+        self.emit(indent, f"if isinstance({c}, type(core)):")
+        self.emit(indent + 1, f"yield core, {c}.code, stack")
+        self.emit(indent + 1, f"{c} = stack.pop()")
+        self.emit(indent, f"if isinstance({c}, str) and {c} in variables:")
+        self.emit(indent + 1, f"{c} = variables[{c}]")
+
+    def _emit_if(self, window: list, indent: int) -> None:
+        label = self.module.label()
+        self._emit_condition(label, indent)
+        self.emit(indent, f"if c{label}:")
+        self._emit_block(window[0], indent + 1)
+
+    def _emit_ifelse(self, window: list, indent: int) -> None:
+        label = self.module.label()
+        self._emit_condition(label, indent)
+        self.emit(indent, f"if c{label}:")
+        self._emit_block(window[0], indent + 1)
+        self.emit(indent, "else:")
+        self._emit_block(window[1], indent + 1)
+
+    def _emit_iferror(self, window: list, indent: int) -> None:
+        self.emit(indent, "try:")
+        self._emit_block(window[0], indent + 1)
+        self.emit(indent, "except ResourceLimitError:")  # as `_iferror`
+        self.emit(indent + 1, "raise")
+        self.emit(indent, "except Exception:")
+        self._emit_block(window[1], indent + 1)
+
+    def _emit_loop(
+        self, label: int, values: str, rest: str, window: list, indent: int
+    ) -> None:
+        """A loop over the sequence `values`, as in `_do` / `_dolist`.
+
+        Loops whose body has hoisted checks hand their remaining iterations
+        (`rest`, from index `n{label}` on) to the loop JIT once hot, like
+        the interpreter does.
+        """
+        name = self._variable_name(window[0].value)
+        n = f"n{label}"
+        if self._hoisted(window) is None:
+            self.emit(indent, f"for i{label} in {values}:")
+            self.emit(indent + 1, f"variables[{name!r}] = i{label}")
+        else:
+            t = f"t{label}"
+            self.emit(
+                indent, f"{t} = {self.module.trace(window[1])} if core.jit else None"
+            )
+            self.emit(indent, f"{n} = 0")
+            self.emit(indent, f"while {n} < len({values}):")
+            self.emit(indent + 1, f"if {t} is not None and {t}.hot():")
+            self.emit(indent + 2, f"{n} += {t}.run(core, {name!r}, {rest})")
+            self.emit(indent + 2, f"{t} = None")
+            self.emit(indent + 2, "continue")
+            self.emit(indent + 1, f"variables[{name!r}] = {values}[{n}]")
+            self.emit(indent + 1, f"{n} += 1")
+        self._emit_block(window[1], indent + 1)
+        self.emit(indent + 1, "if len(stack) > 0 and stack[-1] == BREAK:")
+        self.emit(indent + 2, "stack.pop()")
+        self.emit(indent + 2, "break")
+
+    def _emit_do(self, window: list, indent: int) -> None:
+        label = self.module.label()
+        self.emit_pop_eval(f"e{label}", indent)
+        self.emit_pop_eval(f"s{label}", indent)
+        self.emit(indent, f"r{label} = range(s{label}, e{label} + 1)")
+        rest = f"r{label}[n{label}:], int"
+        self._emit_loop(label, f"r{label}", rest, window, indent)
+
+    def _emit_dolist(self, window: list, indent: int) -> None:
+        label = self.module.label()
+        self.emit_pop_eval(f"l{label}", indent)
+        values = f"l{label}"
+        self.emit(indent, f"if not isinstance({values}, (list, tuple)):")
+        self.emit(indent + 1, f"{values} = list({values})")
+        rest = f"islice({values}, n{label}, None)"
+        self._emit_loop(label, values, rest, window, indent)
+
+    def _emit_block(self, instruction: MakeBlock, indent: int) -> None:
+        """The body of a block, evaluated in place.
+
+        Bodies without blocks of their own are inlined; others run their
+        function, so that nested blocks are not generated twice per level.
+        """
+        instructions = instruction.code.instructions
+        if any(type(ins) is MakeBlock for ins in instructions):
+            _, function = self.module.block(instruction)
+            self.emit(indent, f"yield from {function}(core, stack)")
+            return
+        start = len(self.lines)
+        self.emit_code(instructions, indent)
+        if len(self.lines) == start:
+            self.emit(indent, "pass")
+
+
+def compile_script(source: str, filename: str = "<script>") -> str:
+    """Translates a Stacker script into the source of a Python module."""
+    from stacker.stacker import Stacker
+    from stacker.syntax.parser import parse_expression
+
+    script = filename if filename == "<script>" else str(Path(filename).resolve())
+    module = _Module(Stacker())
+    statements = []
+    for statement in split_statements(source):
+        tokens = parse_expression(statement)
+        code = module.compiler.compile(tokens)
+        statements.append((statement.strip(), _source(tokens), module.function(code)))
+
+    lines = [
+        f'"""Compiled by `stacker compile` from {Path(filename).name}.',
+        "",
+        "Run it with `python <this file>`, or call `run()` with a Stacker to run",
+        "the script on it. Regenerate it when the script changes.",
+        '"""',
+        "",
+        "from itertools import islice",
+        "",
+        "from stacker.data_type import String",
+        "from stacker.engine import aot",
+        "from stacker.error import ResourceLimitError",
+        "",
+        f"FORMAT_VERSION = {FORMAT_VERSION}",
+        f"SCRIPT = {script!r}",
+        f"SOURCE = {source!r}",
+        "",
+        "MISSING = object()",
+        "NUMERIC = frozenset((int, float, complex, bool))",
+        f"BREAK = {__BREAK__!r}",
+        "",
+        "",
+        "def _build(core):",
+        "    compiler = core.compiler",
+        "    table = core.operator_manager.dispatch_table",
+    ]
+    lines.extend(f"    {line}" for line in module.binding_lines)
+    for function in module.functions:
+        lines.append("")
+        lines.extend(function)
+    lines.append("")
+    for i, constant in enumerate(module.constants):
+        lines.append(f"    I{i} = {constant}")
+    lines.append("    return [")
+    for statement, tokens, function in statements:
+        lines.append(f"        # {statement}")
+        lines.append(f"        aot.code({tokens}, {function}),")
+    lines.append("    ]")
+    lines.extend(
+        [
+            "",
+            "",
+            "def run(stacker=None):",
+            '    """Runs the script on `stacker` (a new Stacker by default)."""',
+            "    return aot.run(_build, SOURCE, stacker)",
+            "",
+            "",
+            'if __name__ == "__main__":',
+            "    aot.main(run, SCRIPT)",
+            "",
+        ]
+    )
+    return "\n".join(lines)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import ast
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from stacker.data_type import String
+from stacker.engine.instruction import (
+    CallOperator,
+    Instruction,
+    LoadName,
+    MakeBlock,
+    MakeList,
+    MakeTuple,
+    PushLiteral,
+)
+from stacker.engine.optimizer import Optimizer
+from stacker.engine.superinstruction import Fuser, Profiler, load_profile
+from stacker.syntax.parser import (
+    DEFAULT_PARSE_CACHE_SIZE,
+    is_block,
+    is_list,
+    is_string,
+    is_symbol,
+    is_tuple,
+    parse_expression,
+)
+from stacker.util.lru import LRUCache
+
+if TYPE_CHECKING:
+    from stacker.engine.jit import LoopTrace
+    from stacker.manager.operator_manager import OperatorManager
+
+
+_int_pattern = re.compile(r"[+-]?(0|[1-9][0-9]*)")
+_float_pattern = re.compile(
+    r"[+-]?([0-9]+\.[0-9]*|\.[0-9]+|[0-9]+(?=[eE]))([eE][+-]?[0-9]+)?"
+)
+_python_keywords = {"True", "False", "None"}
+_immutable_types = (str, int, float, complex, bool, type(None))
+
+# Block body text -> tokens of `Compiler.block_tokens`, shared by every
+# compiler (they format tokens by the names of the built-in operators).
+block_cache = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+
+
+class Code:
+    """A compiled token list.
+
+    `tokens` is the source token list (kept for error traces) and
+    `instructions` is the pre-classified instruction stream.
+    """
+
+    __slots__ = ("tokens", "instructions", "loop_trace")
+
+    def __init__(self, tokens: list, instructions: list[Instruction]) -> None:
+        self.tokens = tokens
+        self.instructions = instructions
+        self.loop_trace: LoopTrace | None = None  # see stacker.engine.jit
+
+    def __iter__(self):
+        return iter(self.instructions)
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def __repr__(self) -> str:
+        return f"Code({self.instructions})"
+
+
+class Compiler:
+    """Turns parsed tokens into a stream of instructions.
+
+    Everything that can be decided from the token itself (strings, numbers,
+    symbols, lists, tuples and blocks) is decided once here. Identifiers are
+    compiled to `CallOperator` / `LoadName`, which resolve macros, variables
+    and functions at run time since those can change while a script runs.
+    """
+
+    def __init__(self, operator_manager: OperatorManager, opt_level: int = 1) -> None:
+        self.operator_manager = operator_manager
+        self.optimizer = Optimizer(operator_manager, opt_level)
+        self.fuser: Fuser | None = None
+        self.profiler: Profiler | None = None
+        # Expression text -> Code of `compile_expression`.
+        self.code_cache = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+
+    @property
+    def opt_level(self) -> int:
+        return self.optimizer.level
+
+    def load_superinstructions(self, path: str | Path) -> None:
+        """Fuses the instruction sequences listed in a profile file from now on."""
+        self.fuser = Fuser(self.operator_manager, load_profile(path))
+        self.code_cache.clear()
+
+    def start_profiling(self) -> Profiler:
+        """Starts counting evaluated code for `Profiler.save`."""
+        self.profiler = Profiler()
+        return self.profiler
+
+    def compile(self, tokens: list) -> Code:
+        instructions = [self.compile_token(token) for token in tokens]
+        if self.optimizer.level > 0:
+            instructions = self.optimizer.optimize(instructions)
+        if self.fuser is not None:
+            instructions = self.fuser.fuse(instructions)
+        return Code(tokens, instructions)
+
+    def compile_expression(self, expression: str) -> Code:
+        """Compiles an expression.
+
+        Results are kept in `code_cache` and shared: like the code of a
+        function body, a Code can be evaluated any number of times.
+        """
+        code = self.code_cache.get(expression)
+        if code is None:
+            code = self.compile(parse_expression(expression))
+            self.code_cache.put(expression, code)
+        return code
+
+    def compile_token(self, token: Any) -> Instruction:
+        if not isinstance(token, str):
+            return PushLiteral(token, token)
+        if token in self.operator_manager.built_in_operators:
+            return CallOperator(token)
+        if _int_pattern.fullmatch(token):
+            return PushLiteral(token, int(token))
+        if _float_pattern.fullmatch(token):
+            return PushLiteral(token, float(token))
+        if token.isidentifier() and token not in _python_keywords:
+            return self._load_name(token)
+        if is_string(token):
+            return PushLiteral(token, String(token[1:-1]))
+        if is_tuple(token):
+            return MakeTuple(token)
+        if is_list(token):
+            return MakeList(token)
+        if is_symbol(token):
+            return PushLiteral(token, token[1:])
+        if is_block(token):
+            return MakeBlock(token, self)
+        try:
+            value = ast.literal_eval(token)
+        except Exception:
+            return self._load_name(token)
+        if isinstance(value, str):
+            return self._load_name(token)
+        return PushLiteral(token, value)
+
+    def _load_name(self, token: str) -> LoadName:
+        if isinstance(token, String):
+            return LoadName(token, fallback=token)
+        return LoadName(token)
+
+    def block_tokens(self, expression: str) -> list:
+        """Tokenize the body of a block. e.g. "1 2 +" -> [1, 2, "+"]
+
+        Results are kept in `block_cache`; each call returns a new list.
+        """
+        tokens = block_cache.get(expression)
+        if tokens is None:
+            tokens = [
+                self._format_block_token(token)
+                for token in parse_expression(expression)
+            ]
+            if all(_is_immutable(token) for token in tokens):
+                block_cache.put(expression, tuple(tokens))
+            return tokens
+        return list(tokens)
+
+    def _format_block_token(self, token: str) -> Any:
+        if token in self.operator_manager.oprerators["regular"]:
+            token = f'"{token}"'
+        if is_block(token):
+            return token
+        elif is_string(token):
+            return String(token[1:-1])
+        else:
+            try:
+                return ast.literal_eval(token)
+            except Exception:
+                return token
+
+
+def _is_immutable(value: Any) -> bool:
+    """Whether a token can be shared between blocks (see `block_cache`)."""
+    if isinstance(value, tuple):
+        return all(_is_immutable(item) for item in value)
+    return isinstance(value, _immutable_types)
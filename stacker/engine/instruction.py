@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from stacker.data_type import stack_data
+from stacker.error import UndefinedSymbolError
+from stacker.engine.vm import then
+from stacker.syntax.parser import parse_literal
+
+if TYPE_CHECKING:
+    from stacker.core import StackerCore
+    from stacker.engine.compiler import Code, Compiler
+    from stacker.engine.vm import Continuation
+
+
+class Instruction:
+    """A token that has already been classified by the compiler.
+
+    `run` returns a continuation when the instruction needs other code to be
+    evaluated (see `stacker.engine.vm`), otherwise None.
+    """
+
+    __slots__ = ("token",)
+
+    def __init__(self, token: Any) -> None:
+        self.token = token  # source token (used for error traces)
+
+    def run(self, core: StackerCore, stack: stack_data) -> Continuation | None:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.token!r})"
+
+
+class PushLiteral(Instruction):
+    """Pushes a constant (number, string, symbol name, ...) onto the stack."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, token: Any, value: Any) -> None:
+        super().__init__(token)
+        self.value = value
+
+    def run(self, core: StackerCore, stack: stack_data) -> None:
+        stack.append(self.value)
+
+
+class MakeList(Instruction):
+    """Builds a list literal. e.g. [1 2 3], [1 2; 3 4]"""
+
+    __slots__ = ("value", "nested", "names")
+
+    def __init__(self, token: str) -> None:
+        super().__init__(token)
+        try:
+            self.value = parse_literal(token)
+        except Exception:
+            # Report the error when the token is actually evaluated.
+            self.value = None
+        self.nested = _is_nested(self.value)
+        # Strings and names are resolved on every evaluation; numbers are not.
+        self.names = self.value is None or _has_names(self.value)
+
+    def _literal(self) -> Any:
+        if self.value is None:
+            return parse_literal(self.token)
+        if self.nested:
+            return _copy_nested(self.value)
+        return self.value
+
+    def run(self, core: StackerCore, stack: stack_data) -> None:
+        if self.names:
+            stack.append(list(map(core._var_str_to_literal, self._literal())))
+        else:
+            stack.append(list(self._literal()))
+
+
+class MakeTuple(MakeList):
+    """Builds a tuple literal. e.g. (1 2 3), (1 2; 3 4)"""
+
+    __slots__ = ()
+
+    def run(self, core: StackerCore, stack: stack_data) -> None:
+        value = self._literal()
+        if isinstance(value, list):  # "([1 2])" is [1 2]
+            stack.append(list(value))
+        elif not self.names:
+            stack.append(value)
+        elif isinstance(value, tuple):
+            stack.append(tuple(map(core._var_str_to_literal, value)))
+        else:
+            stack.append(core._var_str_to_literal(value))
+
+
+class MakeBlock(Instruction):
+    """Creates a block (substack). e.g. {1 2 +}
+
+    The body is tokenized and compiled once, the first time the block is
+    created, and shared by every block object made from this instruction.
+    """
+
+    __slots__ = ("compiler", "_tokens", "_code")
+
+    def __init__(self, token: str, compiler: Compiler) -> None:
+        super().__init__(token)
+        self.compiler = compiler
+        self._tokens = None
+        self._code = None
+
+    @property
+    def tokens(self) -> list:
+        if self._tokens is None:
+            self._tokens = self.compiler.block_tokens(self.token[1:-1])
+        return self._tokens
+
+    @property
+    def code(self) -> Code:
+        if self._code is None:
+            self._code = self.compiler.compile(self.tokens)
+        return self._code
+
+    def run(self, core: StackerCore, stack: stack_data) -> None:
+        core._substack_with_code(list(self.tokens), self.code, stack)
+
+
+class CallOperator(Instruction):
+    """Calls a built-in operator through the dispatch table.
+
+    Macros, variables, sfunctions and plugins with the same name still take
+    precedence, as they did before compilation.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, token: str) -> None:
+        super().__init__(token)
+        self.name = token
+
+    def run(self, core: StackerCore, stack: stack_data) -> Continuation | None:
+        name = self.name
+        if name in core.macros:
+            return core._expand_macro(name, stack)
+        elif name in core.variables:
+            return core._push_variable(name, stack)
+        elif name in core.sfunctions or name in core.plugins:
+            return core._execute(name, stack)
+        else:
+            return core.operator_manager.dispatch_table[name](core, stack)
+
+
+class LoadName(Instruction):
+    """Resolves an identifier at run time.
+
+    The lookup order is macros, variables, then sfunctions and plugins.
+    If nothing matches, `fallback` is pushed (string tokens of a block) or
+    UndefinedSymbolError is raised.
+    """
+
+    __slots__ = ("name", "fallback", "has_fallback")
+
+    _undefined = object()
+
+    def __init__(self, token: str, fallback: Any = _undefined) -> None:
+        super().__init__(token)
+        self.name = token
+        self.fallback = fallback
+        # A flag rather than an identity check: blocks get deep-copied.
+        self.has_fallback = fallback is not LoadName._undefined
+
+    def run(self, core: StackerCore, stack: stack_data) -> Continuation | None:
+        name = self.name
+        if name in core.macros:
+            return core._expand_macro(name, stack)
+        elif name in core.variables:
+            return core._push_variable(name, stack)
+        elif name in core.sfunctions or name in core.plugins:
+            return core._execute(name, stack)
+        elif self.has_fallback:
+            stack.append(self.fallback)
+        else:
+            raise UndefinedSymbolError(name)
+
+
+class Guarded(Instruction):
+    """A faster replacement for a run of instructions.
+
+    Names are resolved at run time, so the replacement is only valid while
+    the operators (and constants) it was built from keep their meaning.
+    `operators` maps each operator name to its handler and `variables`
+    maps each constant name to its value at build time. If any of them has
+    been shadowed by a macro, variable, sfunction or plugin, or has been
+    redefined, `fallback` runs the original instructions instead.
+    """
+
+    __slots__ = ("originals", "operators", "variables")
+
+    def __init__(
+        self,
+        originals: list[Instruction],
+        operators: dict[str, Any],
+        variables: dict[str, Any] | None = None,
+    ) -> None:
+        super().__init__(" ".join(str(i.token) for i in originals))
+        self.originals = originals
+        self.operators = operators
+        self.variables = variables or {}
+
+    def valid(self, core: StackerCore) -> bool:
+        for name, handler in self.operators.items():
+            if (
+                name in core.macros
+                or name in core.variables
+                or name in core.sfunctions
+                or name in core.plugins
+                or core.operator_manager.dispatch_table.get(name) is not handler
+            ):
+                return False
+        for name, value in self.variables.items():
+            if name in core.macros or core.variables.get(name, _missing) is not value:
+                return False
+        return True
+
+    def fallback(
+        self, core: StackerCore, stack: stack_data, start: int = 0
+    ) -> Continuation | None:
+        """Runs `originals[start:]`."""
+        originals = self.originals
+        for index in range(start, len(originals)):
+            continuation = originals[index].run(core, stack)
+            if continuation is not None:
+                if index == len(originals) - 1:
+                    return continuation
+                return then(continuation, self.fallback, core, stack, index + 1)
+        return None
+
+
+_missing = object()
+
+
+def _is_nested(value: Any) -> bool:
+    if not isinstance(value, (list, tuple)):
+        return False
+    return any(isinstance(item, (list, tuple)) for item in value)
+
+
+def _has_names(value: Any) -> bool:
+    if isinstance(value, (list, tuple)):
+        return any(isinstance(item, str) for item in value)
+    return isinstance(value, str)
+
+
+def _copy_nested(value: Any) -> Any:
+    # Literal leaves are numbers and strings, so only the containers are copied.
+    if isinstance(value, list):
+        return [_copy_nested(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_nested(item) for item in value)
+    return value
@@ -0,0 +1,482 @@
+"""A tracing compiler for hot `do`, `dolist` and `times` loops.
+
+The loop operators evaluate their body through the interpreter on every
+iteration. Once a body has run `HOT_ITERATIONS` times, `LoopTrace`
+translates it into a Python function that runs the rest of the loop
+natively: variables and the stack slots the body works on become Python
+locals and operators become Python expressions.
+
+Only straight-line numeric bodies are translated: numeric literals,
+variable reads, `$name set`, pure regular operators and the dup / drop /
+swap / over stack operators. Anything else (blocks, strings, functions,
+...) keeps the body in the interpreter.
+
+The generated function is specialized for the types of the values it
+starts from (the variables it reads and the stack slots it consumes) and
+checks them on entry, together with the names the translation relies on
+(no macro, variable, function or plugin may shadow an operator, and no
+operator may have been redefined). If a check fails the interpreter runs
+the loop instead. Every iteration works on temporaries that are committed
+at its end, so when an operator raises, the variables and the stack are
+left as they were before that iteration and the interpreter re-runs it
+(raising the same error at the same place).
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from stacker.engine.instruction import (
+    CallOperator,
+    Guarded,
+    Instruction,
+    LoadName,
+    PushLiteral,
+)
+from stacker.engine.monitor import active
+from stacker.engine.optimizer import Folded
+from stacker.engine.superinstruction import Fused
+from stacker.syntax.parser import is_symbol
+
+if TYPE_CHECKING:
+    from stacker.core import StackerCore
+    from stacker.engine.compiler import Code
+    from stacker.manager.operator_manager import OperatorManager
+
+
+HOT_ITERATIONS = 8
+MAX_VARIANTS = 4
+
+_numeric_types = frozenset((int, float, complex, bool))
+_stack_operators = ("dup", "drop", "swap", "over")
+
+# Python expressions for the operators whose function is exactly that
+# expression. The dispatch guard ensures they have not been redefined.
+_templates = {
+    "+": "{0} + {1}",
+    "-": "{0} - {1}",
+    "*": "{0} * {1}",
+    "/": "{0} / {1}",
+    "//": "{0} // {1}",
+    "%": "{0} % {1}",
+    "++": "{0} + 1",
+    "--": "{0} - 1",
+    "^": "{0} ** {1}",
+    "==": "{0} == {1}",
+    "!=": "{0} != {1}",
+    "<": "{0} < {1}",
+    "<=": "{0} <= {1}",
+    ">": "{0} > {1}",
+    ">=": "{0} >= {1}",
+}
+
+
+class Unsupported(Exception):
+    """The loop body cannot be translated."""
+
+
+class _Deopt(Exception):
+    """Raised by generated code to hand the current iteration back."""
+
+
+############################
+# Translation
+############################
+
+
+class _Translation:
+    """The Python source of a loop body and what it depends on."""
+
+    def __init__(
+        self, operator_manager: OperatorManager, code: Code, symbol: str | None
+    ) -> None:
+        self.operator_manager = operator_manager
+        self.symbol = symbol  # the loop variable, None for `times`
+        self.lines: list[str] = []
+        self.constants: list[Any] = []
+        self.operators: dict[str, Any] = {}  # name -> dispatch handler
+        self.guards: list[Guarded] = []  # folded instructions
+        self.loaded: set[str] = set()  # every name read as a variable
+        self.reads: list[str] = []  # variables read before they are written
+        self.writes: list[str] = []  # variables assigned by the body
+        self.inputs = 0  # stack slots consumed from below the body
+        self.uses_loop_value = False
+        self._current: dict[str, str] = {}  # variable -> expression this iteration
+        if symbol is not None:
+            # The loop assigns its variable before every iteration.
+            self._current[symbol] = "value"
+            self.writes.append(symbol)
+        self._stack: list[tuple[str, Any]] = []  # ("num", expr) or ("str", value)
+        self._temps = 0
+        for instruction in code.instructions:
+            self._translate(instruction)
+        self.outputs = [self._pop_number() for _ in range(len(self._stack))][::-1]
+        if len(self.outputs) < self.inputs:
+            raise Unsupported("the body consumes the stack")
+        shadowing = set(self.writes) & (
+            set(self.operators) | {n for g in self.guards for n in g.variables}
+        )
+        if shadowing:
+            raise Unsupported(f"the body assigns {', '.join(sorted(shadowing))}")
+
+    def _temp(self, expression: str) -> str:
+        name = f"t{self._temps}"
+        self._temps += 1
+        self.lines.append(f"{name} = {expression}")
+        return name
+
+    def _constant(self, value: Any) -> str:
+        self.constants.append(value)
+        return f"k{len(self.constants) - 1}"
+
+    def _push(self, expression: str) -> None:
+        self._stack.append(("num", expression))
+
+    def _pop(self) -> tuple[str, Any]:
+        if self._stack:
+            return self._stack.pop()
+        # Consumed from the values the body started with.
+        self.inputs += 1
+        return ("num", f"s{self.inputs - 1}")
+
+    def _pop_number(self) -> str:
+        kind, value = self._pop()
+        if kind != "num":
+            raise Unsupported("a string is used as a number")
+        return value
+
+    def _translate(self, instruction: Instruction) -> None:
+        kind = type(instruction)
+        if kind is PushLiteral:
+            value = instruction.value
+            if type(value) in _numeric_types:
+                self._push(self._constant(value))
+            elif type(value) is str:
+                self._stack.append(("str", value))
+            else:
+                raise Unsupported(f"literal {instruction.token!r}")
+        elif kind is LoadName:
+            if instruction.has_fallback:
+                raise Unsupported(f"name {instruction.token!r}")
+            self._push(self._load(instruction.name))
+        elif kind is CallOperator:
+            self._call(instruction.name)
+        elif kind is Folded:
+            if any(type(value) not in _numeric_types for value in instruction.values):
+                raise Unsupported(f"folded {instruction.token!r}")
+            self.guards.append(instruction)
+            for value in instruction.values:
+                self._push(self._constant(value))
+        elif kind is Fused:
+            for original in instruction.originals:
+                self._translate(original)
+        else:
+            raise Unsupported(f"instruction {instruction!r}")
+
+    def _load(self, name: str) -> str:
+        self.loaded.add(name)
+        if name == self.symbol:
+            self.uses_loop_value = True
+        if name not in self._current:
+            self.reads.append(name)
+            self._current[name] = f"v{len(self.reads) - 1}"
+        return self._current[name]
+
+    def _call(self, name: str) -> None:
+        kind, op = self.operator_manager.resolve(name)
+        self.operators[name] = self.operator_manager.handler(name)
+        if name == "set":
+            kind, symbol = self._pop()
+            if kind != "str":
+                raise Unsupported("set of a computed name")
+            variable = symbol[1:] if is_symbol(symbol) else symbol
+            self._current[variable] = self._pop_number()
+            if variable not in self.writes:
+                self.writes.append(variable)
+        elif kind == "stack" and name in _stack_operators:
+            if name == "dup":
+                value = self._pop()
+                self._stack.extend((value, value))
+            elif name == "drop":
+                self._pop()
+            elif name == "swap":
+                top, second = self._pop(), self._pop()
+                self._stack.extend((top, second))
+            else:  # over
+                top, second = self._pop(), self._pop()
+                self._stack.extend((second, top, second))
+        elif (
+            kind == "regular"
+            and op.get("pure")
+            and op["push_result_to_stack"]
+            and op["arg_count"] > 0
+        ):
+            args = [self._pop_number() for _ in range(op["arg_count"])][::-1]
+            if name in _templates:
+                self._push(self._temp(_templates[name].format(*args)))
+            else:
+                # Other operators may return something that is not a number.
+                result = self._temp(f"{self._constant(op['func'])}({', '.join(args)})")
+                self.lines.append(f"if type({result}) not in numeric: raise Deopt")
+                self._push(result)
+        else:
+            raise Unsupported(f"operator {name!r}")
+
+    def carried(self) -> list[tuple[str, str]]:
+        """(local, expression at the end of an iteration) for loop-carried values."""
+        pairs = []
+        for j in range(self.inputs):
+            pairs.append((f"s{j}", self.outputs[len(self.outputs) - 1 - j]))
+        for j, name in enumerate(self.reads):
+            pairs.append((f"v{j}", self._current[name]))
+        for j, name in enumerate(self.writes):
+            if name not in self.reads:
+                pairs.append((f"w{j}", self._current[name]))
+        return pairs
+
+    def written_locals(self) -> list[tuple[str, str]]:
+        """(variable, local) for the variables to store once the loop stops."""
+        pairs = []
+        for j, name in enumerate(self.writes):
+            if name in self.reads:
+                pairs.append((name, f"v{self.reads.index(name)}"))
+            else:
+                pairs.append((name, f"w{j}"))
+        return pairs
+
+
+############################
+# Code generation
+############################
+
+
+def _generate(
+    translation: _Translation, types: tuple[type, ...], value_type: type | None
+) -> str:
+    """The source of `loop(core, stack, values, guards, constants)`.
+
+    `types` are the types of `v0, v1, ...` followed by those of `s0, s1, ...`
+    when the loop is entered. `value_type` is the type of every loop value,
+    or None if each one has to be checked.
+    """
+    t = translation
+    lines = [
+        "def loop(core, stack, values, guards, constants):",
+        "    macros = core.macros",
+        "    variables = core.variables",
+        "    sfunctions = core.sfunctions",
+        "    plugins = core.plugins",
+        "    table = core.operator_manager.dispatch_table",
+    ]
+    conditions = []
+    for j, name in enumerate(t.operators):
+        conditions.extend(
+            (
+                f"{name!r} in macros",
+                f"{name!r} in variables",
+                f"{name!r} in sfunctions",
+                f"{name!r} in plugins",
+                f"table.get({name!r}) is not guards[0][{j}]",
+            )
+        )
+    for name in sorted(t.loaded):
+        conditions.append(f"{name!r} in macros")
+    for name in t.reads:
+        conditions.append(f"{name!r} not in variables")
+    if t.inputs:
+        conditions.append(f"len(stack) < {t.inputs}")
+    if conditions:
+        lines.append(f"    if {' or '.join(conditions)}:")
+        lines.append("        return 0")
+    for j in range(len(t.guards)):
+        lines.append(f"    if not guards[1][{j}].valid(core):")
+        lines.append("        return 0")
+    # The types the loop was traced with.
+    checks = []
+    for j, name in enumerate(t.reads):
+        lines.append(f"    v{j} = variables[{name!r}]")
+        checks.append(f"type(v{j}) is not {types[j].__name__}")
+    for j in range(t.inputs):
+        lines.append(f"    s{j} = stack[{-1 - j}]")
+        checks.append(f"type(s{j}) is not {types[len(t.reads) + j].__name__}")
+    if checks:
+        lines.append(f"    if {' or '.join(checks)}:")
+        lines.append("        return 0")
+    for j in range(t.inputs):
+        lines.append("    stack.pop()")
+    for j in range(len(t.constants)):
+        lines.append(f"    k{j} = constants[{j}]")
+    carried = t.carried()
+    for name, _ in carried:
+        if name.startswith("w"):
+            lines.append(f"    {name} = None")
+    lines.append("    done = 0")
+    lines.append("    try:")
+    lines.append("        for value in values:")
+    if t.uses_loop_value and value_type is None:
+        lines.append("            if type(value) not in numeric:")
+        lines.append("                break")
+    for line in t.lines:
+        lines.append(f"            {line}")
+    extra = len(t.outputs) - t.inputs
+    for expression in t.outputs[:extra]:
+        lines.append(f"            stack.append({expression})")
+    if carried:
+        targets = ", ".join(name for name, _ in carried)
+        values = ", ".join(expression for _, expression in carried)
+        lines.append(f"            {targets}, = {values},")
+    lines.append("            done += 1")
+    lines.append("    except Exception:")
+    lines.append("        pass  # the interpreter re-runs this iteration")
+    for j in reversed(range(t.inputs)):
+        lines.append(f"    stack.append(s{j})")
+    writes = t.written_locals()
+    if writes:
+        lines.append("    if done:")
+        for name, local in writes:
+            lines.append(f"        variables[{name!r}] = {local}")
+    lines.append("    return done")
+    return "\n".join(lines)
+
+
+############################
+# Loop traces
+############################
+
+
+class LoopTrace:
+    """The compilation state of one loop body (kept on its `Code`)."""
+
+    __slots__ = ("code", "count", "translations", "variants", "_lock")
+
+    def __init__(self, code: Code) -> None:
+        self.code = code
+        self.count = 0
+        self.translations: dict[str | None, _Translation | None] = {}
+        self.variants: dict[tuple, Callable[..., int]] = {}
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo: dict) -> LoopTrace:
+        # Compiled loops are cheap to rebuild; locks cannot be copied.
+        return LoopTrace(copy.deepcopy(self.code, memo))
+
+    def hot(self) -> bool:
+        """Counts an iteration; True once the body is worth compiling."""
+        self.count += 1
+        return self.count > HOT_ITERATIONS
+
+    def run(
+        self,
+        core: StackerCore,
+        symbol: str | None,
+        values: Iterable[Any],
+        value_type: type | None = None,
+    ) -> int:
+        """Runs iterations natively; returns how many ran.
+
+        `values` are the values of the loop variable `symbol`; pass their
+        type as `value_type` if they all have the same numeric type. The
+        caller evaluates the remaining iterations (if any) itself.
+        """
+        monitor = active.monitor
+        if monitor is None:
+            return self._run(core, symbol, values, value_type)
+        # Run in chunks and report each, so the monitor still gets to check.
+        size = len(self.code.instructions) or 1
+        step = max(1, monitor.interval // size)
+        if isinstance(values, (range, list, tuple)):
+            # Slicing a range is free, and keeps the loop on its fast path.
+            chunks = (values[i : i + step] for i in range(0, len(values), step))
+        else:
+            values = iter(values)
+            chunks = iter(lambda: list(islice(values, step)), [])
+        ran = 0
+        for chunk in chunks:
+            done = self._run(core, symbol, chunk, value_type)
+            ran += done
+            monitor.step(done * size, core.stack)
+            if done < len(chunk):
+                break
+        return ran
+
+    def _run(
+        self,
+        core: StackerCore,
+        symbol: str | None,
+        values: Iterable[Any],
+        value_type: type | None,
+    ) -> int:
+        translation = self._translation(core, symbol)
+        if translation is None:
+            return 0
+        types = self._types(core, translation)
+        if types is None:
+            return 0
+        loop = self._variant(translation, symbol, types, value_type)
+        if loop is None:
+            return 0
+        guards = (tuple(translation.operators.values()), translation.guards)
+        return loop(core, core.stack, values, guards, translation.constants)
+
+    def _translation(self, core: StackerCore, symbol: str | None):
+        if symbol not in self.translations:
+            try:
+                translation = _Translation(core.operator_manager, self.code, symbol)
+            except Unsupported:
+                translation = None
+            self.translations[symbol] = translation
+        return self.translations[symbol]
+
+    @staticmethod
+    def _types(core: StackerCore, translation: _Translation) -> tuple | None:
+        """The types the loop starts from, or None if they are not numbers."""
+        types = []
+        for name in translation.reads:
+            if name not in core.variables:
+                return None
+            types.append(type(core.variables[name]))
+        stack = core.stack
+        if len(stack) < translation.inputs:
+            return None
+        for j in range(translation.inputs):
+            types.append(type(stack[-1 - j]))
+        if not all(t in _numeric_types for t in types):
+            return None
+        return tuple(types)
+
+    def _variant(
+        self,
+        translation: _Translation,
+        symbol: str | None,
+        types: tuple,
+        value_type: type | None,
+    ):
+        key = (symbol, types, value_type)
+        loop = self.variants.get(key)
+        if loop is None:
+            with self._lock:
+                if len(self.variants) >= MAX_VARIANTS:
+                    return None
+                source = _generate(translation, types, value_type)
+                namespace = {"numeric": _numeric_types, "Deopt": _Deopt}
+                for t in types:
+                    namespace[t.__name__] = t
+                exec(compile(source, "<stacker loop>", "exec"), namespace)
+                loop = self.variants[key] = namespace["loop"]
+        return loop
+
+
+def loop_trace(core: StackerCore, block: Any) -> LoopTrace | None:
+    """The trace of a loop body, or None if it is not a candidate."""
+    if not core.jit or not isinstance(block, type(core)):
+        return None
+    if block.variables is not core.variables:
+        return None
+    code = block.code
+    trace = code.loop_trace
+    if trace is None:
+        trace = code.loop_trace = LoopTrace(code)
+    return trace
@@ -0,0 +1,188 @@
+"""Limits on what one evaluation may use (see `Stacker.set_limits`).
+
+Limits are enforced by a `Guard`, a monitor (see `stacker.engine.monitor`),
+so they cost about as much as a monitor whether they are reached or not:
+
+- the instruction count is exact to within the size of one block, as
+  blocks are counted when they start;
+- the deadline and the stack depth are checked about every `interval`
+  instructions (`Limits.interval`), so a stack may grow by up to that many
+  values past its limit before the error is raised;
+- the memory is checked at the first block to start at least
+  `MEMORY_CHECK_DELAY` seconds after its last check, since a few
+  instructions can allocate a lot (each `dup +` on a list doubles it) but
+  not without taking time, while reading it takes longer than most blocks;
+- the call depth is checked at every call of a function or lambda;
+- all but the call depth are checked once more when the evaluation ends,
+  so an evaluation that ends over a limit raises.
+
+The memory is the growth of the resident memory of the whole process since
+the evaluation started, so it is approximate, and includes what other
+threads allocate meanwhile. A single operator that allocates a lot (a huge
+`range`, say) is only stopped once it returns.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Iterator
+
+from stacker.data_type import stack_data
+from stacker.engine.monitor import DEFAULT_INTERVAL, Monitor, active
+from stacker.error import ResourceLimitError
+
+MEMORY_CHECK_DELAY = 0.001
+
+
+class Limits:
+    """The limits of an evaluation; None means no limit.
+
+    `timeout` is in seconds and `max_memory` in bytes. `interval` is about
+    how many instructions run between two checks of the deadline and the
+    stack depth.
+    """
+
+    names = (
+        "max_instructions",
+        "timeout",
+        "max_stack_depth",
+        "max_call_depth",
+        "max_memory",
+    )
+    __slots__ = names + ("interval",)
+
+    def __init__(
+        self,
+        max_instructions: int | None = None,
+        timeout: float | None = None,
+        max_stack_depth: int | None = None,
+        max_call_depth: int | None = None,
+        max_memory: int | None = None,
+        interval: int = DEFAULT_INTERVAL,
+    ) -> None:
+        self.max_instructions = max_instructions
+        self.timeout = timeout
+        self.max_stack_depth = max_stack_depth
+        self.max_call_depth = max_call_depth
+        self.max_memory = max_memory
+        self.interval = interval
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+        if max_memory is not None and memory_usage() is None:
+            raise ValueError("max_memory is not supported on this platform")
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, name) is not None for name in self.names)
+
+    def __repr__(self) -> str:
+        limits = (f"{name}={getattr(self, name)}" for name in self.__slots__)
+        return f"Limits({', '.join(limits)})"
+
+
+class Guard(Monitor):
+    """Raises ResourceLimitError when an evaluation exceeds `limits`."""
+
+    def __init__(self, limits: Limits | None, interval: int | None = None):
+        if interval is None:
+            interval = DEFAULT_INTERVAL if limits is None else limits.interval
+        super().__init__(interval)
+        self.limits = limits
+        self.deadline = None
+        self.memory = None  # resident memory when the evaluation started
+        self.next_memory_check = 0.0
+        if limits is None:
+            return
+        if limits.timeout is not None:
+            self.deadline = time.monotonic() + limits.timeout
+        if limits.max_memory is not None:
+            self.memory = memory_usage()
+        if limits.max_instructions is not None:
+            self.next_check = min(self.next_check, limits.max_instructions + 1)
+
+    def step(self, instructions: int, stack: stack_data) -> None:
+        # Monitor.step, inlined as it runs at every block.
+        self.executed += instructions
+        if self.executed >= self.next_check:
+            self.next_check = self.executed + self.interval
+            self.check(stack)
+        elif self.memory is not None and time.monotonic() >= self.next_memory_check:
+            self._check_memory()
+
+    def check(self, stack: stack_data) -> None:
+        limits = self.limits
+        if limits is None:
+            return
+        if limits.max_instructions is not None:
+            if self.executed > limits.max_instructions:
+                raise ResourceLimitError("max_instructions", limits.max_instructions)
+            self.next_check = min(self.next_check, limits.max_instructions + 1)
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise ResourceLimitError("timeout", limits.timeout)
+        if limits.max_stack_depth is not None and len(stack) > limits.max_stack_depth:
+            raise ResourceLimitError("max_stack_depth", limits.max_stack_depth)
+        if self.memory is not None:
+            self._check_memory()
+
+    def _check_memory(self) -> None:
+        self.next_memory_check = time.monotonic() + MEMORY_CHECK_DELAY
+        if memory_usage() - self.memory > self.limits.max_memory:
+            raise ResourceLimitError("max_memory", self.limits.max_memory)
+
+    def enter_call(self) -> None:
+        super().enter_call()
+        limits = self.limits
+        if limits is not None and limits.max_call_depth is not None:
+            if self.call_depth > limits.max_call_depth:
+                raise ResourceLimitError("max_call_depth", limits.max_call_depth)
+
+
+def guarded(limits: Limits | None, stack: stack_data) -> AbstractContextManager:
+    """A context in which the evaluation of `stack` on this thread is held to
+    `limits`; they are checked once more when it ends.
+
+    Does nothing if there are no limits, or if the evaluation is already
+    monitored: an evaluation started inside another one (by `include`, for
+    example) counts against the limits of the outer one.
+    """
+    if limits is None or active.monitor is not None:
+        return nullcontext()
+    return _guarding(Guard(limits), stack)
+
+
+@contextmanager
+def _guarding(guard: Guard, stack: stack_data) -> Iterator[Guard]:
+    with guard.watching():
+        yield guard
+        guard.check(stack)
+
+
+# Resident memory: /proc/self/statm where there is one (read through a file
+# descriptor kept open, which is cheap), or else the peak from getrusage.
+_statm: int | None = None
+_statm_pid: int | None = None  # a forked process must open its own
+_page_size = 4096
+
+
+def memory_usage() -> int | None:
+    """The resident memory of the process in bytes, or None if unknown."""
+    global _statm, _statm_pid, _page_size
+    if _statm_pid != os.getpid():
+        _statm_pid = os.getpid()
+        try:
+            _statm = os.open("/proc/self/statm", os.O_RDONLY)
+            _page_size = os.sysconf("SC_PAGE_SIZE")
+        except (OSError, AttributeError, ValueError):
+            _statm = None
+    if _statm is not None:
+        return int(os.pread(_statm, 64, 0).split()[1]) * _page_size
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
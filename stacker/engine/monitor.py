@@ -0,0 +1,76 @@
+"""Monitors: callbacks into a running evaluation.
+
+An evaluation runs under at most one `Monitor` per thread. The evaluator
+reports the instructions of every piece of code it starts (a block, a
+function body, one iteration of a loop) to the active monitor, which calls
+`check` about every `interval` instructions. `check` may let other threads
+run, look at the clock or the stack, and raise to stop the evaluation.
+
+Counting per piece of code instead of per instruction keeps the cost of a
+monitor to one addition and one comparison per block, and the cost of
+having none to one attribute read. Calls of functions and lambdas are
+reported too, so a monitor can follow the call depth.
+
+A check only ever happens between two instructions, so stopping there
+leaves every value and definition as it would be after an error. Compiled
+loops (see `stacker.engine.jit`) run in chunks of about `interval`
+instructions while a monitor is active.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from stacker.data_type import stack_data
+
+DEFAULT_INTERVAL = 1000
+
+
+class Monitor:
+    """Calls `check` about every `interval` instructions of an evaluation."""
+
+    def __init__(self, interval: int = DEFAULT_INTERVAL) -> None:
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.interval = interval
+        self.executed = 0  # instructions reported so far
+        self.next_check = interval
+        self.call_depth = 0  # calls of functions and lambdas in progress
+
+    def step(self, instructions: int, stack: stack_data) -> None:
+        """Reports `instructions` instructions about to run on `stack`."""
+        self.executed += instructions
+        if self.executed >= self.next_check:
+            self.next_check = self.executed + self.interval
+            self.check(stack)
+
+    def check(self, stack: stack_data) -> None:
+        """Called about every `interval` instructions with the stack the
+        evaluation is working on. Raise to stop."""
+
+    def enter_call(self) -> None:
+        """Called when a function or lambda is called. Raise to stop."""
+        self.call_depth += 1
+
+    def leave_call(self) -> None:
+        self.call_depth -= 1
+
+    @contextmanager
+    def watching(self) -> Iterator[Monitor]:
+        """Makes this the active monitor of the current thread."""
+        previous = active.monitor
+        active.monitor = self
+        try:
+            yield self
+        finally:
+            active.monitor = previous
+
+
+class _Active(threading.local):
+    monitor: Monitor | None = None
+
+
+# `active.monitor` is the monitor of the evaluation on this thread, if any.
+active = _Active()
@@ -0,0 +1,203 @@
+"""Peephole optimizer for compiled instruction streams.
+
+Level 1 folds constant subexpressions: a run of numeric literals (and
+numeric-only list literals or constants such as `pi`) followed by pure
+operators is replaced by its result, e.g. `2 3 + 4 *` -> `20`.
+Level 2 additionally drops no-op pairs (`dup drop`, `swap swap`). Those
+pairs only raise an error on an empty or one-element stack, so removing
+them also removes that error.
+
+Names are resolved at run time (macros, variables and functions can
+shadow an operator), so every replacement keeps the instructions it
+replaced and runs them instead whenever one of the names it depends on
+no longer means what it meant at compile time.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from stacker.constant import constants
+from stacker.engine.instruction import (
+    CallOperator,
+    Guarded,
+    Instruction,
+    LoadName,
+    MakeList,
+    MakeTuple,
+    PushLiteral,
+)
+
+if TYPE_CHECKING:
+    from stacker.core import StackerCore
+    from stacker.data_type import stack_data
+    from stacker.engine.vm import Continuation
+    from stacker.manager.operator_manager import OperatorManager
+
+
+_constant_types = (int, float, complex, bool)
+_foldable_kinds = ("regular", "aggregate")
+_noop_pairs = {("dup", "drop"), ("swap", "swap")}
+_missing = object()
+
+
+class Folded(Guarded):
+    """Instructions replaced by the values they push (possibly none)."""
+
+    __slots__ = ("values",)
+
+    def __init__(
+        self,
+        originals: list[Instruction],
+        values: tuple,
+        operators: dict[str, Any],
+        variables: dict[str, Any],
+    ) -> None:
+        super().__init__(originals, operators, variables)
+        self.values = values
+
+    def run(self, core: StackerCore, stack: stack_data) -> Continuation | None:
+        if self.valid(core):
+            stack.extend(self.values)
+            return
+        return self.fallback(core, stack)
+
+
+class _Constant:
+    """A value known at compile time and the instructions that produce it."""
+
+    __slots__ = ("value", "instructions", "operators", "variables")
+
+    def __init__(self, value, instructions, operators=None, variables=None):
+        self.value = value
+        self.instructions = instructions
+        self.operators = operators or {}
+        self.variables = variables or {}
+
+
+class Optimizer:
+    """Rewrites instruction lists; see the module docstring for the levels."""
+
+    def __init__(self, operator_manager: OperatorManager, level: int = 1) -> None:
+        self.operator_manager = operator_manager
+        self.level = level
+
+    def optimize(self, instructions: list[Instruction]) -> list[Instruction]:
+        if self.level >= 1:
+            instructions = self._fold_constants(instructions)
+        if self.level >= 2:
+            instructions = self._drop_noop_pairs(instructions)
+        return instructions
+
+    ############################
+    # Constant folding
+    ############################
+
+    def _fold_constants(self, instructions: list[Instruction]) -> list[Instruction]:
+        out: list[Instruction] = []
+        constants_: list[_Constant] = []  # the constants on top of the stack
+        for instruction in instructions:
+            constant = self._constant(instruction)
+            if constant is not None:
+                constants_.append(constant)
+                out.append(instruction)
+                continue
+            op = self._pure_operator(instruction)
+            if op is not None and op["arg_count"] <= len(constants_):
+                folded = self._apply(instruction, op, constants_)
+                if folded is not None:
+                    n = op["arg_count"]
+                    del constants_[len(constants_) - n :]
+                    del out[len(out) - n :]
+                    constants_.append(folded)
+                    out.append(
+                        Folded(
+                            folded.instructions,
+                            (folded.value,),
+                            folded.operators,
+                            folded.variables,
+                        )
+                    )
+                    continue
+            # The stack effect of anything else is unknown.
+            constants_.clear()
+            out.append(instruction)
+        return out
+
+    def _constant(self, instruction: Instruction) -> _Constant | None:
+        if type(instruction) is PushLiteral:
+            if type(instruction.value) in _constant_types:
+                return _Constant(instruction.value, [instruction])
+        elif type(instruction) in (MakeList, MakeTuple):
+            value = instruction.value
+            if isinstance(value, (list, tuple)) and all(
+                type(item) in _constant_types for item in value
+            ):
+                return _Constant(value, [instruction])
+        elif type(instruction) is LoadName and not instruction.has_fallback:
+            value = constants.get(instruction.name, _missing)
+            if type(value) in _constant_types:
+                variables = {instruction.name: value}
+                return _Constant(value, [instruction], variables=variables)
+        return None
+
+    def _pure_operator(self, instruction: Instruction) -> dict | None:
+        if type(instruction) is not CallOperator:
+            return None
+        kind, op = self.operator_manager.resolve(instruction.name)
+        if kind in _foldable_kinds and op.get("pure") and op["push_result_to_stack"]:
+            return op
+        return None
+
+    def _apply(
+        self, instruction: CallOperator, op: dict, constants_: list[_Constant]
+    ) -> _Constant | None:
+        args = constants_[len(constants_) - op["arg_count"] :]
+        try:
+            # Sequences are copied: the operator must not see (or keep) the
+            # value pushed by the literal.
+            value = op["func"](
+                *[
+                    (
+                        type(arg.value)(arg.value)
+                        if isinstance(arg.value, (list, tuple))
+                        else arg.value
+                    )
+                    for arg in args
+                ]
+            )
+        except Exception:
+            return None  # leave the error to run time
+        if type(value) not in _constant_types:
+            return None
+        instructions, operators, variables = [], {}, {}
+        for arg in args:
+            instructions.extend(arg.instructions)
+            operators.update(arg.operators)
+            variables.update(arg.variables)
+        instructions.append(instruction)
+        operators[instruction.name] = self.operator_manager.handler(instruction.name)
+        return _Constant(value, instructions, operators, variables)
+
+    ############################
+    # No-op pairs
+    ############################
+
+    def _drop_noop_pairs(self, instructions: list[Instruction]) -> list[Instruction]:
+        out: list[Instruction] = []
+        for instruction in instructions:
+            if (
+                out
+                and type(instruction) is CallOperator
+                and type(out[-1]) is CallOperator
+                and (out[-1].name, instruction.name) in _noop_pairs
+            ):
+                first = out.pop()
+                operators = {
+                    name: self.operator_manager.handler(name)
+                    for name in (first.name, instruction.name)
+                }
+                out.append(Folded([first, instruction], (), operators, {}))
+            else:
+                out.append(instruction)
+        return out
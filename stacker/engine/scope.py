@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+class Scope(dict):
+    """A dict of local names that falls back to an enclosing scope.
+
+    Used for the variables, macros and sfunctions of a function call:
+    assignments go into the scope itself, lookups that miss continue in
+    `outer` (the scope the function was defined in).
+    """
+
+    def __init__(self, outer: dict, bindings: dict | None = None) -> None:
+        super().__init__(bindings or ())
+        self.outer = outer
+
+    def __missing__(self, key: Any) -> Any:
+        return self.outer[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return dict.__contains__(self, key) or key in self.outer
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        return self.outer.get(key, default)
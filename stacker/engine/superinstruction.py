@@ -0,0 +1,326 @@
+"""Superinstructions: runs of instructions fused into one generated handler.
+
+Which runs are worth fusing is decided by a profile recorded from real
+scripts (see `Profiler`) and saved as a JSON file. Each instruction is
+described by a pattern key: the operator name for `CallOperator`,
+`<num>` / `<literal>` for `PushLiteral` and `<name>` for `LoadName`, so a
+profile entry looks like `["<name>", "<num>", "-"]` (`n 1 -`).
+
+A `Fused` instruction runs Python code generated for its pattern. Regular
+and stack operators are called directly, and numeric literals are handed
+to the operator that consumes them without a round trip through the
+stack. Everything else (names, other operators) runs as usual, so the
+semantics are those of the original instructions.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from stacker.engine.instruction import (
+    CallOperator,
+    Guarded,
+    Instruction,
+    LoadName,
+    PushLiteral,
+)
+from stacker.engine.vm import then
+
+if TYPE_CHECKING:
+    from stacker.core import StackerCore
+    from stacker.data_type import stack_data
+    from stacker.engine.compiler import Code
+    from stacker.engine.vm import Continuation
+    from stacker.manager.operator_manager import OperatorManager
+
+
+PROFILE_FORMAT = "stacker-superinstructions"
+PROFILE_VERSION = 1
+MIN_LENGTH = 2
+MAX_LENGTH = 4
+
+_numeric_types = (int, float, complex, bool)
+_inline_kinds = ("regular", "stack")
+
+
+def pattern_key(instruction: Instruction) -> str | None:
+    """The key of an instruction in a profile, or None if it cannot be fused."""
+    kind = type(instruction)
+    if kind is CallOperator:
+        return instruction.name
+    if kind is PushLiteral:
+        if type(instruction.value) in _numeric_types:
+            return "<num>"
+        return "<literal>"
+    if kind is LoadName:
+        return "<name>"
+    return None
+
+
+############################
+# Profiling
+############################
+
+
+def _operands_only(keys: tuple[str | None, ...]) -> bool:
+    return all(key in ("<num>", "<literal>", "<name>") for key in keys)
+
+
+class Profiler:
+    """Counts how often each piece of compiled code is evaluated."""
+
+    def __init__(self) -> None:
+        self.counts: Counter[Code] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, code: Code) -> None:
+        with self._lock:
+            self.counts[code] += 1
+
+    def sequences(self) -> Counter[tuple[str, ...]]:
+        """How many times each fusable run of instructions was executed."""
+        sequences: Counter[tuple[str, ...]] = Counter()
+        with self._lock:
+            counts = list(self.counts.items())
+        for code, count in counts:
+            keys = [pattern_key(instruction) for instruction in code.instructions]
+            for length in range(MIN_LENGTH, MAX_LENGTH + 1):
+                for start in range(len(keys) - length + 1):
+                    window = tuple(keys[start : start + length])
+                    if None not in window and not _operands_only(window):
+                        sequences[window] += count
+        return sequences
+
+    def save(self, path: str | Path, limit: int = 32) -> None:
+        """Writes the `limit` most profitable sequences to a profile file.
+
+        A sequence of n instructions saves n - 1 dispatches per execution.
+        """
+        sequences = self.sequences()
+        ranked = sorted(
+            sequences.items(), key=lambda item: item[1] * (len(item[0]) - 1)
+        )
+        ranked.reverse()
+        profile = {
+            "format": PROFILE_FORMAT,
+            "version": PROFILE_VERSION,
+            "sequences": [
+                {"pattern": list(pattern), "count": count}
+                for pattern, count in ranked[:limit]
+            ],
+        }
+        Path(path).write_text(json.dumps(profile, indent=2) + "\n")
+
+
+def load_profile(path: str | Path) -> list[tuple[str, ...]]:
+    """Reads the patterns of a profile file written by `Profiler.save`."""
+    profile = json.loads(Path(path).read_text())
+    if (
+        profile.get("format") != PROFILE_FORMAT
+        or profile.get("version") != PROFILE_VERSION
+    ):
+        raise ValueError(f"{path} is not a superinstruction profile")
+    return [tuple(entry["pattern"]) for entry in profile["sequences"]]
+
+
+############################
+# Fusion
+############################
+
+
+class Fused(Guarded):
+    """A run of instructions executed by one generated handler."""
+
+    __slots__ = ("handler",)
+
+    def __init__(
+        self,
+        originals: list[Instruction],
+        operators: dict[str, Any],
+        make_handler: Callable[..., Callable],
+        args: list[Any],
+    ) -> None:
+        super().__init__(originals, operators)
+        self.handler = make_handler(self.fallback, then, _numeric_types, *args)
+
+    def run(self, core: StackerCore, stack: stack_data) -> Continuation | None:
+        return self.handler(core, stack)
+
+
+class Fuser:
+    """Replaces runs of instructions that match a profile by `Fused` ones."""
+
+    def __init__(
+        self, operator_manager: OperatorManager, patterns: Iterable[tuple[str, ...]]
+    ) -> None:
+        self.operator_manager = operator_manager
+        self.patterns = {tuple(pattern) for pattern in patterns}
+        lengths = {len(pattern) for pattern in self.patterns}
+        self.lengths = sorted(lengths, reverse=True)  # longest match first
+
+    def fuse(self, instructions: list[Instruction]) -> list[Instruction]:
+        if not self.patterns:
+            return instructions
+        keys = [pattern_key(instruction) for instruction in instructions]
+        out: list[Instruction] = []
+        i = 0
+        while i < len(instructions):
+            for length in self.lengths:
+                if tuple(keys[i : i + length]) in self.patterns:
+                    fused = self._fused(instructions[i : i + length])
+                    if fused is not None:
+                        out.append(fused)
+                        i += length
+                        break
+            else:
+                out.append(instructions[i])
+                i += 1
+        return out
+
+    def _fused(self, instructions: list[Instruction]) -> Fused | None:
+        shape = []
+        args = []
+        operators = {}
+        for instruction in instructions:
+            if type(instruction) is PushLiteral:
+                numeric = type(instruction.value) in _numeric_types
+                shape.append(("num",) if numeric else ("literal",))
+                args.append(instruction.value)
+                continue
+            if type(instruction) is CallOperator:
+                kind, op = self.operator_manager.resolve(instruction.name)
+                if kind in _inline_kinds:
+                    name = instruction.name
+                    handler = self.operator_manager.handler(name)
+                    shape.append((kind, op["arg_count"], op["push_result_to_stack"]))
+                    args.extend((op["func"], name, handler))
+                    operators[name] = handler
+                    continue
+            shape.append(("run",))
+            args.append(instruction.run)
+        if all(item[0] in ("num", "literal", "run") for item in shape):
+            return None  # nothing to gain
+        return Fused(instructions, operators, _handler_factory(tuple(shape)), args)
+
+
+############################
+# Code generation
+############################
+
+_factories: dict[tuple, Callable[..., Callable]] = {}
+_factories_lock = threading.Lock()
+
+
+def _handler_factory(shape: tuple) -> Callable[..., Callable]:
+    """Returns `make(fallback, then, numeric, *args) -> handler` for a shape.
+
+    The generated code only depends on the shape (instruction kinds and
+    arities), so it is compiled once per shape and shared.
+    """
+    with _factories_lock:
+        factory = _factories.get(shape)
+        if factory is None:
+            factory = _factories[shape] = _compile_factory(shape)
+        return factory
+
+
+def _compile_factory(shape: tuple) -> Callable[..., Callable]:
+    params = []
+    for i, item in enumerate(shape):
+        params.append(f"x{i}")
+        if item[0] in _inline_kinds:
+            params.extend((f"n{i}", f"h{i}"))
+    lines = [f"def make(fallback, then, numeric, {', '.join(params)}):"]
+    # seg{k} runs the instructions from k; later segments are only entered
+    # after an instruction returned a continuation.
+    for k in reversed(range(len(shape))):
+        lines.extend(_segment(shape, k))
+    lines.append("    return seg0")
+    namespace: dict[str, Any] = {}
+    exec(compile("\n".join(lines), f"<superinstruction {shape}>", "exec"), namespace)
+    return namespace["make"]
+
+
+def _segment(shape: tuple, start: int) -> list[str]:
+    body = [f"    def seg{start}(core, stack):"]
+    body.extend(_guard(shape, start))
+    pending: list[str] = []  # numeric literals not pushed yet (top last)
+
+    def flush() -> None:
+        for value in pending:
+            body.append(f"        stack.append({value})")
+        pending.clear()
+
+    last = len(shape) - 1
+    for i in range(start, len(shape)):
+        kind = shape[i][0]
+        x = f"x{i}"
+        if kind == "num":
+            pending.append(x)
+        elif kind == "literal":
+            flush()
+            body.append(f"        stack.append({x})")
+        elif kind in _inline_kinds:
+            _, arg_count, push = shape[i]
+            args = [f"a{i}_{j}" for j in range(arg_count)]
+            for j in reversed(range(arg_count)):  # the top of the stack first
+                if pending:
+                    args[j] = pending.pop()
+                    continue
+                # The fast path of `StackerCore._pop_and_eval`.
+                body.append(f"        {args[j]} = stack.pop()")
+                body.append(f"        if type({args[j]}) not in numeric:")
+                body.append(f"            stack.append({args[j]})")
+                body.append(f"            {args[j]} = core._pop_and_eval(stack)")
+            # Literals the operator does not consume are pushed first, so the
+            # stack is the same as without fusion if the operator raises.
+            flush()
+            if kind == "stack":
+                args.append("stack")
+            call = f"{x}({', '.join(args)})"
+            if push:
+                body.append(f"        stack.append({call})")
+            else:
+                body.append(f"        {call}")
+        else:  # run the instruction as usual
+            flush()
+            body.append(f"        r = {x}(core, stack)")
+            if i == last:
+                body.append("        return r")
+                return body
+            body.append("        if r is not None:")
+            body.append(f"            return then(r, seg{i + 1}, core, stack)")
+    flush()
+    body.append("        return None")
+    return body
+
+
+def _guard(shape: tuple, start: int) -> list[str]:
+    """`Guarded.valid`, unrolled for the operators from `start` on."""
+    conditions = []
+    for i in range(start, len(shape)):
+        if shape[i][0] in _inline_kinds:
+            conditions.extend(
+                (
+                    f"n{i} in macros",
+                    f"n{i} in variables",
+                    f"n{i} in sfunctions",
+                    f"n{i} in plugins",
+                    f"table.get(n{i}) is not h{i}",
+                )
+            )
+    if not conditions:
+        return []
+    return [
+        "        macros = core.macros",
+        "        variables = core.variables",
+        "        sfunctions = core.sfunctions",
+        "        plugins = core.plugins",
+        "        table = core.operator_manager.dispatch_table",
+        f"        if {' or '.join(conditions)}:",
+        f"            return fallback(core, stack, {start})",
+    ]
@@ -0,0 +1,139 @@
+"""A virtual machine that evaluates compiled code with an explicit frame stack.
+
+Operators that evaluate other code (if, do, iferror, eval, macros, sfunction
+calls, ...) do not call the evaluator themselves. They return a
+*continuation*: a generator that yields `(core, code, stack)` for every piece
+of code it wants evaluated and resumes once that evaluation has finished.
+
+`StackerCore._evaluate` drives continuations by recursing into itself, which
+is simple but bounded by Python's recursion limit. The `VirtualMachine` below
+pushes them on a frame stack instead, so the depth of a Stacker program is
+only bounded by memory.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Generator, Tuple
+
+from stacker.data_type import stack_data
+from stacker.engine.monitor import active
+
+if TYPE_CHECKING:
+    from stacker.core import StackerCore
+    from stacker.engine.compiler import Code
+
+Request = Tuple["StackerCore", "Code", stack_data]
+Continuation = Generator[Request, None, None]
+
+
+def evaluation(core: StackerCore, code: Code, stack: stack_data) -> Continuation:
+    """A continuation that evaluates `code` once."""
+    yield core, code, stack
+
+
+def then(
+    continuation: Continuation, rest: Callable[..., Continuation | None], *args: Any
+) -> Continuation:
+    """A continuation that runs `continuation`, then `rest(*args)`."""
+    yield from continuation
+    continuation = rest(*args)
+    if continuation is not None:
+        yield from continuation
+
+
+class Frame:
+    """A piece of code being evaluated: the instruction list and a program counter."""
+
+    __slots__ = ("core", "instructions", "stack", "pc")
+
+    def __init__(self, core: StackerCore, code: Code, stack: stack_data) -> None:
+        self.core = core
+        self.instructions = code.instructions
+        self.stack = stack
+        self.pc = 0
+        core.trace = code.tokens
+        if core.compiler.profiler is not None:
+            core.compiler.profiler.record(code)
+        if active.monitor is not None:
+            active.monitor.step(len(self.instructions) or 1, stack)
+
+    def __repr__(self) -> str:
+        return f"Frame(pc={self.pc}, instructions={self.instructions})"
+
+
+class VirtualMachine:
+    """Evaluates code without recursing on the Python stack.
+
+    `frames` holds `Frame` objects and the continuations that are waiting for
+    the frame above them to finish. An exception raised by an instruction
+    unwinds the frames up to the nearest continuation and is thrown into it,
+    so `iferror` can catch it just as it does in recursive evaluation.
+    """
+
+    def __init__(self, core: StackerCore, code: Code, stack: stack_data) -> None:
+        self.frames: list[Frame | Continuation] = [Frame(core, code, stack)]
+        self.stack = stack
+
+    def run(self) -> stack_data:
+        frames = self.frames
+        while frames:
+            frame = frames[-1]
+            if type(frame) is not Frame:
+                # A continuation: resume it until it asks for more code.
+                try:
+                    request = next(frame)
+                except StopIteration:
+                    frames.pop()
+                    continue
+                except Exception as e:
+                    frames.pop()
+                    self._unwind(e)
+                    continue
+                frames.append(Frame(*request))
+                continue
+            core = frame.core
+            stack = frame.stack
+            instructions = frame.instructions
+            pc = frame.pc
+            end = len(instructions)
+            continuation = None
+            try:
+                while pc < end:
+                    continuation = instructions[pc].run(core, stack)
+                    pc += 1
+                    if continuation is not None:
+                        break
+            except Exception as e:
+                self._unwind(e)
+                continue
+            if continuation is not None:
+                frame.pc = pc
+                frames.append(continuation)
+            else:
+                frames.pop()
+        return self.stack
+
+    def _unwind(self, error: Exception) -> None:
+        """Discards frames up to the nearest continuation and throws `error` into it.
+
+        If the continuation does not handle the error, the search goes on
+        below it. The error is raised to the caller once the frame stack is
+        empty.
+        """
+        frames = self.frames
+        while True:
+            while frames and type(frames[-1]) is Frame:
+                frames.pop()
+            if not frames:
+                raise error
+            try:
+                request = frames[-1].throw(error)
+            except StopIteration:
+                frames.pop()
+                return
+            except Exception as e:
+                frames.pop()
+                error = e
+                continue
+            frames.append(Frame(*request))
+            return
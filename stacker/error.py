@@ -147,6 +147,37 @@ class ScriptReadError(StackerError):
         super().__init__(message)
 
 
+class ResourceLimitError(ResourceError):
+    """An evaluation exceeded one of its limits (see `Stacker.set_limits`)
+
+    `iferror` does not catch it, so a program cannot get around its limits.
+    """
+
+    def __init__(self, limit, value, message=None):
+        if message is None:
+            message = f"The evaluation exceeded its limit: {limit} = {value}."
+        self.limit = limit  # name of the limit, e.g. "max_instructions"
+        self.value = value
+        super().__init__(message)
+
+
+class ServerError(StackerError):
+    """An error reported by a Stacker server"""
+
+    def __init__(self, message=None, error_type=None):
+        if message is None:
+            message = "The server could not evaluate the expression."
+        self.error_type = error_type  # name of the exception raised by the server
+        super().__init__(message)
+
+
+class EvaluationInterrupted(BaseException):
+    """Stops an evaluation from outside (see `Stacker.aeval`).
+
+    Not an Exception, so `iferror` does not catch it.
+    """
+
+
 class DropError(Exception):
     pass
 
@@ -1,13 +1,28 @@
 from stacker.exec_modes.commandline_mode import CommandLineMode
 from stacker.exec_modes.error import create_error_message
 from stacker.exec_modes.excution_mode import ExecutionMode
-from stacker.exec_modes.repl_mode import ReplMode
 from stacker.exec_modes.script_mode import ScriptMode
 
+
+def __getattr__(name: str):
+    # ReplMode needs prompt_toolkit and ServerMode the threading and socket
+    # modules, which one-shot and script runs do not.
+    if name == "ReplMode":
+        from stacker.exec_modes.repl_mode import ReplMode
+
+        return ReplMode
+    if name == "ServerMode":
+        from stacker.exec_modes.server_mode import ServerMode
+
+        return ServerMode
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "ExecutionMode",
     "ReplMode",
     "ScriptMode",
+    "ServerMode",
     "CommandLineMode",
     "create_error_message",
 ]
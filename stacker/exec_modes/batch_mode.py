@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import io
+import itertools
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from stacker.batch import iter_eval
+from stacker.error import ScriptReadError
+from stacker.include.stkc import load_script
+from stacker.lib.config import script_extension_name
+from stacker.stacker import Stacker
+from stacker.util.disp import disp_default
+
+# Expression lines sent to a worker at a time.
+CHUNK_SIZE = 32
+
+
+class Outcome(NamedTuple):
+    """The result of one script or expression line of a batch.
+
+    `output` is what it printed, `stack` the stack it left (expression lines
+    only), `error` a description of its error and `status` its exit status:
+    0, 1 after an error, or the code passed to `exit-code`.
+    """
+
+    output: str
+    stack: str | None = None
+    error: str | None = None
+    status: int = 0
+
+
+class BatchMode:
+    """Runs independent scripts, or the lines of an expression file, on a
+    pool of `jobs` worker processes.
+
+    Each worker calls `setup` once to create its Stacker, so plugins, the
+    library and the dotfile are loaded once per worker, not once per job.
+    Every script runs on a fresh context of that Stacker (see
+    `Stacker.context`), and every line is an item of `Stacker.eval_many`,
+    so jobs do not see each other's definitions. Outcomes are yielded in
+    input order as soon as they and all before them are done.
+    """
+
+    def __init__(self, setup: Callable[[], Stacker], jobs: int) -> None:
+        if jobs <= 0:
+            raise ValueError(f"jobs must be positive, got {jobs}")
+        self.setup = setup
+        self.jobs = jobs
+
+    def iter_scripts(self, paths: Iterable[str]) -> Iterator[Outcome]:
+        yield from self._map(_run_script, paths)
+
+    def iter_lines(self, lines: Iterable[str]) -> Iterator[Outcome]:
+        """Outcomes of the lines that are not empty or comments."""
+        expressions = (line.strip() for line in lines)
+        expressions = (e for e in expressions if e and not e.startswith("#"))
+        for outcomes in self._map(_run_lines, _chunks(expressions, CHUNK_SIZE)):
+            yield from outcomes
+
+    def run_scripts(self, paths: Iterable[str]) -> int:
+        """Runs the scripts and prints their output; returns the exit status."""
+        return self._report(self.iter_scripts(paths))
+
+    def run_lines(self, lines: Iterable[str]) -> int:
+        """Evaluates the lines and prints their output and stacks, or errors;
+        returns the exit status."""
+        return self._report(self.iter_lines(lines))
+
+    def _map(self, function: Callable, items: Iterable) -> Iterator[Any]:
+        # At most a few jobs per worker are queued, so results stream and a
+        # long input is not read all at once.
+        window = 4 * self.jobs
+        with ProcessPoolExecutor(
+            self.jobs, initializer=_init_worker, initargs=(self.setup,)
+        ) as pool:
+            pending: deque[Future] = deque()
+            try:
+                for item in items:
+                    pending.append(pool.submit(function, item))
+                    if len(pending) >= window:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _report(outcomes: Iterator[Outcome]) -> int:
+        status = 0
+        try:
+            for outcome in outcomes:
+                print(outcome.output, end="")
+                if outcome.error is not None:
+                    print(outcome.error)
+                elif outcome.stack is not None:
+                    print(outcome.stack)
+                status = status or outcome.status
+        except BrokenProcessPool as e:
+            print(f"{type(e).__name__}: {e}")
+            return 1
+        return status
+
+
+# The Stacker of this worker process.
+_stacker: Stacker | None = None
+
+
+def _init_worker(setup: Callable[[], Stacker]) -> None:
+    global _stacker
+    _stacker = setup()
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[list[str]]:
+    items = iter(items)
+    while chunk := list(itertools.islice(items, size)):
+        yield chunk
+
+
+def _exit_status(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+    return e.code if isinstance(e.code, int) else 1
+
+
+def _take(output: io.StringIO) -> str:
+    """Returns what was written to `output` so far and empties it."""
+    text = output.getvalue()
+    output.seek(0)
+    output.truncate()
+    return text
+
+
+def _run_script(file_path: str) -> Outcome:
+    context = _stacker.context()
+    path = Path(file_path)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            if not path.is_file() or not path.suffix == script_extension_name:
+                raise ScriptReadError(
+                    f"Invalid file path or file type. Please provide a valid '{script_extension_name}' file."
+                )
+            for tokens in load_script(path):
+                context.evaluate(tokens, stack=context.stack)
+        except SystemExit as e:
+            return Outcome(output.getvalue(), status=_exit_status(e))
+        except Exception as e:
+            error = f"File: {path.resolve()}\n{type(e).__name__}: {e}"
+            return Outcome(output.getvalue(), error=error, status=1)
+    return Outcome(output.getvalue())
+
+
+def _run_lines(expressions: list[str]) -> list[Outcome]:
+    outcomes = []
+    output = io.StringIO()
+    with redirect_stdout(output):
+        while len(outcomes) < len(expressions):
+            # `exit` ends the line, not the batch: start again after it.
+            results = iter_eval(_stacker, expressions[len(outcomes) :])
+            try:
+                for result in results:
+                    text = _take(output)
+                    if result.ok:
+                        outcomes.append(Outcome(text, disp_default(result.stack)))
+                    else:
+                        error = f"{type(result.error).__name__}: {result.error}"
+                        outcomes.append(Outcome(text, error=error, status=1))
+            except SystemExit as e:
+                outcomes.append(Outcome(_take(output), status=_exit_status(e)))
+    return outcomes
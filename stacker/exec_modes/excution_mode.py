@@ -2,16 +2,9 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from prompt_toolkit.completion import WordCompleter
-
-from stacker.include.stk_file_read import readtxt
+from stacker.include.stk_file_read import iter_statements, read_lines
 from stacker.stacker import Stacker
-from stacker.syntax.parser import (
-    is_array_balanced,
-    is_brace_balanced,
-    is_tuple_balanced,
-    remove_start_end_quotes,
-)
+from stacker.syntax.parser import remove_start_end_quotes
 
 # from stacker.syntax.parser import is_string
 from stacker.util.disp import disp_stack
@@ -60,7 +53,6 @@ class ExecutionMode:
             # "delete_history",
             "vars",
         ]
-        self.completer = WordCompleter(self.get_completer())
 
     def get_completer(self):
         # _reserved_word = copy.deepcopy(self.rpn_calculator.reserved_word)
@@ -129,23 +121,5 @@ class ExecutionMode:
     def execute_stacker_dotfile(self, filename: str | Path) -> None:
         """Import a stacker script and return the stacker object."""
         path = Path(remove_start_end_quotes(str(filename)))
-        code = readtxt(path)
-        expression = ""
-        for line in code.splitlines():
-            line = line.strip()
-            expression += line + " "
-            if self._is_balanced(expression):
-                if expression[-2:] in {";]", ";)"}:
-                    closer = expression[-1]
-                    expression = expression[:-2] + closer
-                self.rpn_calculator.process_expression(expression)
-                expression = ""
-
-    def _is_balanced(self, expression: str) -> bool:
-        return (
-            is_array_balanced(expression)
-            and is_tuple_balanced(expression)
-            and is_brace_balanced(expression)
-            and (expression.count('"""') % 2 == 0)
-            and (expression.count("'''") % 2 == 0)
-        )
+        for expression in iter_statements(read_lines(path)):
+            self.rpn_calculator.process_expression(expression)
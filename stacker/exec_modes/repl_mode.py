@@ -13,6 +13,7 @@ from stacker.exec_modes.error import create_error_message
 from stacker.exec_modes.excution_mode import ExecutionMode
 from stacker.lib import delete_history, disp_about, disp_help
 from stacker.lib.config import history_file_path
+from stacker.stacker import Stacker
 from stacker.syntax.parser import (
     is_array,
     is_array_balanced,
@@ -24,6 +25,10 @@ from stacker.syntax.parser import (
 
 
 class ReplMode(ExecutionMode):
+    def __init__(self, rpn_calculator: Stacker):
+        super().__init__(rpn_calculator)
+        self.update_completer()
+
     def update_completer(self):
         self.completer = WordCompleter(self.get_completer())
 
@@ -147,14 +152,18 @@ class ReplMode(ExecutionMode):
                     for (
                         operator_name,
                         operator_descriptions,
-                    ) in self.rpn_calculator.operator_manager.get_stack_descriptions().items():
+                    ) in (
+                        self.rpn_calculator.operator_manager.get_stack_descriptions().items()
+                    ):
                         print(f"  {operator_name}:\t{operator_descriptions}")
                     print("")
                     print("Settings operators:")
                     for (
                         operator_name,
                         operator_descriptions,
-                    ) in self.rpn_calculator.operator_manager.get_settings_descriptions().items():
+                    ) in (
+                        self.rpn_calculator.operator_manager.get_settings_descriptions().items()
+                    ):
                         print(f"  {operator_name}:\t{operator_descriptions}")
                     print("")
                     print("Plugin commands:")
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from stacker.exec_modes.excution_mode import ExecutionMode
+from stacker.stacker import Stacker
+
+DEFAULT_WORKERS = 4
+
+
+def to_json(value: Any) -> Any:
+    """A JSON-compatible form of a stack value."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    return str(value)
+
+
+class _ThreadOutput(io.TextIOBase):
+    """Replaces sys.stdout so each session captures its own output."""
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._local = threading.local()
+
+    @contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        buffer = self._local.buffer = io.StringIO()
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            return self._stream.write(text)
+        return buffer.write(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, "buffer", None) is None:
+            self._stream.flush()
+
+
+class _Server(socketserver.UnixStreamServer):
+    """Handles each connection on a thread of a bounded pool."""
+
+    def __init__(self, path: str, mode: ServerMode, workers: int) -> None:
+        self.mode = mode
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="stacker")
+        super().__init__(path, _SessionHandler)
+
+    def process_request(self, request, client_address) -> None:
+        self.pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _SessionHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        mode = self.server.mode
+        session = mode.new_session()
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = mode.handle(session, line)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            if response.get("exit"):
+                return
+
+
+class ServerMode(ExecutionMode):
+    """Evaluates expressions sent over a Unix domain socket.
+
+    Every connection is a session: a context (see `Stacker.context`) on
+    `rpn_calculator`, in which plugins, the library and the dotfile have
+    been loaded, starting with a copy of its stack. A session keeps its
+    stack and definitions between requests and sees nothing of other
+    sessions. At most `workers` sessions are served at once; further
+    connections wait for a free worker.
+
+    Requests and responses are JSON objects, one per line:
+
+        {"expr": "1 2 +", "id": 1}
+        {"id": 1, "ok": true, "stack": [3], "output": ""}
+        {"id": 2, "ok": false, "error": {"type": "...", "message": "..."}, ...}
+
+    A request that fails leaves the stack as it was before the request.
+    """
+
+    def __init__(self, rpn_calculator: Stacker, workers: int = DEFAULT_WORKERS):
+        super().__init__(rpn_calculator)
+        if workers <= 0:
+            raise ValueError(f"workers must be positive, got {workers}")
+        self.workers = workers
+        self.output = _ThreadOutput(sys.stdout)
+        self.server: _Server | None = None
+
+    def new_session(self) -> Stacker:
+        session = self.rpn_calculator.context()
+        session.stack.extend(self.rpn_calculator.stack)
+        return session
+
+    def handle(self, session: Stacker, line: bytes | str) -> dict:
+        """Evaluates one request line and returns the response."""
+        response: dict[str, Any] = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+            response["id"] = request.get("id")
+            expression = request["expr"]
+            if not isinstance(expression, str):
+                raise ValueError("'expr' must be a string")
+        except (ValueError, KeyError) as e:
+            response.update(ok=False, error=_error(e), output="")
+            return response
+
+        saved = session.get_stack_copy()
+        with self.output.capture() as output:
+            try:
+                session.process_expression(expression)
+                response.update(ok=True, stack=to_json(list(session.stack)))
+            except SystemExit:
+                # `exit` ends the session, not the server.
+                response.update(ok=True, stack=to_json(list(session.stack)))
+                response["exit"] = True
+            except Exception as e:
+                session.stack = saved
+                response.update(ok=False, error=_error(e))
+        response["output"] = output.getvalue()
+        return response
+
+    def run(self, socket_path: str) -> None:
+        """Serves until interrupted or `shutdown` is called."""
+        _remove_stale_socket(socket_path)
+        server = self.server = _Server(socket_path, self, self.workers)
+        stdout, sys.stdout = sys.stdout, self.output
+        print(f"Serving on {socket_path} with {self.workers} workers.", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sys.stdout = stdout
+            server.server_close()
+            os.unlink(socket_path)
+
+    def shutdown(self) -> None:
+        """Stops a server running on another thread."""
+        self.server.shutdown()
+
+
+def _error(e: BaseException) -> dict[str, str]:
+    return {"type": type(e).__name__, "message": str(e)}
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Removes a socket file left by a server that is no longer running."""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise FileExistsError(f"a server is already listening on {path}")
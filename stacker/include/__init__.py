@@ -1,5 +1,9 @@
 from __future__ import annotations
 
-from stacker.include.include import include_stacker_script
+from stacker.include.include import (
+    IncludedScript,
+    include_stacker_script,
+    load_included_script,
+)
 
-__all__ = ["include_stacker_script"]
+__all__ = ["IncludedScript", "include_stacker_script", "load_included_script"]
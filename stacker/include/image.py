@@ -0,0 +1,212 @@
+"""Startup images.
+
+Every start loads the plugins, includes the Stacker library and runs the
+dotfile. An image is a snapshot of the interpreter state they leave behind
+(variables, functions, macros, labels, the stack, the display settings and
+the registered plugins), which a later start restores instead of loading
+them again.
+
+An image lists the modification time and size of every file and directory
+that contributed to it, and is ignored as soon as any of them changes, is
+added or is removed. Output printed while loading is not part of the image.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import pickle
+import sys
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from stacker.core import StackerCore
+from stacker.include.include import include_cache
+from stacker.sfunction import StackerFunction
+from stacker.slambda import StackerLambda
+from stacker.smacro import StackerMacro
+
+if TYPE_CHECKING:
+    from stacker.stacker import Stacker
+
+# Bump whenever the layout of the state changes.
+FORMAT_VERSION = 1
+
+_MAGIC = b"STKI"
+
+_SETTINGS = ("_disp_stack_mode", "_disp_logo", "_disp_ans")
+
+# Stacker itself; an image made by another version is never used.
+_PACKAGE = Path(__file__).resolve().parent.parent / "__init__.py"
+
+
+def _stat(path: Path) -> tuple[str, int, int] | tuple[str, None, None]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _header(sources: Iterable[str | Path]) -> tuple:
+    paths = {Path(source).resolve() for source in sources}
+    paths.add(_PACKAGE)
+    return (FORMAT_VERSION, sys.version_info[:2], sorted(map(_stat, paths)))
+
+
+class _Pickler(pickle.Pickler):
+    """Stores blocks and the objects built on them by their tokens."""
+
+    def persistent_id(self, obj: Any) -> tuple | None:
+        if isinstance(obj, StackerCore):
+            return ("block", obj.tokens)
+        if isinstance(obj, StackerFunction):
+            memo_size = obj.memo.maxsize if obj.memo is not None else None
+            return ("function", obj.args, obj.blockstack, memo_size)
+        if isinstance(obj, StackerLambda):
+            return ("lambda", obj.args, obj.blockstack)
+        if isinstance(obj, StackerMacro):
+            return ("macro", obj.name, obj.blockstack)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    """Rebuilds blocks as children of `stacker`."""
+
+    def __init__(self, file, stacker: Stacker) -> None:
+        super().__init__(file)
+        self.stacker = stacker
+
+    def persistent_load(self, pid: tuple) -> Any:
+        kind, *args = pid
+        if kind == "block":
+            block = type(self.stacker)(parent=self.stacker)
+            block.tokens = list(args[0])
+            return block
+        if kind == "function":
+            args, blockstack, memo_size = args
+            function = StackerFunction(args, blockstack)
+            if memo_size is not None:
+                function.memoize(memo_size)
+            return function
+        if kind == "lambda":
+            return StackerLambda(*args)
+        if kind == "macro":
+            return StackerMacro(*args)
+        raise pickle.UnpicklingError(f"unknown persistent id {kind!r}")
+
+
+def _plugin_reference(name: str, func: Any) -> tuple[str, str, str]:
+    """(directory, module, qualified name) to import the function from."""
+    module = sys.modules.get(getattr(func, "__module__", None))
+    qualname = getattr(func, "__qualname__", "")
+    file = getattr(module, "__file__", None)
+    if file is None or "<" in qualname:
+        raise pickle.PicklingError(f"plugin '{name}' is not a module-level function")
+    return (os.path.dirname(file), module.__name__, qualname)
+
+
+def _import_plugin(directory: str, module: str, qualname: str) -> Any:
+    sys.path.insert(0, directory)
+    try:
+        obj = importlib.import_module(module)
+    finally:
+        sys.path.pop(0)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def save_image(
+    stacker: Stacker, path: str | Path, sources: Iterable[str | Path] = ()
+) -> bool:
+    """Writes the state of `stacker` to an image at `path`.
+
+    `sources` are the files and directories the state was loaded from; the
+    scripts included so far and the modules of the plugins are added to
+    them. Returns False, and writes nothing, when the state cannot be
+    stored, for example because a plugin is a closure.
+    """
+    path = Path(path)
+    try:
+        plugins = []
+        modules = []
+        for name in stacker.plugins:
+            func, push_result_to_stack, pass_core, desc = stacker.plugin_registrations[
+                name
+            ]
+            reference = _plugin_reference(name, func)
+            modules.append(sys.modules[reference[1]].__file__)
+            plugins.append((name, reference, push_result_to_stack, pass_core, desc))
+        state = {
+            "variables": stacker.variables,
+            "macros": stacker.macros,
+            "sfunctions": stacker.sfunctions,
+            "labels": stacker.labels,
+            "stack": stacker.stack,
+            "settings": {name: getattr(stacker, name) for name in _SETTINGS},
+            "plugins": plugins,
+            "plugin_descriptions": stacker.plugin_descriptions,
+        }
+        header = _header([*sources, *include_cache, *modules])
+        with tempfile.TemporaryFile() as buffer:
+            pickle.dump(header, buffer)
+            _Pickler(buffer).dump(state)
+            buffer.seek(0)
+            data = _MAGIC + buffer.read()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see half an image.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except (KeyError, OSError, pickle.PicklingError, TypeError, AttributeError):
+        return False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        os.unlink(tmp)
+        return False
+    return True
+
+
+def restore_image(stacker: Stacker, path: str | Path) -> bool:
+    """Restores the state saved by `save_image` into `stacker`.
+
+    Returns False, leaving `stacker` unchanged, when there is no image or it
+    is stale or unreadable.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return False
+            version, python, sources = pickle.load(f)
+            if (version, python) != (FORMAT_VERSION, sys.version_info[:2]):
+                return False
+            for source, mtime, size in sources:
+                if _stat(Path(source)) != (source, mtime, size):
+                    return False
+            state = _Unpickler(f, stacker).load()
+        plugins = [
+            (name, _import_plugin(*reference), *registration)
+            for name, reference, *registration in state["plugins"]
+        ]
+    except Exception:
+        return False
+
+    stacker.variables.update(state["variables"])
+    stacker.macros.update(state["macros"])
+    stacker.sfunctions.update(state["sfunctions"])
+    stacker.labels.update(state["labels"])
+    stacker.stack.extend(state["stack"])
+    for name, value in state["settings"].items():
+        setattr(stacker, name, value)
+    for name, func, push_result_to_stack, pass_core, desc in plugins:
+        stacker.register_plugin(name, func, push_result_to_stack, pass_core, desc)
+    stacker.plugin_descriptions.update(state["plugin_descriptions"])
+    for name, op in stacker.sfunctions.items():
+        function = op["func"]
+        if isinstance(function, StackerFunction) and function.memo is not None:
+            function.memoize(function.memo.maxsize, stacker.memo_store, name)
+    return True
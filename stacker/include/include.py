@@ -3,12 +3,55 @@ from __future__ import annotations
 from pathlib import Path
 
 from stacker.error import IncludeError
-from stacker.include.stk_file_read import readtxt
+from stacker.include.stkc import load_include
 from stacker.syntax.parser import remove_start_end_quotes
 
 
+class IncludedScript:
+    """A script evaluated by `include`, and the names it defined.
+
+    `macros`, `variables` and `sfunctions` hold only the names the script
+    bound or rebound, not the constants every Stacker starts with, and
+    refer to the same objects as `stacker`.
+    """
+
+    __slots__ = ("stacker", "mtime", "size", "macros", "variables", "sfunctions")
+
+    def __init__(self, stacker, mtime: int, size: int, defaults: tuple) -> None:
+        self.stacker = stacker
+        self.mtime = mtime
+        self.size = size
+        self.macros, self.variables, self.sfunctions = (
+            _defined(names, default)
+            for names, default in zip(
+                (stacker.macros, stacker.variables, stacker.sfunctions), defaults
+            )
+        )
+
+
+# Scripts evaluated in this process, by resolved path. An entry is used while
+# the file keeps its modification time and size; like Python modules, it is
+# not reloaded when only a script it includes changes.
+include_cache: dict[Path, IncludedScript] = {}
+
+_missing = object()
+
+
+def _defined(names: dict, default: dict) -> dict:
+    return {
+        name: value
+        for name, value in names.items()
+        if default.get(name, _missing) is not value
+    }
+
+
 def include_stacker_script(filename: str | Path):
     """Import a stacker script and return the stacker object."""
+    return load_included_script(filename).stacker
+
+
+def load_included_script(filename: str | Path) -> IncludedScript:
+    """Evaluates a stacker script once per process and returns it."""
     if isinstance(filename, str):
         filename = remove_start_end_quotes(filename)
         # filename = Path(filename).resolve()
@@ -20,13 +63,25 @@ def include_stacker_script(filename: str | Path):
     if filename.suffix != ".stk":
         raise IncludeError(f"File {filename} is not a stacker script.")
 
+    path = filename.resolve()
+    stat = path.stat()
+    script = include_cache.get(path)
+    if script is not None and (script.mtime, script.size) == (
+        stat.st_mtime_ns,
+        stat.st_size,
+    ):
+        return script
+
     # with open(filename, 'r') as file:
     # script_content = file.read()
 
-    script_content = readtxt(filename)
+    tokens = load_include(path)
 
     from stacker.stacker import Stacker
 
     stacker = Stacker()
-    stacker.process_expression(script_content)
-    return stacker
+    defaults = (dict(stacker.macros), dict(stacker.variables), dict(stacker.sfunctions))
+    stacker.evaluate(tokens, stack=stacker.stack)
+    script = IncludedScript(stacker, stat.st_mtime_ns, stat.st_size, defaults)
+    include_cache[path] = script
+    return script
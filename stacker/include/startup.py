@@ -0,0 +1,110 @@
+"""Loading what every Stacker run starts with: the plugins of the package and
+of the current directory, the Stacker library (`slib`) and the dotfile."""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import sys
+from pathlib import Path
+
+from stacker.exec_modes import ExecutionMode
+from stacker.lib.config import plugins_dir_path, stacker_dotfile_path
+from stacker.stacker import Stacker
+from stacker.util import colored
+
+
+def load_stacker_lib(stacker: Stacker, dir_path) -> bool:
+    """Load the Stacker library from the specified directory.
+    :param stacker: The Stacker instance to pass to the plugins.
+    :param dir_path: The directory to load the Stacker library from.
+    :return: None
+    """
+    # Add the library directory path
+    sys.path.insert(0, dir_path)
+    for filename in os.listdir(dir_path):
+        try:
+            if filename.endswith(".stk"):
+                include_stacker_script = Path(dir_path) / filename
+                stacker.include(str(include_stacker_script))
+        except Exception as e:
+            print(colored(f"Failed load slib ({filename}). {e}", "red"))
+            sys.path.pop(0)
+            return False
+    sys.path.pop(0)
+    return True
+
+
+def load_plugins(stacker: Stacker, plugins_dir_path) -> bool:
+    """Load plugins from the plugins directory.
+    :param stacker: The Stacker instance to pass to the plugins.
+    :return: None
+    """
+    # Add the plugin directory path
+    sys.path.insert(0, plugins_dir_path)
+    for filename in os.listdir(plugins_dir_path):
+        try:
+            if filename.endswith(".py") and not filename.startswith("__"):
+                module_name = os.path.splitext(filename)[0]  # remove .py extension
+                plugin_module = importlib.import_module(module_name)
+                plugin_module.setup(stacker)
+                logging.debug(f"Loaded plugin '{module_name}'.")
+        except Exception as e:
+            print(colored(f"Failed load plugin ({filename}). {e}", "red"))
+            sys.path.pop(0)
+            return False
+    sys.path.pop(0)
+    return True
+
+
+def load_dotfile(stacker: Stacker, dotfile_path: str | Path) -> None:
+    """Load the dotfile.
+    :param stacker: The Stacker instance to pass to the plugins.
+    :param dotfile_path: The path to the dotfile.
+    :return: None
+    """
+    try:
+        if not os.path.isfile(dotfile_path):
+            print(f"Error: The file '{dotfile_path}' does not exist.")
+            return
+        stacker.include(str(dotfile_path))
+    except Exception as e:
+        print(f"An error occurred while loading the dotfile: {str(e)}")
+
+
+def load_startup_state(stacker: Stacker) -> list[str]:
+    """Load the plugins, the Stacker library and the dotfile.
+    :param stacker: The Stacker instance to load them into.
+    :return: The files and directories they were loaded from.
+    """
+    # load plugins from the Stacker's installation directory
+    script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    plugins_dir = os.path.join(script_dir, plugins_dir_path)
+    if not load_plugins(stacker, plugins_dir):
+        sys.exit(1)
+
+    # load plugins from current directory
+    local_plugins_dir = os.path.join(os.getcwd(), plugins_dir_path)
+    if Path(local_plugins_dir).exists():
+        if not load_plugins(stacker, local_plugins_dir):
+            sys.exit(1)
+
+    # load the Stacker library
+    library_dir = os.path.join(script_dir, "slib")
+    if not load_stacker_lib(stacker, library_dir):
+        sys.exit(1)
+
+    # execute the dotfile
+    if stacker_dotfile_path.exists():
+        ExecutionMode(stacker).execute_stacker_dotfile(stacker_dotfile_path)
+
+    sources = [plugins_dir, local_plugins_dir, library_dir, stacker_dotfile_path]
+    for directory, suffix in (
+        (plugins_dir, ".py"),
+        (local_plugins_dir, ".py"),
+        (library_dir, ".stk"),
+    ):
+        if os.path.isdir(directory):
+            sources.extend(Path(directory).glob(f"*{suffix}"))
+    return sources
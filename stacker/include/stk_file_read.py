@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+
 def readtxt(file_path):
     """
     This function reads a text file and ignores lines that are either
@@ -7,35 +12,7 @@ def readtxt(file_path):
     or are blank lines (including the last line if it's blank).
     Additionally, it trims a final newline character if it exists.
     """
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    # State flags to track if the current line is within a block comment
-    in_double_quote_comment = False
-    in_single_quote_comment = False
-
-    filtered_lines = []
-
-    for line in lines:
-        if line.strip().startswith(
-            '"""'
-        ):  # Check for the start and end of triple double quote block
-            in_double_quote_comment = not in_double_quote_comment
-            continue  # Skip the line with triple quotes
-        if line.strip().startswith(
-            "'''"
-        ):  # Check for the start and end of triple single quote block
-            in_single_quote_comment = not in_single_quote_comment
-            continue  # Skip the line with triple quotes
-        if (
-            in_double_quote_comment or in_single_quote_comment
-        ):  # Skip lines within block comments
-            continue
-        # if (
-        #     line.strip().startswith("#") or not line.strip()
-        # ):  # Skip lines that start with # or are blank lines (including the last line if it's blank)
-        #     continue
-        filtered_lines.append(line)
+    filtered_lines = list(read_lines(file_path))
 
     # Trim the final newline character if it exists
     if filtered_lines and not filtered_lines[-1].strip():
@@ -44,3 +21,73 @@ def readtxt(file_path):
     return "".join(filtered_lines).rstrip(
         "\n"
     )  # Remove trailing newline if it's the last character
+
+
+def read_lines(file_path) -> Iterator[str]:
+    """
+    Yields the lines of a text file one at a time, skipping the same
+    block comments as `readtxt`. The file is read lazily, so it is never
+    held in memory as a whole.
+    """
+    # State flags to track if the current line is within a block comment
+    in_double_quote_comment = False
+    in_single_quote_comment = False
+
+    with open(file_path, "r") as file:
+        for line in file:
+            if line.strip().startswith(
+                '"""'
+            ):  # Check for the start and end of triple double quote block
+                in_double_quote_comment = not in_double_quote_comment
+                continue  # Skip the line with triple quotes
+            if line.strip().startswith(
+                "'''"
+            ):  # Check for the start and end of triple single quote block
+                in_single_quote_comment = not in_single_quote_comment
+                continue  # Skip the line with triple quotes
+            if (
+                in_double_quote_comment or in_single_quote_comment
+            ):  # Skip lines within block comments
+                continue
+            yield line
+
+
+def iter_statements(
+    lines: Iterable[str], strip_comments: bool = False
+) -> Iterator[str]:
+    """
+    Joins lines into the statements that are evaluated one at a time.
+    A statement ends with the first line after which every [, ( and { is
+    closed and triple quotes are paired. The counts are updated as each
+    line arrives, so every line is scanned once.
+    If `strip_comments` is set, everything after a # is dropped. Lines
+    left over at the end that never balance are not yielded.
+    """
+    parts = []
+    brackets = parens = braces = 0
+    double_quotes = single_quotes = 0
+    for line in lines:
+        if strip_comments:
+            sharp_index = line.find("#")
+            if sharp_index != -1:
+                line = line[:sharp_index]
+        line = line.strip()
+        parts.append(line)
+        brackets += line.count("[") - line.count("]")
+        parens += line.count("(") - line.count(")")
+        braces += line.count("{") - line.count("}")
+        double_quotes += line.count('"""')
+        single_quotes += line.count("'''")
+        if (
+            brackets == parens == braces == 0
+            and double_quotes % 2 == 0
+            and single_quotes % 2 == 0
+        ):
+            expression = " ".join(parts) + " "
+            parts.clear()
+            if expression.isspace():
+                continue
+            if expression[-2:] in {";]", ";)"}:
+                closer = expression[-1]
+                expression = expression[:-2] + closer
+            yield expression
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import struct
+import tempfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from stacker.include.stk_file_read import iter_statements, read_lines, readtxt
+from stacker.lib.config import compiled_cache_dir_path
+from stacker.syntax.parser import parse_expression
+
+# Bump whenever the lexer, the statement splitting or the entry layout changes.
+FORMAT_VERSION = 2
+
+_MAGIC = b"STKC"
+
+
+class CompiledCache:
+    """A `.pyc`-style cache of the token streams of `.stk` files.
+
+    Entries are `.stkc` files in `directory`, one per source file and kind
+    of load. Each is keyed by the resolved path, modification time and size
+    of the source and by `FORMAT_VERSION`, and is rewritten when any of
+    them changes. A cache that cannot be read or written is ignored.
+    """
+
+    suffix = ".stkc"
+
+    def __init__(self, directory: str | Path, enabled: bool = True) -> None:
+        self.directory = Path(directory).expanduser()
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, source: Path, kind: str) -> Path:
+        digest = hashlib.sha1(str(source).encode()).hexdigest()[:16]
+        return self.directory / f"{source.stem}-{digest}.{kind}{self.suffix}"
+
+    def load(
+        self,
+        source: str | Path,
+        kind: str,
+        tokenize: Callable[[Path], Iterator[list[str]]],
+    ) -> Iterator[list[str]]:
+        """Yields the token lists of `source`.
+
+        They come from the cache when it is fresh and from `tokenize(source)`
+        otherwise, in which case they are stored as they are yielded. Either
+        way at most `CHUNK_SIZE` of them are held in memory at a time.
+        """
+        source = Path(source).resolve()
+        if not self.enabled:
+            yield from tokenize(source)
+            return
+        stat = source.stat()
+        key = (FORMAT_VERSION, str(source), stat.st_mtime_ns, stat.st_size)
+        path = self.path_for(source, kind)
+        done = 0  # statements yielded from the cache
+        f = self._open(path, key)
+        if f is not None:
+            with f:
+                for chunk in _chunks(f):
+                    if chunk is None:
+                        self.hits += 1
+                        return
+                    for tokens in chunk:
+                        yield list(tokens)
+                        done += 1
+            # The entry is damaged: tokenize the rest of the source.
+        self.misses += 1
+        writer = _Writer.create(self.directory, key)
+        try:
+            for index, tokens in enumerate(tokenize(source)):
+                if writer is not None:
+                    writer = writer.add(tokens)
+                if index >= done:
+                    yield tokens
+            if writer is not None:
+                writer.commit(path)
+        finally:
+            if writer is not None:
+                writer.discard()
+
+    def _open(self, path: Path, key: tuple) -> BinaryIO | None:
+        """The entry at `path`, positioned at its first statement, if it
+        holds `key`."""
+        try:
+            f = path.open("rb")
+        except OSError:
+            return None
+        try:
+            if f.read(len(_MAGIC)) == _MAGIC and _load(f) == key:
+                return f
+        except Exception:
+            pass
+        f.close()
+        return None
+
+    def clear(self) -> None:
+        """Removes every `.stkc` file in the cache directory."""
+        if self.directory.is_dir():
+            for path in self.directory.glob(f"*{self.suffix}"):
+                path.unlink(missing_ok=True)
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# An entry is `_MAGIC`, then records: the key, the statements in chunks of up
+# to `CHUNK_SIZE` (a tuple of tuples of tokens each) and None. A record is its
+# length and its marshalled value. Chunks keep memory bounded on large
+# scripts and, unlike one record per statement, still load faster than the
+# source can be tokenized.
+CHUNK_SIZE = 256
+
+_length = struct.Struct("<I")
+
+
+def _load(f: BinaryIO) -> Any:
+    (size,) = _length.unpack(f.read(_length.size))
+    data = f.read(size)
+    if len(data) != size:
+        raise EOFError("truncated record")
+    return marshal.loads(data)
+
+
+def _chunks(f: BinaryIO) -> Iterator[tuple | None]:
+    """The chunks of an entry, then None; stops early if it is damaged."""
+    while True:
+        try:
+            chunk = _load(f)
+        except Exception:
+            return
+        if chunk is not None and type(chunk) is not tuple:
+            return
+        yield chunk
+        if chunk is None:
+            return
+
+
+class _Writer:
+    """Writes an entry to a temporary file, so readers never see half of it."""
+
+    def __init__(self, f: BinaryIO, tmp: str | None) -> None:
+        self.f = f
+        self.tmp = tmp
+        self.chunk: list[tuple] = []
+
+    @classmethod
+    def create(cls, directory: Path, key: tuple) -> _Writer | None:
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        except Exception:
+            return None
+        writer = cls(os.fdopen(fd, "wb"), tmp)
+        try:
+            writer.f.write(_MAGIC)
+        except Exception:
+            writer.discard()
+            return None
+        return writer.dump(key)
+
+    def add(self, tokens: list[str]) -> _Writer | None:
+        """Appends a statement; None (and no entry) if that fails."""
+        self.chunk.append(tuple(tokens))
+        if len(self.chunk) < CHUNK_SIZE:
+            return self
+        chunk, self.chunk = tuple(self.chunk), []
+        return self.dump(chunk)
+
+    def dump(self, value: Any) -> _Writer | None:
+        try:
+            data = marshal.dumps(value)
+            self.f.write(_length.pack(len(data)) + data)
+            return self
+        except Exception:
+            self.discard()
+            return None
+
+    def commit(self, path: Path) -> None:
+        try:
+            if self.chunk and self.dump(tuple(self.chunk)) is None:
+                return
+            if self.dump(None) is None:  # marks the end of a complete entry
+                return
+            self.f.close()
+            os.replace(self.tmp, path)
+            self.tmp = None
+        except Exception:
+            pass
+
+    def discard(self) -> None:
+        """Removes the temporary file, unless the entry was committed."""
+        self.f.close()
+        if self.tmp is not None:
+            tmp, self.tmp = self.tmp, None
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+compiled_cache = CompiledCache(compiled_cache_dir_path)
+
+
+def _script_tokens(path: Path) -> Iterator[list[str]]:
+    for expression in iter_statements(read_lines(path), strip_comments=True):
+        yield parse_expression(expression)
+
+
+def _include_tokens(path: Path) -> Iterator[list[str]]:
+    yield parse_expression(readtxt(path))
+
+
+def load_script(path: str | Path) -> Iterator[list[str]]:
+    """Yields the token lists of the statements of a script, as script mode
+    evaluates them."""
+    return compiled_cache.load(path, "script", _script_tokens)
+
+
+def load_include(path: str | Path) -> list[str]:
+    """The tokens of an included script, which is evaluated as a whole."""
+    (tokens,) = compiled_cache.load(path, "include", _include_tokens)
+    return tokens
@@ -10,3 +10,5 @@ stacker_dotfile = ".stackerrc"
 stacker_dotfile_path = Path.home() / stacker_dotfile
 
 script_extension_name = ".stk"
+
+compiled_cache_dir_path = Path.home() / ".cache" / "stacker"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from stacker.error import StackerSyntaxError, UndefinedSymbolError
 from stacker.sfunction import StackerFunction
 
 
@@ -18,6 +19,16 @@ def defun_sfunction(
     )
 
 
+def memoize_sfunction(stacker: Stacker, func_name: str) -> None:
+    """Caches the results of a function by its arguments."""
+    if func_name not in stacker.sfunctions:
+        raise UndefinedSymbolError(func_name)
+    function = stacker.sfunctions[func_name]["func"]
+    if not isinstance(function, StackerFunction):
+        raise StackerSyntaxError(f"Cannot memoize '{func_name}'")
+    function.memoize(store=stacker.memo_store, name=func_name)
+
+
 defun_operators = {
     "defun": {
         "func": (
@@ -29,4 +40,10 @@ defun_operators = {
         "push_result_to_stack": False,
         "desc": "Defines a function.",
     },
+    "memoize": {
+        "func": (lambda stacker, func_name: memoize_sfunction(stacker, func_name)),
+        "arg_count": 1,
+        "push_result_to_stack": False,
+        "desc": "Caches the results of a pure function by its arguments.",
+    },
 }
@@ -2,25 +2,30 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from stacker.error import ResourceLimitError
+
 if TYPE_CHECKING:
+    from stacker.engine import Continuation
     from stacker.stacker import Stacker
 
 
-def _if(condition: Stacker | bool, blockstack: Stacker | Any, parent: Stacker) -> None:
+def _if(
+    condition: Stacker | bool, blockstack: Stacker | Any, parent: Stacker
+) -> Continuation:
     """Executes a block of code if a condition is true.
     {block}
     {condition}
     if
     """
     if isinstance(condition, type(parent)):
-        parent.evaluate(condition.tokens, stack=parent.stack)
+        yield parent, condition.code, parent.stack
         condition = parent.stack.pop()
     if isinstance(condition, str):
         if condition in parent.variables:
             condition = parent.variables[condition]
     if condition:
         if isinstance(blockstack, type(parent)):
-            parent.evaluate(blockstack.tokens, stack=parent.stack)
+            yield parent, blockstack.code, parent.stack
         else:  # e.g. a numeric object
             parent.stack.append(blockstack)
 
@@ -30,7 +35,7 @@ def _if_else(
     true_block: Stacker | Any,
     false_block: Stacker | Any,
     parent: Stacker,
-) -> None:
+) -> Continuation:
     """Executes a block of code if a condition is true, otherwise executes another block of code.
     {true block}
     {false block}
@@ -38,19 +43,19 @@ def _if_else(
     ifelse
     """
     if isinstance(condition, type(parent)):
-        parent.evaluate(condition.tokens, stack=parent.stack)
+        yield parent, condition.code, parent.stack
         condition = parent.stack.pop()
     if isinstance(condition, str):
         if condition in parent.variables:
             condition = parent.variables[condition]
     if condition:
         if isinstance(true_block, type(parent)):
-            parent.evaluate(true_block.tokens, stack=parent.stack)
+            yield parent, true_block.code, parent.stack
         else:  # e.g. a numeric object
             parent.stack.append(true_block)
     else:
         if isinstance(false_block, type(parent)):
-            parent.evaluate(false_block.tokens, stack=parent.stack)
+            yield parent, false_block.code, parent.stack
         else:
             parent.stack.append(false_block)
 
@@ -59,7 +64,7 @@ def _iferror(
     try_block: Stacker | Any,
     catch_block: Stacker | Any,
     parent: Stacker,
-):
+) -> Continuation:
     """Executes a block of code if an error occurs.
     {try block}
     {catch block}
@@ -67,12 +72,14 @@ def _iferror(
     """
     try:
         if isinstance(try_block, type(parent)):
-            parent.evaluate(try_block.tokens, stack=parent.stack)
+            yield parent, try_block.code, parent.stack
         else:
             parent.stack.append(try_block)
+    except ResourceLimitError:
+        raise
     except Exception as _:
         if isinstance(catch_block, type(parent)):
-            parent.evaluate(catch_block.tokens, stack=parent.stack)
+            yield parent, catch_block.code, parent.stack
         else:
             parent.stack.append(catch_block)
 
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from stacker.include import include_stacker_script
+from stacker.include import load_included_script
 
 from typing import TYPE_CHECKING
 
@@ -8,14 +8,15 @@ if TYPE_CHECKING:
 
 
 def include(stacker: Stacker, filename: str) -> None:
-    """Includes another stacker script."""
-    _stacker = include_stacker_script(filename)
-    _macros = _stacker.get_macros_ref()
-    _variables = _stacker.get_variables_copy()
-    _sfunctions = _stacker.get_sfuntions_ref()
-    stacker.macros.update(_macros)
-    stacker.variables.update(_variables)
-    stacker.sfunctions.update(_sfunctions)
+    """Includes another stacker script.
+
+    The script is evaluated once per process; later includes only merge the
+    names it defined, by reference.
+    """
+    _script = load_included_script(filename)
+    stacker.macros.update(_script.macros)
+    stacker.variables.update(_script.variables)
+    stacker.sfunctions.update(_script.sfunctions)
 
 
 include_operators = {
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from itertools import islice
 from typing import TYPE_CHECKING, Any
+
+from stacker.engine.jit import loop_trace
 from stacker.reserved import __BREAK__
 
 if TYPE_CHECKING:
+    from stacker.engine import Continuation
     from stacker.stacker import Stacker
 
 
@@ -11,14 +15,21 @@ def _times(
     n_times: int,
     block: Stacker | Any,
     parent: Stacker,
-):
+) -> Continuation:
     """Executes a block of code a specified number of times."""
+    trace = loop_trace(parent, block) if type(n_times) is int else None
     i_count = 0
     parent.stack.append(i_count)
     while parent.stack[-1] < n_times:
         parent.stack.pop()
+        if trace is not None and trace.hot():
+            # Run the remaining iterations compiled (see stacker.engine.jit).
+            i_count += trace.run(parent, None, range(i_count, n_times), int)
+            trace = None
+            parent.stack.append(i_count)
+            continue
         if isinstance(block, type(parent)):
-            parent.evaluate(block.tokens, stack=parent.stack)
+            yield parent, block.code, parent.stack
         else:
             parent.stack.append(block)
         i_count = i_count + 1
@@ -32,13 +43,22 @@ def _do(
     symbol: str,
     block: Stacker,
     parent: Stacker,
-):
-    for i in range(start_value, end_value + 1):
-        block.variables[symbol] = i
-        parent.evaluate(block.tokens, stack=parent.stack)
+) -> Continuation:
+    values = range(start_value, end_value + 1)
+    trace = loop_trace(parent, block)
+    index = 0
+    while index < len(values):
+        if trace is not None and trace.hot():
+            # Run the remaining iterations compiled (see stacker.engine.jit).
+            index += trace.run(parent, symbol, values[index:], int)
+            trace = None
+            continue
+        block.variables[symbol] = values[index]
+        yield parent, block.code, parent.stack
         if len(parent.stack) > 0 and parent.stack[-1] == __BREAK__:
             parent.stack.pop()
             break
+        index += 1
 
 
 def _dolist(
@@ -46,13 +66,22 @@ def _dolist(
     lst: list,
     block: Stacker,
     parent: Stacker,
-):
-    for i in lst:
-        block.variables[symbol] = i
-        parent.evaluate(block.tokens, stack=parent.stack)
+) -> Continuation:
+    values = lst if isinstance(lst, (list, tuple)) else list(lst)
+    trace = loop_trace(parent, block)
+    index = 0
+    while index < len(values):
+        if trace is not None and trace.hot():
+            # Run the remaining iterations compiled (see stacker.engine.jit).
+            index += trace.run(parent, symbol, islice(values, index, None))
+            trace = None
+            continue
+        block.variables[symbol] = values[index]
+        yield parent, block.code, parent.stack
         if len(parent.stack) > 0 and parent.stack[-1] == __BREAK__:
             parent.stack.pop()
             break
+        index += 1
 
 
 loop_operators = {
@@ -199,198 +199,231 @@ math_operators = {
         "func": (lambda x1, x2: _pow(x1, x2)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Power",
     },
     "log": {
         "func": (lambda x: _log(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Logarithm",
     },
     "log2": {
         "func": (lambda x: _log2(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Logarithm base 2",
     },
     "log10": {
         "func": (lambda x: _log10(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Logarithm base 10",
     },
     "exp": {
         "func": (lambda x: _exp(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Exponential",
     },
     "sin": {
         "func": (lambda x: _sin(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Sine",
     },
     "cos": {
         "func": (lambda x: _cos(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Cosine",
     },
     "tan": {
         "func": (lambda x: _tan(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Tangent",
     },
     "asin": {
         "func": (lambda x: _asin(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Arcsine",
     },
     "acos": {
         "func": (lambda x: _acos(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Arccosine",
     },
     "atan": {
         "func": (lambda x: _atan(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Arctangent",
     },
     "sinh": {
         "func": (lambda x: _sinh(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Hyperbolic sine",
     },
     "cosh": {
         "func": (lambda x: _cosh(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Hyperbolic cosine",
     },
     "tanh": {
         "func": (lambda x: _tanh(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Hyperbolic tangent",
     },
     "asinh": {
         "func": (lambda x: _asinh(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Hyperbolic arcsine",
     },
     "acosh": {
         "func": (lambda x: _acosh(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Hyperbolic arccosine",
     },
     "atanh": {
         "func": (lambda x: _atanh(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Hyperbolic arctangent",
     },
     "sqrt": {
         "func": (lambda x: _sqrt(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Square root",
     },
     "gcd": {
         "func": (lambda x1, x2: _gcd(x1, x2)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Greatest common divisor",
     },
     "lcm": {
         "func": (lambda x1, x2: _lcm(x1, x2)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Least common multiple",
     },
     "radians": {
         "func": (lambda deg: _radians(deg)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Convert degrees to radians",
     },
     "!": {
         "func": (lambda x: _factorial(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Factorial",
     },
     "ceil": {
         "func": (lambda x: _ceil(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Ceiling",
     },
     "floor": {
         "func": (lambda x: _floor(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Floor",
     },
     "comb": {
         "func": (lambda n, k: _comb(n, k)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Combinations",
     },
     "perm": {
         "func": (lambda n, k: _perm(n, k)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Permutations",
     },
     "abs": {
         "func": (lambda x: _abs(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Absolute value",
     },
     "cbrt": {
         "func": (lambda x: _cbrt(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Cube root",
     },
     "ncr": {
         "func": (lambda n, k: _ncr(n, k)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Combinations",
     },
     "npr": {
         "func": (lambda n, k: _npr(n, k)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Permutations",
     },
     "roundn": {
         "func": (lambda x1, x2: _roundn(x1, x2)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Round to n decimal places",
     },
     "round": {
         "func": (lambda x: _round(x)),
         "arg_count": 1,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Round to nearest integer",
     },
     "frac": {
         "func": (lambda a, b: _frac(a, b)),
         "arg_count": 2,
         "push_result_to_stack": True,
+        "pure": True,
         "desc": "Fraction",
     },
 }
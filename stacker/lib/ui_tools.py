@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from pkg_resources import resource_stream
-
 from stacker.lib.config import history_file_path
 from stacker.util.color import colored
 
 
 def disp_logo() -> None:
     """Prints the top message."""
+    from pkg_resources import resource_stream
+
     colors = ["red", "green", "yellow", "lightblue", "lightmagenta", "cyan"]
     with resource_stream("stacker", "data/top.txt") as f:
         messages = f.readlines()
@@ -18,6 +18,8 @@ def disp_logo() -> None:
 
 def disp_about() -> None:
     """Prints the about message."""
+    from pkg_resources import resource_stream
+
     with resource_stream("stacker", "data/about.txt") as f:
         message = f.read().decode("utf-8")
     print(message)
@@ -25,6 +27,8 @@ def disp_about() -> None:
 
 def disp_help() -> None:
     """Prints the help message."""
+    from pkg_resources import resource_stream
+
     with resource_stream("stacker", "data/help.txt") as f:
         message = f.read().decode("utf-8")
     print(message)
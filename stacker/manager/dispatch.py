@@ -0,0 +1,486 @@
+"""Operator handlers.
+
+Every built-in operator is mapped to a handler `handler(core, stack)` that
+knows how to take its own arguments from the stack, so calling an operator
+is a single lookup in `OperatorManager.dispatch_table`.
+
+Handlers of operators that evaluate blocks (if, do, eval, ...) return a
+continuation instead of evaluating the block themselves; see
+`stacker.engine.vm`. All other handlers return None.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
+
+from stacker.core import StackerCore
+from stacker.data_type import String, stack_data
+from stacker.engine.vm import Continuation, evaluation
+from stacker.error import StackerSyntaxError
+from stacker.manager.registry import LazyOperator, dispatch_table
+from stacker.reserved import __BREAK__
+from stacker.slambda import StackerLambda
+from stacker.syntax.parser import parse_expression
+
+if TYPE_CHECKING:
+    from stacker.manager.operator_manager import OperatorManager
+
+Handler = Callable[[StackerCore, stack_data], "Continuation | None"]
+
+
+############################
+# Generic handlers
+############################
+
+
+def regular_handler(op: dict) -> Handler:
+    """Pops `arg_count` evaluated arguments and calls the operator."""
+    func = op["func"]
+    arg_count = op["arg_count"]
+    push_result_to_stack = op["push_result_to_stack"]
+
+    if push_result_to_stack and arg_count == 1:
+
+        def handler(core: StackerCore, stack: stack_data) -> None:
+            stack.append(func(core._pop_and_eval(stack)))
+
+    elif push_result_to_stack and arg_count == 2:
+
+        def handler(core: StackerCore, stack: stack_data) -> None:
+            x2 = core._pop_and_eval(stack)
+            x1 = core._pop_and_eval(stack)
+            stack.append(func(x1, x2))
+
+    else:
+
+        def handler(core: StackerCore, stack: stack_data) -> None:
+            args = [None] * arg_count
+            for i in range(arg_count - 1, -1, -1):
+                args[i] = core._pop_and_eval(stack)
+            if push_result_to_stack:
+                stack.append(func(*args))
+            else:
+                func(*args)
+
+    return handler
+
+
+def stack_handler(op: dict) -> Handler:
+    """Like `regular_handler`, but the stack itself is the last argument."""
+    func = op["func"]
+    arg_count = op["arg_count"]
+    push_result_to_stack = op["push_result_to_stack"]
+
+    if arg_count == 0 and not push_result_to_stack:
+
+        def handler(core: StackerCore, stack: stack_data) -> None:
+            func(stack)
+
+    else:
+
+        def handler(core: StackerCore, stack: stack_data) -> None:
+            args = [None] * arg_count + [stack]
+            for i in range(arg_count - 1, -1, -1):
+                args[i] = core._pop_and_eval(stack)
+            if push_result_to_stack:
+                stack.append(func(*args))
+            else:
+                func(*args)
+
+    return handler
+
+
+def _noop(core: StackerCore, stack: stack_data) -> None:
+    return
+
+
+############################
+# Priority operators
+############################
+
+
+def _do(op: dict, core: StackerCore, stack: stack_data) -> Continuation:
+    body = stack.pop()
+    symbol = stack.pop()
+    end_value = core._pop_and_eval(stack)
+    start_value = core._pop_and_eval(stack)
+    name = core._dollar_to_var_name(symbol)
+    return op["func"](start_value, end_value, name, body, core)
+
+
+def _dolist(op: dict, core: StackerCore, stack: stack_data) -> Continuation:
+    body = stack.pop()
+    symbol = stack.pop()
+    lst = core._pop_and_eval(stack)
+    name = core._dollar_to_var_name(symbol)
+    return op["func"](name, lst, body, core)
+
+
+def _times(op: dict, core: StackerCore, stack: stack_data) -> Continuation:
+    n_times = core._pop_and_eval(stack)
+    body = stack.pop()
+    return op["func"](n_times, body, core)
+
+
+def _break(op: dict, core: StackerCore, stack: stack_data) -> None:
+    stack.append(__BREAK__)
+
+
+def _if(op: dict, core: StackerCore, stack: stack_data) -> Continuation:
+    true_block = stack.pop()
+    condition = stack.pop()
+    return op["func"](condition, true_block, core)
+
+
+def _ifelse(op: dict, core: StackerCore, stack: stack_data) -> Continuation:
+    false_block = stack.pop()
+    true_block = stack.pop()
+    condition = stack.pop()
+    return op["func"](condition, true_block, false_block, core)
+
+
+def _iferror(op: dict, core: StackerCore, stack: stack_data) -> Continuation:
+    catch_block = stack.pop()
+    try_block = stack.pop()
+    return op["func"](try_block, catch_block, core)
+
+
+def _set(op: dict, core: StackerCore, stack: stack_data) -> None:
+    symbol = stack.pop()
+    name = core._dollar_to_var_name(symbol)
+    value = core._pop_and_eval(stack)
+    core.variables[name] = value
+
+
+def _defun(op: dict, core: StackerCore, stack: stack_data) -> None:
+    symbol = stack.pop()
+    name = core._dollar_to_var_name(symbol)
+    body = stack.pop()
+    fargs = stack.pop()  # str
+    if isinstance(fargs, tuple):
+        fargs = list(fargs)
+    elif isinstance(fargs, list):
+        fargs = fargs
+    elif isinstance(fargs, StackerCore):
+        fargs = fargs.tokens
+    else:
+        fargs = [fargs]
+    op["func"](core, name, fargs, body)
+
+
+def _memoize(op: dict, core: StackerCore, stack: stack_data) -> None:
+    symbol = stack.pop()
+    name = core._dollar_to_var_name(symbol)
+    op["func"](core, name)
+
+
+def _defmacro(op: dict, core: StackerCore, stack: stack_data) -> None:
+    symbol = stack.pop()
+    body = stack.pop()
+    name = core._dollar_to_var_name(symbol)
+    op["func"](core, name, body)
+
+
+def _lambda(op: dict, core: StackerCore, stack: stack_data) -> None:
+    body = stack.pop()
+    fargs = stack.pop()
+    if op["push_result_to_stack"]:
+        stack.append(op["func"](fargs, body))
+    else:
+        op["func"](fargs, body)
+
+
+def _eval(op: dict, core: StackerCore, stack: stack_data) -> Continuation | None:
+    expression = stack.pop()
+    if expression in core.variables:
+        expression = core.variables[expression]
+    if isinstance(expression, String):
+        tokens = list(map(core._literal_eval, parse_expression(expression.value)))
+        return evaluation(core, core.compiler.compile(tokens), stack)
+    elif isinstance(expression, StackerCore):
+        return evaluation(core, expression.code, stack)
+    elif isinstance(expression, StackerLambda):
+        args = []
+        for _ in range(expression.arg_count):
+            args.insert(0, core._pop_and_eval(stack))
+        return expression.call(args, stack)
+    else:
+        stack.append(expression)
+
+
+def _sub(op: dict, core: StackerCore, stack: stack_data) -> None:
+    token = stack.pop()
+    core._substack_with_tokens([token], stack)
+
+
+def _subn(op: dict, core: StackerCore, stack: stack_data) -> None:
+    n = stack.pop()
+    elms = [stack.pop() for _ in range(n)]
+    elms.reverse()
+    core._substack_with_tokens(elms, stack)
+
+
+def _listn(op: dict, core: StackerCore, stack: stack_data) -> None:
+    n = stack.pop()
+    elms = [stack.pop() for _ in range(n)]
+    elms.reverse()
+    stack.append(elms)
+    stack.append(elms)
+
+
+def _tuplen(op: dict, core: StackerCore, stack: stack_data) -> None:
+    n = stack.pop()
+    elms = [stack.pop() for _ in range(n)]
+    elms.reverse()
+    stack.append(tuple(elms))
+    stack.append(elms)
+
+
+def _read_from_string(op: dict, core: StackerCore, stack: stack_data) -> None:
+    core._substack_with_expression(stack.pop(), stack)
+
+
+def _read(op: dict, core: StackerCore, stack: stack_data) -> None:
+    core._substack_with_expression(input(), stack)
+
+
+def _split(op: dict, core: StackerCore, stack: stack_data) -> None:
+    sep = stack.pop()
+    word = stack.pop()
+    for string in word.split(sep):
+        stack.append(string)
+
+
+def _nth(op: dict, core: StackerCore, stack: stack_data) -> None:
+    n = stack.pop()
+    lst = stack[-1]
+    if isinstance(lst, String):
+        stack.append(String(lst[n]))
+    else:
+        stack.append(lst[n])
+
+
+def _expand(op: dict, core: StackerCore, stack: stack_data) -> None:
+    iterable = stack.pop()
+    if isinstance(iterable, list or tuple):
+        stack.extend(iterable)
+    elif isinstance(iterable, StackerCore):
+        stack.extend(iterable.tokens)
+    else:
+        raise StackerSyntaxError(f"Cannot expand {iterable}")
+
+
+def _include(op: dict, core: StackerCore, stack: stack_data) -> None:
+    filename = stack.pop()
+    op["func"](core, filename)
+
+
+def _exit(op: dict, core: StackerCore, stack: stack_data) -> None:
+    op["func"]()
+
+
+priority_handlers = {
+    "do": _do,
+    "dolist": _dolist,
+    "times": _times,
+    "break": _break,
+    "if": _if,
+    "ifelse": _ifelse,
+    "iferror": _iferror,
+    "set": _set,
+    "defun": _defun,
+    "memoize": _memoize,
+    "defmacro": _defmacro,
+    "lambda": _lambda,
+    "eval": _eval,
+    "sub": _sub,
+    "subn": _subn,
+    "listn": _listn,
+    "tuplen": _tuplen,
+    "read-from-string": _read_from_string,
+    "read": _read,
+    "split": _split,
+    "nth": _nth,
+    "expand": _expand,
+    "include": _include,
+    "exit": _exit,
+}
+
+
+def priority_handler(name: str, op: dict) -> Handler:
+    if name in priority_handlers:
+        return partial(priority_handlers[name], op)
+    if op["func"] is None:
+        return _noop
+    return regular_handler(op)
+
+
+############################
+# Higher-order functions
+############################
+
+
+def _map_filter(op: dict, core: StackerCore, stack: stack_data) -> None:
+    body = stack.pop()
+    args = stack.pop()
+    args_org = args
+    func = core._get_hof_func(body)
+    args = args.tokens if isinstance(args, StackerCore) else args
+    if op["push_result_to_stack"]:
+        lst = op["func"](func, args)
+        if isinstance(args_org, list):
+            stack.append(list(lst))
+        elif isinstance(args_org, tuple):
+            stack.append(tuple(lst))
+        else:
+            core._substack_with_tokens(list(lst), stack)
+    else:
+        op["func"](func, args)
+
+
+def _zip(op: dict, core: StackerCore, stack: stack_data) -> None:
+    xs2 = stack.pop()
+    xs1 = stack.pop()
+    xs_org = xs1
+    xs2 = xs2.tokens if isinstance(xs2, StackerCore) else core._var_str_to_literal(xs2)
+    xs1 = xs1.tokens if isinstance(xs1, StackerCore) else core._var_str_to_literal(xs1)
+    if op["push_result_to_stack"]:
+        lst = op["func"](xs1, xs2)
+        if isinstance(xs_org, list):
+            stack.append(list(lst))
+        elif isinstance(xs_org, tuple):
+            stack.append(tuple(lst))
+        else:
+            core._substack_with_tokens(list(lst), stack)
+    else:
+        op["func"](xs1, xs2)
+
+
+def hof_handler(name: str, op: dict) -> Handler:
+    if name in ["map", "filter"]:
+        return partial(_map_filter, op)
+    elif name in ["zip"]:
+        return partial(_zip, op)
+    return _noop
+
+
+############################
+# Transform / aggregate / settings operators
+############################
+
+
+def _transform(name: str, op: dict, core: StackerCore, stack: stack_data) -> None:
+    args = stack.pop()
+    args_org = args
+    args = (
+        args.tokens if isinstance(args, StackerCore) else core._var_str_to_literal(args)
+    )
+    if op["push_result_to_stack"]:
+        lst = op["func"](args)
+        if name == "list":
+            stack.append(list(lst))
+        elif name == "tuple":
+            stack.append(tuple(lst))
+        else:
+            if isinstance(args_org, list):
+                stack.append(list(lst))
+            elif isinstance(args_org, tuple):
+                stack.append(tuple(lst))
+            else:
+                core._substack_with_tokens(list(lst), stack)
+    else:
+        op["func"](args)
+
+
+def transform_handler(name: str, op: dict) -> Handler:
+    return partial(_transform, name, op)
+
+
+def _aggregate(op: dict, core: StackerCore, stack: stack_data) -> None:
+    args = stack.pop()
+    args = (
+        list(map(core._literal_eval, args.tokens))
+        if isinstance(args, StackerCore)
+        else core._var_str_to_literal(args)
+    )
+    if op["push_result_to_stack"]:
+        stack.append(op["func"](args))
+    else:
+        op["func"](args)
+
+
+def aggregate_handler(name: str, op: dict) -> Handler:
+    return partial(_aggregate, op)
+
+
+def _disable_plugin(op: dict, core: StackerCore, stack: stack_data) -> None:
+    operator_name = stack.pop()
+    op["func"](core, operator_name)
+
+
+def _settings(op: dict, core: StackerCore, stack: stack_data) -> None:
+    op["func"](core)
+
+
+def settings_handler(name: str, op: dict) -> Handler:
+    if name == "disable_plugin":
+        return partial(_disable_plugin, op)
+    return partial(_settings, op)
+
+
+############################
+# Table
+############################
+
+# Lookup order of the former `StackerCore._execute` (first match wins).
+handler_factories: dict[str, Callable[[str, dict], Handler]] = {
+    "priority": priority_handler,
+    "stack": lambda name, op: stack_handler(op),
+    "regular": lambda name, op: regular_handler(op),
+    "hof": hof_handler,
+    "transform": transform_handler,
+    "aggregate": aggregate_handler,
+    "file": lambda name, op: regular_handler(op),
+    "settings": settings_handler,
+}
+
+
+def make_handler(kind: str, name: str, op: dict) -> Handler:
+    if isinstance(op, LazyOperator) and not op.loaded:
+        return lazy_handler(kind, name, op)
+    return handler_factories[kind](name, op)
+
+
+def lazy_handler(kind: str, name: str, op: LazyOperator) -> Handler:
+    """Imports the operator on its first call and puts the real handler in
+    its place in the dispatch tables.
+
+    Code that keeps a handler to compare against the table later must get it
+    from `OperatorManager.handler`, which does the same without a call.
+    """
+    handler = None
+
+    def materialize(operator_manager: OperatorManager) -> Handler:
+        nonlocal handler
+        if handler is None:
+            handler = handler_factories[kind](name, op)
+        for table in (operator_manager.dispatch_table, dispatch_table()):
+            if table.get(name) is load:
+                table[name] = handler
+        return handler
+
+    def load(core: StackerCore, stack: stack_data) -> Continuation | None:
+        return materialize(core.operator_manager)(core, stack)
+
+    load.materialize = materialize
+    return load
+
+
+def build_dispatch_table(oprerators: dict[str, dict[str, Any]]) -> dict[str, Handler]:
+    """Builds a flat table from each operator name to its handler."""
+    table = {}
+    for kind in reversed(list(handler_factories)):
+        for name, op in oprerators[kind].items():
+            table[name] = make_handler(kind, name, op)
+    return table
@@ -0,0 +1,204 @@
+"""Generated by `stacker.manager.registry.write_index`; do not edit."""
+
+# fmt: off
+OPERATOR_INDEX = {
+    "priority": {
+        "times": ("stacker.lib.function.loop", "loop_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Executes a block of code a specified number of times."}),
+        "do": ("stacker.lib.function.loop", "loop_operators", {"arg_count": 4, "push_result_to_stack": False, "desc": "Executes a block of code a specified number of times."}),
+        "dolist": ("stacker.lib.function.loop", "loop_operators", {"arg_count": 4, "push_result_to_stack": False, "desc": "Executes a block of code a specified number of times."}),
+        "if": ("stacker.lib.function.if_else", "condition_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Executes a block of code if a condition is true."}),
+        "ifelse": ("stacker.lib.function.if_else", "condition_operators", {"arg_count": 3, "push_result_to_stack": False, "desc": "Executes a block of code if a condition is true, otherwise executes another block of code."}),
+        "iferror": ("stacker.lib.function.if_else", "condition_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Executes a block of code if an error occurs."}),
+        "ans": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 0, "push_result_to_stack": True, "desc": "Returns the last result."}),
+        "set": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Sets a variable."}),
+        "eval": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Evaluates a given RPN expression."}),
+        "break": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Breaks a loop."}),
+        "sub": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 0, "push_result_to_stack": True, "desc": "Substack the top element"}),
+        "subn": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Cluster elements between the top and the nth (make substacks)"}),
+        "read-from-string": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Reads a string and returns a list of words."}),
+        "read": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 0, "push_result_to_stack": True, "desc": "Reads a string from the console."}),
+        "split": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Splits the first string by the second string."}),
+        "nth": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Returns the nth element of the iterable."}),
+        "expand": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Unlists a iterable."}),
+        "listn": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Converts an iterable to a list."}),
+        "tuplen": ("stacker.manager.operator_manager", "special_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Converts an iterable to a tuple."}),
+        "include": ("stacker.lib.function.include", "include_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Includes another stacker script."}),
+        "defun": ("stacker.lib.function.defun", "defun_operators", {"arg_count": 3, "push_result_to_stack": False, "desc": "Defines a function."}),
+        "memoize": ("stacker.lib.function.defun", "defun_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Caches the results of a pure function by its arguments."}),
+        "defmacro": ("stacker.lib.function.defmacro", "macro_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Defines a macro."}),
+        "lambda": ("stacker.lib.function.lmd", "lambda_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Defines a function."}),
+        "exit": ("stacker.lib.function.exit", "exit_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Exits the program."}),
+        "abort": ("stacker.lib.function.exit", "exit_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Aborts the program."}),
+        "exit-code": ("stacker.lib.function.exit", "exit_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Exits the program with the given exit code."}),
+    },
+    "regular": {
+        "neg": ("stacker.lib.function.algebra", "alge_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Negate"}),
+        "+": ("stacker.lib.function.arith", "arith_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Add"}),
+        "-": ("stacker.lib.function.arith", "arith_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Subtract"}),
+        "*": ("stacker.lib.function.arith", "arith_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Multiply"}),
+        "//": ("stacker.lib.function.arith", "arith_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Integer divide"}),
+        "/": ("stacker.lib.function.arith", "arith_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Divide"}),
+        "%": ("stacker.lib.function.arith", "arith_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Mod"}),
+        "++": ("stacker.lib.function.arith", "arith_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Increment"}),
+        "--": ("stacker.lib.function.arith", "arith_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Decrement"}),
+        "bin": ("stacker.lib.function.base", "base_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Binary representation"}),
+        "oct": ("stacker.lib.function.base", "base_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Octal representation"}),
+        "dec": ("stacker.lib.function.base", "base_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Decimal representation"}),
+        "hex": ("stacker.lib.function.base", "base_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Hexadecimal representation"}),
+        "band": ("stacker.lib.function.bitwise", "bitwise_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Bitwise and"}),
+        "bor": ("stacker.lib.function.bitwise", "bitwise_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Bitwise or"}),
+        "bxor": ("stacker.lib.function.bitwise", "bitwise_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Bitwise xor"}),
+        "~": ("stacker.lib.function.bitwise", "bitwise_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Bitwise invert"}),
+        ">>": ("stacker.lib.function.bitwise", "bitwise_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Bitwise right shift"}),
+        "<<": ("stacker.lib.function.bitwise", "bitwise_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Bitwise left shift"}),
+        "==": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Equal"}),
+        "!=": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Not equal"}),
+        "<=": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Less than or equal to"}),
+        "<": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Less than"}),
+        ">=": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Greater than or equal to"}),
+        ">": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Greater than"}),
+        "eq": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Equal"}),
+        "neq": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Not equal"}),
+        "le": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Less than or equal to"}),
+        "lt": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Less than"}),
+        "ge": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Greater than or equal to"}),
+        "gt": ("stacker.lib.function.comparison", "compare_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Greater than"}),
+        "write-to-file": ("stacker.lib.function.file", "file_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Write data to file"}),
+        "append-to-file": ("stacker.lib.function.file", "file_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Append content to file"}),
+        "read-lines": ("stacker.lib.function.file", "file_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Read all lines from file"}),
+        "read-from-file": ("stacker.lib.function.file", "file_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Read all content from file"}),
+        "file-exists": ("stacker.lib.function.file", "file_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Check if file exists"}),
+        "echo": ("stacker.lib.function.io", "io_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Prints the specified content to the console."}),
+        "print": ("stacker.lib.function.io", "io_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Prints the specified content to the console."}),
+        "printc": ("stacker.lib.function.io", "io_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Prints the specified content to the console without a newline."}),
+        "newline": ("stacker.lib.function.io", "io_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Prints a newline to the console."}),
+        "and": ("stacker.lib.function.logic", "logic_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Logical and"}),
+        "or": ("stacker.lib.function.logic", "logic_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Logical or"}),
+        "not": ("stacker.lib.function.logic", "logic_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Logical not"}),
+        "&&": ("stacker.lib.function.logic", "logic_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Logical and"}),
+        "||": ("stacker.lib.function.logic", "logic_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Logical or"}),
+        "^": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Power"}),
+        "log": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Logarithm"}),
+        "log2": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Logarithm base 2"}),
+        "log10": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Logarithm base 10"}),
+        "exp": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Exponential"}),
+        "sin": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Sine"}),
+        "cos": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Cosine"}),
+        "tan": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Tangent"}),
+        "asin": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Arcsine"}),
+        "acos": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Arccosine"}),
+        "atan": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Arctangent"}),
+        "sinh": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Hyperbolic sine"}),
+        "cosh": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Hyperbolic cosine"}),
+        "tanh": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Hyperbolic tangent"}),
+        "asinh": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Hyperbolic arcsine"}),
+        "acosh": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Hyperbolic arccosine"}),
+        "atanh": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Hyperbolic arctangent"}),
+        "sqrt": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Square root"}),
+        "gcd": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Greatest common divisor"}),
+        "lcm": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Least common multiple"}),
+        "radians": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Convert degrees to radians"}),
+        "!": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Factorial"}),
+        "ceil": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Ceiling"}),
+        "floor": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Floor"}),
+        "comb": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Combinations"}),
+        "perm": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Permutations"}),
+        "abs": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Absolute value"}),
+        "cbrt": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Cube root"}),
+        "ncr": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Combinations"}),
+        "npr": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Permutations"}),
+        "roundn": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Round to n decimal places"}),
+        "round": ("stacker.lib.function.math", "math_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Round to nearest integer"}),
+        "frac": ("stacker.lib.function.math", "math_operators", {"arg_count": 2, "push_result_to_stack": True, "pure": True, "desc": "Fraction"}),
+        "rand": ("stacker.lib.function.random", "random_operators", {"arg_count": 0, "push_result_to_stack": True, "desc": "Generate random float between 0 and 1"}),
+        "randint": ("stacker.lib.function.random", "random_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Generate random int between x1 and x2"}),
+        "uniform": ("stacker.lib.function.random", "random_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Generate random float between x1 and x2"}),
+        "dice": ("stacker.lib.function.random", "random_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Roll D&D-style dice (e.g., 3d6 = 3 6 dice)"}),
+        "int": ("stacker.lib.function.types", "type_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Convert to int"}),
+        "float": ("stacker.lib.function.types", "type_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Convert to float"}),
+        "str": ("stacker.lib.function.types", "type_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Convert to str"}),
+        "bool": ("stacker.lib.function.types", "type_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Convert to bool"}),
+        "complex": ("stacker.lib.function.types", "type_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Convert to complex"}),
+        "type": ("stacker.lib.function.types", "type_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Get type"}),
+        "seq": ("stacker.lib.function.list", "list_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Generate sequence from x1 to x2"}),
+        "evalpy": ("stacker.lib.function.eval", "eval_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Evaluates a Python expression. ex) 1+2 eval"}),
+        "asc": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Returns the ASCII value of the specified character."}),
+        "chr": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Returns the character that matches the specified ASCII value."}),
+        "concat": ("stacker.lib.function.string", "string_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Concatenate two strings."}),
+        "search": ("stacker.lib.function.string", "string_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Returns the index of the first occurrence of the second string in the first string."}),
+        "replace": ("stacker.lib.function.string", "string_operators", {"arg_count": 3, "push_result_to_stack": True, "desc": "Replaces all occurrences of the second string with the third string in the first string."}),
+        "lower": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Converts the specified string to lowercase."}),
+        "upper": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Converts the specified string to uppercase."}),
+        "title": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Converts the specified string to title case."}),
+        "strip": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Removes leading and trailing whitespace from the specified string."}),
+        "lstrip": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Removes leading whitespace from the specified string."}),
+        "rstrip": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Removes trailing whitespace from the specified string."}),
+        "join": ("stacker.lib.function.string", "string_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Concatenates the elements of the specified list using the specified delimiter."}),
+        "contains": ("stacker.lib.function.string", "string_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Returns whether the first string contains the second string."}),
+        "subseq": ("stacker.lib.function.string", "string_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Returns a substring of the specified string."}),
+        "format": ("stacker.lib.function.string", "string_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Formats the specified string using the specified arguments."}),
+        "time": ("stacker.lib.function.time", "time_operators", {"arg_count": 0, "push_result_to_stack": True, "desc": "Returns the current time in seconds since the Epoch."}),
+        "ls": ("stacker.lib.function.os", "os_operators", {"arg_count": 0, "push_result_to_stack": True, "desc": "List files in the current directory"}),
+        "cd": ("stacker.lib.function.os", "os_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Change directory to the specified path"}),
+        "pwd": ("stacker.lib.function.os", "os_operators", {"arg_count": 0, "push_result_to_stack": True, "desc": "Print the current working directory"}),
+        "cat": ("stacker.lib.function.os", "os_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Print the contents of a file"}),
+    },
+    "hof": {
+        "map": ("stacker.lib.function.hof", "hof_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Applies a function to each element of a list."}),
+        "filter": ("stacker.lib.function.hof", "hof_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Filters a list based on a predicate function."}),
+        "zip": ("stacker.lib.function.hof", "hof_operators", {"arg_count": 2, "push_result_to_stack": True, "desc": "Zips two lists together."}),
+    },
+    "aggregate": {
+        "any": ("stacker.lib.function.aggregate", "aggregate_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Returns True if any element of an iterable is True."}),
+        "all": ("stacker.lib.function.aggregate", "aggregate_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Returns True if all elements of an iterable are True."}),
+        "sum": ("stacker.lib.function.aggregate", "aggregate_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Sums a iterable."}),
+        "len": ("stacker.lib.function.aggregate", "aggregate_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Returns the length of an iterable."}),
+        "min": ("stacker.lib.function.aggregate", "aggregate_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Returns the minimum value in an iterable."}),
+        "max": ("stacker.lib.function.aggregate", "aggregate_operators", {"arg_count": 1, "push_result_to_stack": True, "pure": True, "desc": "Returns the maximum value in an iterable."}),
+    },
+    "transform": {
+        "enumerate": ("stacker.lib.function.transform", "transform_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Enumerates a list."}),
+        "sorted": ("stacker.lib.function.transform", "transform_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Sorts a list."}),
+        "reversed": ("stacker.lib.function.transform", "transform_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Reverses a list."}),
+        "list": ("stacker.lib.function.transform", "transform_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Converts an iterable to a list."}),
+        "tuple": ("stacker.lib.function.transform", "transform_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Converts an iterable to a tuple."}),
+    },
+    "stack": {
+        "drop": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Drops the top element of the stack."}),
+        "drop2": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Drops the top two elements of the stack."}),
+        "dropn": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Drops the top n elements of the stack."}),
+        "dup": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Duplicates the top element of the stack."}),
+        "dup2": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Duplicates the top two elements of the stack."}),
+        "dupn": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Duplicates the top n elements of the stack."}),
+        "over": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Copies the second element to the top of the stack."}),
+        "swap": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Swaps the top two elements of the stack."}),
+        "pick": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Copies the nth element to the top of the stack."}),
+        "roll": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Moves the nth element to the top of the stack."}),
+        "rot": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Move the third element to the top of the stack."}),
+        "unrot": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Moves the top element to the third position of the stack."}),
+        "nip": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Removes the second element from the top of the stack."}),
+        "depth": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": True, "desc": "Returns the depth of the stack."}),
+        "ins": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Inserts a element at the specified index."}),
+        "rev": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Reverses the stack."}),
+        "count": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Counts the number of occurrences of a value in the stack."}),
+        "clear": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Clears the stack."}),
+        "disp": ("stacker.lib.function.stack", "stack_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Prints the stack."}),
+    },
+    "file": {
+        "write-to-file": ("stacker.lib.function.file", "file_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Write data to file"}),
+        "append-to-file": ("stacker.lib.function.file", "file_operators", {"arg_count": 2, "push_result_to_stack": False, "desc": "Append content to file"}),
+        "read-lines": ("stacker.lib.function.file", "file_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Read all lines from file"}),
+        "read-from-file": ("stacker.lib.function.file", "file_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Read all content from file"}),
+        "file-exists": ("stacker.lib.function.file", "file_operators", {"arg_count": 1, "push_result_to_stack": True, "desc": "Check if file exists"}),
+    },
+    "settings": {
+        "disable_plugin": ("stacker.lib.function.setting", "settings_operators", {"arg_count": 1, "push_result_to_stack": False, "desc": "Disables a plugin."}),
+        "disable_all_plugins": ("stacker.lib.function.setting", "settings_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Disables all plugins."}),
+        "enable_disp_stack": ("stacker.lib.function.setting", "settings_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Enables showing stack."}),
+        "disable_disp_stack": ("stacker.lib.function.setting", "settings_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Disables showing stack."}),
+        "disable_disp_logo": ("stacker.lib.function.setting", "settings_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Disables showing logo."}),
+        "enable_disp_logo": ("stacker.lib.function.setting", "settings_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Enables showing logo."}),
+        "enable_disp_ans": ("stacker.lib.function.setting", "settings_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Enables showing ans."}),
+        "disable_disp_ans": ("stacker.lib.function.setting", "settings_operators", {"arg_count": 0, "push_result_to_stack": False, "desc": "Disables showing ans."}),
+    },
+}
@@ -5,35 +5,7 @@ from typing import Callable
 from stacker.error import StackerSyntaxError
 
 
-from stacker.lib.function.algebra import alge_operators
-from stacker.lib.function.arith import arith_operators
-from stacker.lib.function.aggregate import aggregate_operators
-from stacker.lib.function.transform import transform_operators
-from stacker.lib.function.base import base_operators
-from stacker.lib.function.bitwise import bitwise_operators
-from stacker.lib.function.comparison import compare_operators
-from stacker.lib.function.eval import eval_operators
-from stacker.lib.function.file import file_operators
-from stacker.lib.function.io import io_operators
-from stacker.lib.function.list import list_operators
-from stacker.lib.function.logic import logic_operators
-from stacker.lib.function.math import math_operators
-from stacker.lib.function.random import random_operators
-from stacker.lib.function.stack import stack_operators
-from stacker.lib.function.string import string_operators
-from stacker.lib.function.time import time_operators
-from stacker.lib.function.types import type_operators
-from stacker.lib.function.loop import loop_operators
-from stacker.lib.function.if_else import condition_operators
-from stacker.lib.function.include import include_operators
-from stacker.lib.function.setting import settings_operators
-from stacker.lib.function.exit import exit_operators
-from stacker.lib.function.defun import defun_operators
-from stacker.lib.function.defmacro import macro_operators
-from stacker.lib.function.hof import hof_operators
-from stacker.lib.function.lmd import lambda_operators
-from stacker.lib.function.os import os_operators
-
+from stacker.manager.registry import dispatch_table, operator_tables
 
 special_operators = {
     "ans": {
@@ -119,40 +91,16 @@ special_operators = {
 
 class OperatorManager:
     def __init__(self):
-        self._regular_operators = {}
-        self._regular_operators.update(alge_operators)
-        self._regular_operators.update(arith_operators)
-        self._regular_operators.update(base_operators)
-        self._regular_operators.update(bitwise_operators)
-        self._regular_operators.update(compare_operators)
-        self._regular_operators.update(file_operators)
-        self._regular_operators.update(io_operators)
-        self._regular_operators.update(logic_operators)
-        self._regular_operators.update(math_operators)
-        self._regular_operators.update(random_operators)
-        self._regular_operators.update(type_operators)
-        self._regular_operators.update(list_operators)
-        self._regular_operators.update(eval_operators)
-        self._regular_operators.update(string_operators)
-        self._regular_operators.update(time_operators)
-        self._regular_operators.update(os_operators)
-
-        self._priority_operators = {}
-        self._priority_operators.update(loop_operators)
-        self._priority_operators.update(condition_operators)
-        self._priority_operators.update(special_operators)
-        self._priority_operators.update(include_operators)
-        self._priority_operators.update(defun_operators)
-        self._priority_operators.update(macro_operators)
-        self._priority_operators.update(lambda_operators)
-        self._priority_operators.update(exit_operators)
-
-        self._file_operators = file_operators
-        self._hof_operators = hof_operators
-        self._aggregate_operators = aggregate_operators
-        self._transform_operators = transform_operators
-        self._stack_operators = stack_operators
-        self._settings_operators = settings_operators
+        # Copies of the shared tables; see `stacker.manager.registry`.
+        tables = operator_tables()
+        self._regular_operators = dict(tables["regular"])
+        self._priority_operators = dict(tables["priority"])
+        self._file_operators = dict(tables["file"])
+        self._hof_operators = dict(tables["hof"])
+        self._aggregate_operators = dict(tables["aggregate"])
+        self._transform_operators = dict(tables["transform"])
+        self._stack_operators = dict(tables["stack"])
+        self._settings_operators = dict(tables["settings"])
 
         self.oprerators = {
             "priority": self._priority_operators,
@@ -169,6 +117,28 @@ class OperatorManager:
         for kind in self.oprerators.keys():
             self.built_in_operators.update(self.oprerators[kind].keys())
 
+        # operator name -> handler(core, stack)
+        self.dispatch_table = dict(dispatch_table())
+
+    def handler(self, name: str) -> Callable:
+        """The dispatch handler of the operator `name`, loaded if it is lazy.
+
+        Use this rather than `dispatch_table[name]` to keep a handler that
+        is compared with the table later (see `lazy_handler`).
+        """
+        handler = self.dispatch_table[name]
+        materialize = getattr(handler, "materialize", None)
+        return handler if materialize is None else materialize(self)
+
+    def resolve(self, name: str) -> tuple[str | None, dict | None]:
+        """Returns the category and dict of the operator `name` dispatches to."""
+        from stacker.manager.dispatch import handler_factories
+
+        for kind in handler_factories:  # the precedence of the dispatch table
+            if name in self.oprerators[kind]:
+                return kind, self.oprerators[kind][name]
+        return None, None
+
     def get_all_keys_for_completer(self) -> list[str]:
         return list(
             set(
@@ -189,18 +159,9 @@ class OperatorManager:
             return self._regular_operators[operator]["arg_count"]
         if operator in special_operators:
             return special_operators[operator]["arg_count"]
-        if operator in hof_operators:
-            return hof_operators[operator]["arg_count"]
-        if operator in aggregate_operators:
-            return aggregate_operators[operator]["arg_count"]
-        if operator in transform_operators:
-            return transform_operators[operator]["arg_count"]
-        if operator in stack_operators:
-            return stack_operators[operator]["arg_count"]
-        if operator in file_operators:
-            return file_operators[operator]["arg_count"]
-        if operator in settings_operators:
-            return settings_operators[operator]["arg_count"]
+        for kind in ("hof", "aggregate", "transform", "stack", "file", "settings"):
+            if operator in self.oprerators[kind]:
+                return self.oprerators[kind][operator]["arg_count"]
         raise StackerSyntaxError(f"Unknown operator '{operator}'")
 
     ############################
@@ -379,6 +340,8 @@ class OperatorManager:
         push_result_to_stack: bool,
         desc: str | None = None,
     ) -> None:
+        from stacker.manager.dispatch import make_handler
+
         for item in self.oprerators:
             if operator_name in self.oprerators[item]:
                 del self.oprerators[item][operator_name]
@@ -388,5 +351,8 @@ class OperatorManager:
                     "push_result_to_stack": push_result_to_stack,
                     "desc": desc,
                 }
+                self.dispatch_table[operator_name] = make_handler(
+                    item, operator_name, self.oprerators[item][operator_name]
+                )
                 return
         return
@@ -0,0 +1,177 @@
+"""Operator registry.
+
+The built-in operators are defined in the modules of `stacker.lib.function`.
+Importing all of them is a large part of startup, so the registry knows the
+name and attributes (arity, description, purity) of every operator from
+`stacker.manager.operator_index`, and imports a module only when the `func`
+of one of its operators is first needed.
+
+The operator tables and the dispatch table built from them are created once
+and shared by every `OperatorManager`, which works on shallow copies, so
+registering an operator in one interpreter does not affect the others.
+
+Call `write_index()` to regenerate the index after adding or changing
+operators:
+
+    python -c "from stacker.manager.registry import write_index; write_index()"
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+# category -> the operator dicts merged into it, in order (later ones win).
+OPERATOR_MODULES: dict[str, list[tuple[str, str]]] = {
+    "priority": [
+        ("stacker.lib.function.loop", "loop_operators"),
+        ("stacker.lib.function.if_else", "condition_operators"),
+        ("stacker.manager.operator_manager", "special_operators"),
+        ("stacker.lib.function.include", "include_operators"),
+        ("stacker.lib.function.defun", "defun_operators"),
+        ("stacker.lib.function.defmacro", "macro_operators"),
+        ("stacker.lib.function.lmd", "lambda_operators"),
+        ("stacker.lib.function.exit", "exit_operators"),
+    ],
+    "regular": [
+        ("stacker.lib.function.algebra", "alge_operators"),
+        ("stacker.lib.function.arith", "arith_operators"),
+        ("stacker.lib.function.base", "base_operators"),
+        ("stacker.lib.function.bitwise", "bitwise_operators"),
+        ("stacker.lib.function.comparison", "compare_operators"),
+        ("stacker.lib.function.file", "file_operators"),
+        ("stacker.lib.function.io", "io_operators"),
+        ("stacker.lib.function.logic", "logic_operators"),
+        ("stacker.lib.function.math", "math_operators"),
+        ("stacker.lib.function.random", "random_operators"),
+        ("stacker.lib.function.types", "type_operators"),
+        ("stacker.lib.function.list", "list_operators"),
+        ("stacker.lib.function.eval", "eval_operators"),
+        ("stacker.lib.function.string", "string_operators"),
+        ("stacker.lib.function.time", "time_operators"),
+        ("stacker.lib.function.os", "os_operators"),
+    ],
+    "hof": [("stacker.lib.function.hof", "hof_operators")],
+    "aggregate": [("stacker.lib.function.aggregate", "aggregate_operators")],
+    "transform": [("stacker.lib.function.transform", "transform_operators")],
+    "stack": [("stacker.lib.function.stack", "stack_operators")],
+    "file": [("stacker.lib.function.file", "file_operators")],
+    "settings": [("stacker.lib.function.setting", "settings_operators")],
+}
+
+
+class LazyOperator(dict):
+    """An operator dict whose `func` is imported on first access.
+
+    It starts with every key of the operator except `func`; reading a
+    missing key imports the defining module and fills in the rest.
+    """
+
+    __slots__ = ("module", "attr", "name")
+
+    def __init__(
+        self,
+        module: str | None = None,
+        attr: str | None = None,
+        name: str | None = None,
+        attributes: dict | None = None,
+    ) -> None:
+        super().__init__(attributes or {})
+        self.module = module
+        self.attr = attr
+        self.name = name
+
+    @property
+    def loaded(self) -> bool:
+        return self.module is None
+
+    def __missing__(self, key: str) -> Any:
+        with _load_lock:
+            if self.module is not None:
+                operators = getattr(importlib.import_module(self.module), self.attr)
+                self.update(operators[self.name])
+                self.module = None  # only once every key is in place
+        if key not in self:
+            raise KeyError(key)
+        return dict.__getitem__(self, key)
+
+
+# Serializes the first use of lazy operators across threads.
+_load_lock = threading.RLock()
+
+
+_tables: dict[str, dict[str, dict]] | None = None
+_dispatch_table: dict | None = None
+
+
+def operator_tables() -> dict[str, dict[str, dict]]:
+    """The shared operator tables, by category. Do not modify them."""
+    global _tables
+    if _tables is None:
+        from stacker.manager.operator_index import OPERATOR_INDEX
+
+        operators = {}  # one LazyOperator per definition
+        _tables = {}
+        for kind, index in OPERATOR_INDEX.items():
+            table = _tables[kind] = {}
+            for name, (module, attr, attributes) in index.items():
+                key = (module, attr, name)
+                if key not in operators:
+                    operators[key] = LazyOperator(module, attr, name, attributes)
+                table[name] = operators[key]
+    return _tables
+
+
+def dispatch_table() -> dict:
+    """The shared dispatch table built from `operator_tables`."""
+    global _dispatch_table
+    if _dispatch_table is None:
+        from stacker.manager.dispatch import build_dispatch_table
+
+        _dispatch_table = build_dispatch_table(operator_tables())
+    return _dispatch_table
+
+
+def build_index() -> dict[str, dict[str, tuple[str, str, dict]]]:
+    """Imports every operator module and indexes its operators."""
+    index = {}
+    for kind, modules in OPERATOR_MODULES.items():
+        index[kind] = {}
+        for module, attr in modules:
+            for name, op in getattr(importlib.import_module(module), attr).items():
+                attributes = {key: value for key, value in op.items() if key != "func"}
+                index[kind][name] = (module, attr, attributes)
+    return index
+
+
+def _source(value: Any) -> str:
+    """Python source for `value`, with strings in double quotes."""
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, tuple):
+        return "(" + ", ".join(map(_source, value)) + ")"
+    if isinstance(value, dict):
+        items = (f"{_source(k)}: {_source(v)}" for k, v in value.items())
+        return "{" + ", ".join(items) + "}"
+    return repr(value)
+
+
+def write_index(path: str | Path | None = None) -> None:
+    """Writes `build_index()` to `stacker/manager/operator_index.py`."""
+    path = Path(path or Path(__file__).with_name("operator_index.py"))
+    lines = [
+        '"""Generated by `stacker.manager.registry.write_index`; do not edit."""',
+        "",
+        "# fmt: off",
+        "OPERATOR_INDEX = {",
+    ]
+    for kind, index in build_index().items():
+        lines.append(f"    {_source(kind)}: {{")
+        for name, entry in index.items():
+            lines.append(f"        {_source(name)}: {_source(entry)},")
+        lines.append("    },")
+    lines.append("}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
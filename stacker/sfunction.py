@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import hashlib
+from typing import TYPE_CHECKING, Any, Hashable
 
 if TYPE_CHECKING:
+    from stacker.engine import Continuation
     from stacker.stacker import Stacker
+    from stacker.util.diskcache import DiskCache
 
-from stacker.data_type import stack_data
+from stacker.data_type import String, stack_data
+from stacker.engine.monitor import active
+from stacker.util.lru import LRUCache
 
-import copy
+DEFAULT_MEMO_SIZE = 1024
+
+_missing = object()
 
 
 class StackerFunction:
@@ -17,16 +24,95 @@ class StackerFunction:
         self.args = args
         self.blockstack = blockstack
         self.arg_count = len(args)
-        self.stack = stack_data()
+        self.memo: LRUCache | None = None
+        self.store: DiskCache | None = None
+        self._store_prefix = ""
 
-    def __call__(self, *values) -> Any:
-        self.stack.clear()
-        values = list(values)
+    def memoize(
+        self,
+        maxsize: int = DEFAULT_MEMO_SIZE,
+        store: DiskCache | None = None,
+        name: str = "",
+    ) -> None:
+        """Caches results by argument values. Only use this for pure functions.
+
+        With a `store`, results are also kept on disk under `name` and a hash
+        of the body, so they survive restarts and are invalidated when the
+        function is redefined with a different body.
+        """
+        if self.memo is None:
+            self.memo = LRUCache(maxsize)
+        else:
+            self.memo.resize(maxsize)
+        self.store = store
+        if store is not None:
+            body = repr((self.args, self.blockstack.tokens))
+            digest = hashlib.sha256(body.encode()).hexdigest()
+            self._store_prefix = f"{name}:{digest}:"
+
+    def _store_key(self, key: Hashable) -> str:
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return self._store_prefix + digest
+
+    def _bind(self, values: list) -> Stacker:
         if len(values) != len(self.args):
             raise ValueError(f"Expected {len(self.args)} arguments, got {len(values)}")
-        blockstack = copy.deepcopy(self.blockstack)
-        for arg, value in zip(self.args, values):
-            blockstack.variables[arg] = value
-        self.stack.append(blockstack)
-        result = self.blockstack._pop_and_eval(self.stack)
-        return result
+        return self.blockstack._activation(dict(zip(self.args, values)))
+
+    def call(self, values: list, stack: stack_data) -> Continuation:
+        """Evaluates the body with `values` and pushes the result onto `stack`."""
+        memo = self.memo
+        key = None
+        if memo is not None:
+            key = _memo_key(values)
+            if key is not None:
+                result = memo.get(key, _missing)
+                if result is _missing and self.store is not None:
+                    result = self.store.get(self._store_key(key), _missing)
+                    if result is not _missing:
+                        memo.put(key, result)
+                if result is not _missing:
+                    stack.append(result)
+                    return
+        frame = self._bind(values)
+        monitor = active.monitor
+        if monitor is None:
+            yield frame, self.blockstack.code, frame.stack
+        else:
+            monitor.enter_call()
+            try:
+                yield frame, self.blockstack.code, frame.stack
+            finally:
+                monitor.leave_call()
+        result = frame.stack.pop()
+        if key is not None:
+            memo.put(key, result)
+            if self.store is not None:
+                self.store.put(self._store_key(key), result)
+        stack.append(result)
+
+    def __call__(self, *values) -> Any:
+        stack = stack_data()
+        self.blockstack._drive(self.call(list(values), stack))
+        return stack.pop()
+
+
+def _memo_key(values: list) -> Hashable | None:
+    """Returns a hashable key for `values`, or None if they cannot be hashed.
+
+    Types are part of the key, so 1, 1.0 and True are cached separately,
+    as are [1 2] and (1 2).
+    """
+    try:
+        return tuple(map(_freeze, values))
+    except TypeError:
+        return None
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(map(_freeze, value)))
+    if isinstance(value, String):
+        return (String, value.value)
+    hash(value)  # raises TypeError for unhashable values
+    return (type(value), value)
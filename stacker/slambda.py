@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 from stacker.data_type import stack_data
+from stacker.engine.monitor import active
 
 if TYPE_CHECKING:
+    from stacker.engine import Continuation
     from stacker.stacker import Stacker
 
-import copy
-
 
 class StackerLambda:
     """A callable object that represents a function defined in Stacker."""
@@ -16,18 +16,30 @@ class StackerLambda:
         self.args = args
         self.blockstack = blockstack
         self.arg_count = len(args)
-        self.stack = stack_data()
 
-    def __call__(self, *values) -> Any:
-        values = list(values)
+    def _bind(self, values: list) -> Stacker:
         if len(values) != len(self.args):
             raise ValueError(f"Expected {len(self.args)} arguments, got {len(values)}")
-        blockstack = copy.deepcopy(self.blockstack)
-        for arg, value in zip(self.args, values):
-            blockstack.variables[arg] = value
-        self.stack.append(blockstack)
-        result = self.blockstack._pop_and_eval(self.stack)
-        return result
+        return self.blockstack._activation(dict(zip(self.args, values)))
+
+    def call(self, values: list, stack: stack_data) -> Continuation:
+        """Evaluates the body with `values` and pushes the result onto `stack`."""
+        frame = self._bind(values)
+        monitor = active.monitor
+        if monitor is None:
+            yield frame, self.blockstack.code, frame.stack
+        else:
+            monitor.enter_call()
+            try:
+                yield frame, self.blockstack.code, frame.stack
+            finally:
+                monitor.leave_call()
+        stack.append(frame.stack.pop())
+
+    def __call__(self, *values) -> Any:
+        stack = stack_data()
+        self.blockstack._drive(self.call(list(values), stack))
+        return stack.pop()
 
     def __str__(self) -> str:
         if len(self.args) == 0:
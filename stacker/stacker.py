@@ -1,27 +1,44 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Mapping
 from typing import TYPE_CHECKING, Any, Callable
 
+from stacker.batch import EvalResult, iter_eval
 from stacker.core import StackerCore
-from stacker.syntax.parser import parse_expression
+from stacker.engine import Scope
+from stacker.engine.compiler import block_cache
+from stacker.engine.limits import Limits, guarded
+from stacker.engine.monitor import DEFAULT_INTERVAL
+from stacker.sfunction import DEFAULT_MEMO_SIZE
+from stacker.syntax.parser import parse_cache, parse_expression
 
 if TYPE_CHECKING:
+    from stacker.engine import Code
     from stacker.sfunction import StackerFunction
+    from stacker.util.diskcache import DiskCache
 
 from stacker.data_type import stack_data
 
 
 class Stacker(StackerCore):
     def __init__(
-        self, expression: str | None = None, parent: StackerCore | None = None
+        self,
+        expression: str | None = None,
+        parent: StackerCore | None = None,
+        vm: bool = False,
+        opt_level: int = 1,
+        jit: bool = True,
     ):
-        super().__init__(expression, parent)
+        super().__init__(expression, parent, vm=vm, opt_level=opt_level, jit=jit)
         self.trace = []
         self._disp_stack_mode = True
         self._disp_logo = True
         self._disp_ans = False
         self._ans = None
         self.plugin_descriptions = {}
+        # operator name -> the arguments of its latest `register_plugin`
+        self.plugin_registrations = {}
+        self.limits: Limits | None = None  # see `set_limits`
 
     def include(self, filename: str) -> None:
         return self.operator_manager.oprerators["priority"]["include"]["func"](
@@ -45,18 +62,106 @@ class Stacker(StackerCore):
     # def new(expression: str | None = None, parent: Stacker | None = None) -> Stacker:
     #     return Stacker(expression=expression, parent=parent)
 
-    def evaluate(self, tokens: list, stack: stack_data = stack_data()) -> stack_data:
+    def evaluate(
+        self, tokens: list | Code, stack: stack_data | None = None
+    ) -> stack_data:
         """
-        Evaluates a given RPN expression.
-        Returns the result of the evaluation.
+        Evaluates a given RPN expression on `stack` (default: `self.stack`).
+        Returns the stack.
         """
         try:
-            return self._evaluate(tokens, stack=stack)
+            if stack is None:
+                stack = self.stack
+            with guarded(self.limits, stack):
+                return self._evaluate(tokens, stack=stack)
         except Exception as e:
             if self.parent is not None:
                 self.parent.trace = self.trace
             raise e
 
+    def eval_many(
+        self,
+        expressions: str | Iterable[str],
+        bindings: Iterable[Mapping[str, Any]] | None = None,
+        lazy: bool = False,
+    ) -> list[EvalResult] | Iterator[EvalResult]:
+        """Evaluates many independent expressions.
+
+        Pass an iterable of expressions, or one expression and an iterable of
+        variable bindings to evaluate it with. Each distinct expression is
+        compiled once, and each item runs on a fresh stack without seeing
+        what the others define. Returns an `EvalResult` per item, in order;
+        an item that raises is reported in its result and does not stop the
+        batch. With `lazy`, returns a generator instead of a list.
+
+        ``` python
+        stacker.eval_many(["1 2 +", "3 x"])  # [3], error (x is undefined)
+        stacker.eval_many("x y *", [{"x": 2, "y": 3}, {"x": 4, "y": 5}])
+        ```
+        """
+        results = iter_eval(self, expressions, bindings)
+        return results if lazy else list(results)
+
+    async def aeval(
+        self,
+        expression: str,
+        stack: stack_data | None = None,
+        timeout: float | None = None,
+        interval: int = DEFAULT_INTERVAL,
+    ) -> stack_data:
+        """Evaluates an expression like `eval`, without blocking the event loop.
+
+        The evaluation runs on a thread of the loop's default executor, so
+        file and input operators do not block the loop either, and gives up
+        the GIL about every `interval` instructions so the loop's other tasks
+        keep running. The `aeval`s of one Stacker run one at a time; use
+        contexts (see `context`) to run several at once.
+
+        If `timeout` seconds pass, or the awaiting task is cancelled, the
+        evaluation stops at its next check and the stack is restored to what
+        it was before the call; then TimeoutError or CancelledError is
+        raised. Definitions made until then remain, as after an error.
+
+        ``` python
+        stack = await stacker.aeval("0 {1 +} 1000000 times", timeout=5)
+        ```
+        """
+        from stacker.aio import aeval
+
+        return await aeval(self, expression, stack, timeout, interval)
+
+    def context(self) -> Stacker:
+        """Returns a new evaluation context on the definitions of this Stacker.
+
+        A context has its own stack, trace, labels and settings, and its own
+        scopes for variables, macros and sfunctions: it sees everything
+        defined here, but what it defines stays in the context. Creating one
+        costs a few attribute assignments, so a context can be made per
+        request. Contexts of one Stacker may evaluate on different threads at
+        the same time, provided this Stacker is not changed meanwhile.
+
+        ``` python
+        shared = Stacker()
+        shared.process_expression("{x} {x 2 *} $double defun")
+        with ThreadPoolExecutor() as pool:
+            results = pool.map(lambda e: shared.context().eval(e)[-1], exprs)
+        ```
+        """
+        context = type(self)(parent=self)
+        context.parent = None  # errors leave their trace on the context
+        context.variables = Scope(self.variables)
+        context.macros = Scope(self.macros)
+        context.sfunctions = Scope(self.sfunctions)
+        context.labels = Scope(self.labels)
+        context.plugins = dict(self.plugins)
+        context.plugin_descriptions = self.plugin_descriptions
+        context.plugin_registrations = self.plugin_registrations
+        context._disp_stack_mode = self._disp_stack_mode
+        context._disp_logo = self._disp_logo
+        context._disp_ans = self._disp_ans
+        context.limits = self.limits
+        return context
+
     def register_operator(
         self,
         operator_name: str,
@@ -80,7 +185,15 @@ class Stacker(StackerCore):
         arg_count: int,
         push_result_to_stack: bool = True,
         desc: str | None = None,
+        memoize: bool | int = False,
     ) -> None:
+        """Registers a function.
+        `memoize` caches results by arguments (see `StackerFunction.memoize`);
+        pass an int instead of True to set the cache size.
+        """
+        if memoize:
+            maxsize = DEFAULT_MEMO_SIZE if memoize is True else memoize
+            sfunction_func.memoize(maxsize, self.memo_store, sfunction_name)
         self.sfunctions[sfunction_name] = {
             "func": sfunction_func,
             "arg_count": arg_count,
@@ -102,6 +215,12 @@ class Stacker(StackerCore):
         pass_core: bool = False,
         desc: str | None = None,
     ) -> None:
+        self.plugin_registrations[operator_name] = (
+            operator_func,
+            push_result_to_stack,
+            pass_core,
+            desc,
+        )
         if pass_core:
             original_operator_func = operator_func
 
@@ -211,6 +330,82 @@ class Stacker(StackerCore):
             )
         )
 
+    def set_memo_store(self, store: DiskCache | None) -> None:
+        """Sets the on-disk cache used by functions memoized from now on."""
+        self.memo_store = store
+
+    def set_limits(
+        self,
+        max_instructions: int | None = None,
+        timeout: float | None = None,
+        max_stack_depth: int | None = None,
+        max_call_depth: int | None = None,
+        max_memory: int | None = None,
+        interval: int = DEFAULT_INTERVAL,
+    ) -> None:
+        """Limits each evaluation from now on; None means no limit.
+
+        An evaluation (`eval`, `process_expression`, one item of
+        `eval_many`, ...) that executes more than `max_instructions`
+        instructions, runs for more than `timeout` seconds, grows a stack
+        beyond `max_stack_depth` values, nests calls of functions and
+        lambdas deeper than `max_call_depth` or grows the memory of the
+        process by more than `max_memory` bytes raises ResourceLimitError,
+        which `iferror` does not catch. Contexts made afterwards get the same
+        limits. Call without arguments to remove the limits.
+
+        The instruction count is checked at every block, the memory about
+        every millisecond and the call depth at every call. The run time
+        and the stack depth are checked about every `interval`
+        instructions, so they may be overshot by what that many
+        instructions do. All but the call depth are checked once more when
+        the evaluation ends. See `stacker.engine.limits`.
+        """
+        limits = Limits(
+            max_instructions,
+            timeout,
+            max_stack_depth,
+            max_call_depth,
+            max_memory,
+            interval,
+        )
+        self.limits = limits if limits else None
+
+    def get_limits(self) -> Limits | None:
+        return self.limits
+
+    def get_memo_stats(self) -> dict[str, dict[str, int]]:
+        """Returns the cache counters of every memoized function."""
+        return {
+            name: op["func"].memo.stats()
+            for name, op in self.sfunctions.items()
+            if getattr(op["func"], "memo", None) is not None
+        }
+
+    def set_parse_cache_size(self, maxsize: int) -> None:
+        """Sets how many expressions and block bodies are kept parsed, and
+        how many expressions are kept compiled for `eval_many`.
+
+        The parse caches are shared by every Stacker in the process.
+        """
+        parse_cache.resize(maxsize)
+        block_cache.resize(maxsize)
+        self.compiler.code_cache.resize(maxsize)
+
+    def get_parse_cache_stats(self) -> dict[str, dict[str, float]]:
+        """Returns the counters and hit rates of the parse caches."""
+        stats = {}
+        for name, cache in (
+            ("expressions", parse_cache),
+            ("blocks", block_cache),
+            ("code", self.compiler.code_cache),
+        ):
+            counters = cache.stats()
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+            stats[name] = counters
+        return stats
+
     def get_plugin_descriptions(self) -> dict:
         return self.plugin_descriptions
 
@@ -228,9 +423,9 @@ class Stacker(StackerCore):
     # Debug
     # ========================
 
-    def eval(self, expression: str, stack: stack_data = stack_data()) -> Any:
-        """Evaluates a given RPN expression.
-        Returns the result of the evaluation.
+    def eval(self, expression: str, stack: stack_data | None = None) -> Any:
+        """Evaluates a given RPN expression on `stack` (default: `self.stack`).
+        Returns the stack.
 
         Example:
         ``` python
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import ast
+import math
 import re
 from typing import List, Union, Iterator, Any
 import warnings
 from dataclasses import dataclass
 from enum import Enum, auto
 
+from stacker.util.lru import LRUCache
+
 __transpose_symbol__ = "^T"
 
+DEFAULT_PARSE_CACHE_SIZE = 4096
+
+# Source text -> tokens of `parse_expression`, shared by every Stacker.
+parse_cache = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+
 
 class TokenType(Enum):
     BRACED_CONTENT = auto()
@@ -92,62 +100,79 @@ class TokenPattern:
     ]
 
 
+_token_re = re.compile(
+    "|".join(
+        f"(?P<{pattern[0].name}>{pattern[1]})" for pattern in TokenPattern.PATTERNS
+    )
+)
+
+# `tokenize` scanners: the next opening delimiter, a delimited part without
+# nested delimiters, and the next delimiter inside a delimited part.
+_delimiters = {"[": "]", "(": ")", "{": "}", "'": "'", '"': '"'}
+_opener_re = re.compile(r"""[\[({'"]""")
+_flat_part_re = re.compile(
+    "|".join(
+        f"{re.escape(opener)}[^{re.escape(''.join(_delimiters) + closer)}]*"
+        f"{re.escape(closer)}"
+        for opener, closer in _delimiters.items()
+    )
+)
+_delimiter_re = re.compile(r"""[\[\](){}'"]""")
+
+
 class UnifiedLexer:
     """Unified lexical analyzer that handles both simple and complex tokenization"""
 
     def __init__(self, text: str) -> None:
         self.text = text
         self.pos = 0
-        self.delimiter_mapping = {"[": "]", "(": ")", "{": "}", "'": "'", '"': '"'}
-        self._setup_regex()
-
-    def _setup_regex(self) -> None:
-        """Setup regex patterns for tokenization"""
-        self.tok_regex = "|".join(
-            f"(?P<{pattern[0].name}>{pattern[1]})" for pattern in TokenPattern.PATTERNS
-        )
-        self.token_re = re.compile(self.tok_regex)
+        self.delimiter_mapping = dict(_delimiters)
+        self.token_re = _token_re
 
     def tokenize(self) -> list[str]:
-        """Tokenize input preserving nested structures"""
+        """Tokenize input preserving nested structures
+
+        Tokens are separated by whitespace. A delimited part ([...], (...),
+        {...}, '...' or "...") extends to its matching closer, whitespace
+        included, and ends the token; it joins the word before it unless that
+        word is a number. Inside one, every opener nests (quotes close
+        themselves) and other closers are plain characters.
+        """
+        text = self.text
+        end = len(text)
         tokens = []
-        current_token = ""
-        bracket_stack = []
-
-        for char in self.text:
-            if char in self.delimiter_mapping:
-                if current_token and current_token.strip().isdigit():
-                    tokens.append(current_token)
-                    current_token = ""
-
-                if bracket_stack and self.delimiter_mapping[bracket_stack[-1]] == char:
-                    current_token += char
-                    bracket_stack.pop()
-                    if not bracket_stack:
-                        tokens.append(current_token)
-                        current_token = ""
-                else:
-                    bracket_stack.append(char)
-                    current_token += char
-            elif bracket_stack:
-                current_token += char
-                if char == self.delimiter_mapping[bracket_stack[-1]]:
-                    bracket_stack.pop()
-                    if not bracket_stack:
-                        tokens.append(current_token)
-                        current_token = ""
-            elif char.isspace():
-                if current_token:
-                    tokens.append(current_token)
-                    current_token = ""
-            else:
-                current_token += char
-
-        if current_token:
-            tokens.append(current_token)
-
+        pos = 0
+        while pos < end:
+            match = _opener_re.search(text, pos)
+            if match is None:
+                tokens.extend(text[pos:].split())
+                break
+            start = match.start()
+            words = text[pos:start].split()
+            if words and not text[start - 1].isspace() and not words[-1].isdigit():
+                start -= len(words.pop())  # the word joins the delimited part
+            tokens.extend(words)
+            part = _flat_part_re.match(text, match.start())
+            pos = part.end() if part is not None else self._part_end(match)
+            tokens.append(text[start:pos])
         return tokens
 
+    def _part_end(self, opener: re.Match) -> int:
+        """The end of a delimited part with nested ones (or of the text)."""
+        stack = [opener.group()]
+        closer = _delimiters[stack[-1]]
+        for match in _delimiter_re.finditer(self.text, opener.end()):
+            char = match.group()
+            if char == closer:
+                stack.pop()
+                if not stack:
+                    return match.end()
+                closer = _delimiters[stack[-1]]
+            elif char in _delimiters:
+                stack.append(char)
+                closer = _delimiters[char]
+        return len(self.text)
+
     def get_tokens(self) -> Iterator[Token]:
         """Get tokens with type information"""
         pos = 0
@@ -246,8 +271,9 @@ class Parser:
         else:
             raise SyntaxError(f"Unexpected token {token}")
 
+    @staticmethod
     def _split_by_semicolon(
-        self, elements: List[Any], node_class: type[Union[ListNode, TupleNode]]
+        elements: List[Any], node_class: type[Union[ListNode, TupleNode]]
     ) -> List[Any]:
         """Split elements by semicolon into subnodes"""
         result = []
@@ -256,18 +282,19 @@ class Parser:
         for item in elements:
             if item == ";":
                 if current:
-                    result.append(self._wrap_node(current, node_class))
+                    result.append(Parser._wrap_node(current, node_class))
                     current = []
             else:
                 current.append(item)
 
         if current:
-            result.append(self._wrap_node(current, node_class))
+            result.append(Parser._wrap_node(current, node_class))
 
         return result
 
+    @staticmethod
     def _wrap_node(
-        self, elements: List[Any], node_class: type[Union[ListNode, TupleNode]]
+        elements: List[Any], node_class: type[Union[ListNode, TupleNode]]
     ) -> Any:
         """Wrap elements into appropriate node type"""
         if len(elements) == 1 and isinstance(elements[0], (ListNode, TupleNode)):
@@ -301,21 +328,144 @@ class Formatter:
 def convert_custom_array_to_proper_list(input_str: str) -> str:
     """Convert custom array notation to proper list notation"""
     parser = Parser(input_str)
-    parsed = parser.parse()
+    return Formatter.format_structure(_flatten(parser.parse()))
 
-    # Flatten singleton structures
+
+def _flatten(parsed: Union[ListNode, TupleNode]) -> Any:
+    """Flatten singleton structures"""
     while (
         isinstance(parsed, (ListNode, TupleNode))
         and len(parsed.elements) == 1
         and isinstance(parsed.elements[0], (ListNode, TupleNode))
     ):
         parsed = parsed.elements[0]
-
-    return Formatter.format_structure(parsed)
+    return parsed
+
+
+_int_re = re.compile(r"[+-]?(0|[1-9][0-9]*)")
+# `_token_re` for tables of real numbers: any other token is OTHER.
+_numeric_token_re = re.compile(
+    r"(?P<NUMBER>[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?)"
+    r"|(?P<LBRACKET>\[)|(?P<RBRACKET>\])|(?P<LPAREN>\()|(?P<RPAREN>\))"
+    r"|(?P<SEMICOLON>;)|(?P<SPACE>\s+)|(?P<OTHER>.)"
+)
+_closing_types = {
+    "LBRACKET": ("RBRACKET", ListNode),
+    "LPAREN": ("RPAREN", TupleNode),
+}
+# Characters that `Formatter` does not quote safely; literals with them
+# take the `convert_custom_array_to_proper_list` path.
+_unsafe_in_braces = re.compile(r'["\\\n\r\0]')
+_unsafe_in_strings = re.compile(r"['\\\n\r\0]")
+
+
+def parse_literal(expression: str) -> Any:
+    """Parse a list or tuple literal into its value. e.g. "[1 2; 3 4]" -> [[1, 2], [3, 4]]
+
+    Same as `ast.literal_eval(convert_custom_array_to_proper_list(expression))`
+    (identifiers become their names, strings keep their quotes), but built in
+    one pass over the tokens instead of through a formatted string.
+    """
+    for token_re in (_numeric_token_re, _token_re):
+        try:
+            return _literal_value(_flatten(_parse_structure(expression, token_re)))
+        except Exception:
+            pass
+    return ast.literal_eval(convert_custom_array_to_proper_list(expression))
+
+
+def _parse_structure(
+    text: str, token_re: re.Pattern = _token_re
+) -> Union[ListNode, TupleNode]:
+    """`Parser(text).parse()` for a list or tuple, without `Token` objects."""
+    frames = []  # [closing type, node class, elements]
+    for match in token_re.finditer(text):
+        kind = match.lastgroup
+        if kind == "SPACE":
+            continue
+        value = match.group()
+        if kind in _closing_types:
+            frames.append([*_closing_types[kind], []])
+            continue
+        if not frames:
+            raise SyntaxError(f"Expected LBRACKET or LPAREN, got {kind}")
+        closing_type, node_class, elements = frames[-1]
+        if kind == closing_type:
+            frames.pop()
+            if ";" in elements:
+                node = node_class(Parser._split_by_semicolon(elements, node_class))
+            else:
+                node = node_class(elements)
+            if not frames:
+                return node
+            frames[-1][2].append(node)
+        elif kind == "NUMBER":
+            if _int_re.fullmatch(value):
+                elements.append(int(value))
+            elif (
+                "j" in value
+                or "J" in value
+                or not ("." in value or "e" in value or "E" in value)
+            ):
+                elements.append(ast.literal_eval(value))
+            else:
+                elements.append(float(value))
+        elif kind == "IDENTIFIER":
+            elements.append(Identifier(value))
+        elif kind == "BRACED_CONTENT":
+            elements.append({"braced_content": value})
+        elif kind == "SEMICOLON":
+            elements.append(";")
+        elif kind in ("COMPLEX_NUMBER", "STRING"):
+            elements.append(ast.literal_eval(value))
+        else:
+            raise SyntaxError(f"Unexpected token {value!r}")
+    if frames:
+        raise SyntaxError(f"Expected {frames[-1][0]}, got EOF")
+    return ListNode([])
+
+
+def _literal_value(obj: Any) -> Any:
+    """The value `ast.literal_eval(Formatter.format_structure(obj))` would give."""
+    if isinstance(obj, ListNode):
+        return [_literal_value(item) for item in obj.elements]
+    if isinstance(obj, TupleNode):
+        if len(obj.elements) == 1:  # "(x)" is x
+            return _literal_value(obj.elements[0])
+        return tuple(_literal_value(item) for item in obj.elements)
+    if isinstance(obj, dict):
+        content = obj["braced_content"].strip()
+        if _unsafe_in_braces.search(content):
+            raise ValueError(content)
+        return content
+    if isinstance(obj, Identifier):
+        return obj.name
+    if isinstance(obj, str):
+        if _unsafe_in_strings.search(obj):
+            raise ValueError(obj)
+        return f'"{obj}"'
+    if isinstance(obj, float) and not math.isfinite(obj):
+        raise ValueError(obj)
+    if isinstance(obj, complex):
+        return ast.literal_eval(str(obj))
+    return obj
 
 
 def parse_expression(expression: str) -> list[str]:
-    """Parse expression into tokens while preserving structure"""
+    """Parse expression into tokens while preserving structure
+
+    Results are kept in `parse_cache`; each call returns a new list.
+    """
+    if not isinstance(expression, str):
+        return _parse_expression(expression)
+    tokens = parse_cache.get(expression)
+    if tokens is None:
+        tokens = tuple(_parse_expression(expression))
+        parse_cache.put(expression, tokens)
+    return list(tokens)
+
+
+def _parse_expression(expression: str) -> list[str]:
     ignore_tokens = ['"""', "'''"]
     lexer = UnifiedLexer(expression)
     tokens = []
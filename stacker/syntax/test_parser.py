@@ -1,3 +1,4 @@
+import ast
 import unittest
 
 from stacker.syntax.parser import (
@@ -24,7 +25,9 @@ from stacker.syntax.parser import (
     is_contains_transpose_command,
     convert_custom_array_to_proper_list,
     parse_expression,
+    parse_literal,
     lex_string,
+    UnifiedLexer,
 )
 
 
@@ -236,6 +239,45 @@ class TestLexer(unittest.TestCase):
         ]
         self.assertEqual(lex_string(expr), exprs)
 
+    def test_token_boundaries(self):
+        cases = {
+            "12[1 2]": ["12", "[1 2]"],
+            "a12[1 2]x": ["a12[1 2]", "x"],
+            "f(x) g": ["f(x)", "g"],
+            "{1 {2 [3 (4)]}}5": ["{1 {2 [3 (4)]}}", "5"],
+            '{a "}" b} c': ['{a "}" b}', "c"],
+            "[' ] ']": ["[' ] ']"],
+            "'it''s'": ["'it'", "'s'"],
+            "a]b) c": ["a]b)", "c"],
+            "²{x}": ["²", "{x}"],
+            # Unclosed parts extend to the end of the input.
+            "[1 2": ["[1 2"],
+            "'a [b' c": ["'a [b' c"],
+            "  \t\n ": [],
+        }
+        for text, tokens in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(UnifiedLexer(text).tokenize(), tokens)
+
+    def test_parse_literal(self):
+        cases = [
+            "[1 2 3]",
+            "[1 -2.5 3e2 +4 .5 1-2]",
+            "[1 2; 3 4]",
+            "[[1 2] [3 4]]",
+            "(1 2; 3 4)",
+            "((1 2))",
+            "(7)",
+            "[]",
+            "[1+2j 3j]",
+            "[a b 'c d' \"e\" {1 2 +}]",
+            "[1 [2 (3 x)]; 4 5]",
+        ]
+        for text in cases:
+            with self.subTest(text=text):
+                expected = ast.literal_eval(convert_custom_array_to_proper_list(text))
+                self.assertEqual(repr(parse_literal(text)), repr(expected))
+
 
 if __name__ == "__main__":
     unittest.main()
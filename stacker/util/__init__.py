@@ -1,3 +1,4 @@
 from stacker.util.color import COLORS, colored
+from stacker.util.lru import LRUCache
 
-__all__ = ["COLORS", "colored"]
+__all__ = ["COLORS", "LRUCache", "colored"]
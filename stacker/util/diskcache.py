@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import sqlite3
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memo (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    used INTEGER NOT NULL
+)
+"""
+
+
+class DiskCache:
+    """A persistent key-value store with least-recently-used eviction.
+
+    Entries are kept in an sqlite database `memo.sqlite3` in `directory`, so
+    they survive process restarts and can be shared by several processes.
+    Values are pickled; values that cannot be pickled are not stored.
+    When the number of entries exceeds `max_entries`, the least recently
+    used tenth is evicted.
+    """
+
+    filename = "memo.sqlite3"
+
+    def __init__(
+        self, directory: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.path = Path(directory).expanduser() / self.filename
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._count = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            import sqlite3
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            self._count = connection.execute("SELECT COUNT(*) FROM memo").fetchone()[0]
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value FROM memo WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            connection.execute(
+                "UPDATE memo SET used = ? WHERE key = ?", (time.time_ns(), key)
+            )
+            self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        try:
+            data = pickle.dumps(value)
+        except Exception:
+            return
+        with self._lock:
+            connection = self._connect()
+            now = time.time_ns()
+            cursor = connection.execute(
+                "UPDATE memo SET value = ?, used = ? WHERE key = ?", (data, now, key)
+            )
+            if cursor.rowcount == 0:
+                connection.execute(
+                    "INSERT OR REPLACE INTO memo (key, value, used) VALUES (?, ?, ?)",
+                    (key, data, now),
+                )
+                self._count += 1
+                if self._count > self.max_entries:
+                    self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        # Other processes may have written too, so recount first.
+        count = connection.execute("SELECT COUNT(*) FROM memo").fetchone()[0]
+        keep = self.max_entries * 9 // 10
+        if count > keep:
+            connection.execute(
+                "DELETE FROM memo WHERE key IN "
+                "(SELECT key FROM memo ORDER BY used LIMIT ?)",
+                (count - keep,),
+            )
+            self.evictions += count - keep
+            count = keep
+        self._count = count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM memo")
+            self._count = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            self._connect()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": self._count,
+                "maxsize": self.max_entries,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM memo").fetchone()[0]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_connection"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
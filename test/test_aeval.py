@@ -0,0 +1,113 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from stacker.engine.monitor import Monitor, active
+from stacker.stacker import Stacker
+
+FIB = "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun"
+LONG_LOOP = "0 $i set {i 1 + $i set} 100000000 times"
+
+
+class TestAeval(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stacker = Stacker()
+        self.stacker.process_expression(f"{FIB} 7")
+
+    async def test_result(self):
+        stack = await self.stacker.aeval("10 fib")
+        self.assertIs(stack, self.stacker.stack)
+        self.assertEqual(list(stack), [7, 55])
+
+    async def test_errors_propagate(self):
+        with self.assertRaises(ZeroDivisionError):
+            await self.stacker.aeval("1 0 /")
+
+    async def test_timeout_restores_stack(self):
+        for vm in (False, True):
+            self.stacker.vm = vm
+            with self.assertRaises(TimeoutError):
+                await self.stacker.aeval(f"1 2 {LONG_LOOP}", timeout=0.05)
+            self.assertEqual(list(self.stacker.stack), [7])
+
+    async def test_compiled_loop_times_out(self):
+        # The body is compiled by the JIT and runs in chunks.
+        with self.assertRaises(TimeoutError):
+            await self.stacker.aeval("0 {1 +} 1000000000 times", timeout=0.05)
+        self.assertEqual(list(self.stacker.stack), [7])
+
+    async def test_iferror_does_not_catch_timeout(self):
+        with self.assertRaises(TimeoutError):
+            await self.stacker.aeval(f"{{{LONG_LOOP}}} {{1}} iferror", timeout=0.05)
+        self.assertEqual(list(self.stacker.stack), [7])
+
+    async def test_cancel(self):
+        task = asyncio.create_task(self.stacker.aeval(LONG_LOOP))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        # The evaluation has stopped: nothing changes any more.
+        i = self.stacker.variables["i"]
+        self.assertGreater(i, 0)
+        await asyncio.sleep(0.02)
+        self.assertEqual(self.stacker.variables["i"], i)
+        self.assertEqual(list(self.stacker.stack), [7])
+        self.assertEqual(list(await self.stacker.aeval("1 2 +")), [7, 3])
+
+    async def test_loop_keeps_running(self):
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.001)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        await self.stacker.aeval("18 fib")
+        ticker.cancel()
+        gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+        self.assertGreater(len(ticks), 10)
+        self.assertLess(max(gaps), 0.1)
+
+    async def test_contexts_run_concurrently(self):
+        contexts = [self.stacker.context() for _ in range(3)]
+        stacks = await asyncio.gather(*(c.aeval("12 fib") for c in contexts))
+        self.assertEqual([list(stack) for stack in stacks], [[144]] * 3)
+
+    async def test_file_operators(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.txt")
+            await self.stacker.aeval(f'"hello" "{path}" write-to-file')
+            stack = await self.stacker.aeval(f'"{path}" read-from-file')
+        self.assertEqual(str(stack[-1]), "hello")
+
+
+class TestMonitor(unittest.TestCase):
+    def test_checks_every_interval(self):
+        class Counting(Monitor):
+            checks = 0
+
+            def check(self, stack):
+                self.checks += 1
+
+        stacker = Stacker()
+        monitor = Counting(interval=100)
+        with monitor.watching():
+            self.assertIs(active.monitor, monitor)
+            stacker.eval("0 {1 +} 10000 times")
+        self.assertIsNone(active.monitor)
+        self.assertEqual(list(stacker.stack), [10000])
+        self.assertGreaterEqual(monitor.executed, 20000)
+        self.assertGreaterEqual(monitor.checks, monitor.executed // 100 - 1)
+
+    def test_interval_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            Monitor(interval=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from stacker.engine import aot
+from stacker.engine.aot import compile_script
+from stacker.error import ResourceLimitError
+from stacker.stacker import Stacker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = [
+    "0 $s set\n1 100 $i {s i 2 ^ + $s set} do\ns",
+    "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun\n15 fib",
+    "{dup *} $sq defmacro\n7 sq 1 + sq",
+    "0 10 $i {i 5 == {break} {i} ifelse} do",
+    "0 [1 2 3 4] $x {x dup * +} dolist",
+    "{1 0 /} {'error'} iferror\n{1 2 +} {'error'} iferror",
+    "3 4 > {'yes'} if 3 4 < {'no'} if",
+    "'1 2 +' eval\n'3 4 *' read-from-string",
+    "0 $c set\n{c 1 + $c set} 20 times c",
+    "{x y} {x y *} $mul defun\n6 7 mul\n[1 2 3] {10 mul} map",
+    "[1 2 3\n4 5] (1 2.5 'a') 1e3 -2 3j",
+    "{1 2 +} $b set b eval b",
+]
+
+
+def load(source):
+    namespace = {"__name__": "compiled"}
+    exec(compile(compile_script(source, "test.stk"), "test.py", "exec"), namespace)
+    return namespace
+
+
+def interpret(source, stacker):
+    for statement in aot.split_statements(source):
+        stacker.process_expression(statement)
+    return stacker
+
+
+class TestAOT(unittest.TestCase):
+    def test_same_result_as_interpreter(self):
+        for vm in (False, True):
+            for jit in (False, True):
+                for source in SCRIPTS:
+                    with self.subTest(source=source, vm=vm, jit=jit):
+                        expected = interpret(source, Stacker(vm=vm, jit=jit))
+                        compiled = load(source)["run"](Stacker(vm=vm, jit=jit))
+                        self.assertEqual(list(compiled.stack), list(expected.stack))
+
+    def test_error(self):
+        for source in ("1 0 /", "undefined_name 1 +", "1 20 $i {1 i 15 - /} do"):
+            with self.subTest(source=source):
+                expected = Stacker()
+                compiled = Stacker()
+                with self.assertRaises(Exception) as e1:
+                    interpret(source, expected)
+                with self.assertRaises(Exception) as e2:
+                    load(source)["run"](compiled)
+                self.assertIs(type(e2.exception), type(e1.exception))
+                self.assertEqual(list(compiled.stack), list(expected.stack))
+
+    def test_iferror_does_not_catch_limits(self):
+        source = "{0 {1 +} 100000 times} {'caught'} iferror"
+        expected, compiled = Stacker(), Stacker()
+        for stacker in (expected, compiled):
+            stacker.set_limits(max_instructions=1000)
+        with self.assertRaises(ResourceLimitError):
+            interpret(source, expected)
+        with self.assertRaises(ResourceLimitError):
+            load(source)["run"](compiled)
+        self.assertNotIn("caught", list(compiled.stack))
+
+    def test_shadowed_operator(self):
+        stacker = Stacker()
+        stacker.process_expression("{*} $+ defmacro")
+        load("3 4 +\n0 1 5 $i {i +} do")["run"](stacker)
+        self.assertEqual(list(stacker.stack), [12, 0])
+
+    def test_incompatible_operators(self):
+        with self.assertRaises(aot.Incompatible):
+            aot.bind(Stacker(), "+", "priority")
+
+        def build(core):
+            raise aot.Incompatible("test")
+
+        stacker = aot.run(build, "1 2 +\n3 *")
+        self.assertEqual(list(stacker.stack), [9])
+
+    def test_module_is_importable(self):
+        namespace = load("1 2 +")
+        self.assertEqual(namespace["FORMAT_VERSION"], aot.FORMAT_VERSION)
+        self.assertEqual(namespace["SOURCE"], "1 2 +")
+        self.assertEqual(list(namespace["run"]().stack), [3])
+
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            script = os.path.join(tmp, "script.stk")
+            with open(script, "w") as f:
+                f.write("# comment\n0 1 10 $i {i +} do\necho\n")
+            env = dict(os.environ, PYTHONPATH=ROOT)
+            subprocess.run(
+                [sys.executable, "-m", "stacker", "compile", script],
+                check=True,
+                capture_output=True,
+                env=env,
+            )
+            result = subprocess.run(
+                [sys.executable, os.path.join(tmp, "script.py")],
+                check=True,
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+        self.assertEqual(result.stdout.strip(), "55")
+
+    def test_command_line_loads_startup_state(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, ".stackerrc"), "w") as f:
+                f.write("{x} {x x *} $sq defun\n")
+            script = os.path.join(tmp, "script.stk")
+            with open(script, "w") as f:
+                f.write("5 sq echo\nundefined_name\n")
+            env = dict(os.environ, HOME=tmp, PYTHONPATH=ROOT)
+            subprocess.run(
+                [sys.executable, "-m", "stacker", "compile", script],
+                check=True,
+                capture_output=True,
+                env=env,
+            )
+            result = subprocess.run(
+                [sys.executable, os.path.join(tmp, "script.py")],
+                capture_output=True,
+                text=True,
+                env=env,
+                cwd=tmp,
+            )
+        lines = result.stdout.splitlines()
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(lines[0], "25")
+        self.assertEqual(lines[1], f"File: {os.path.realpath(script)}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import types
+import unittest
+
+from stacker.error import UndefinedSymbolError
+from stacker.stacker import Stacker
+
+
+class TestEvalMany(unittest.TestCase):
+    def setUp(self):
+        self.stacker = Stacker()
+        self.stacker.process_expression("{x} {x 2 *} $double defun 10 $ten set 99")
+
+    def test_list_of_expressions(self):
+        results = self.stacker.eval_many(["1 2 +", "ten double", "1 2"])
+        self.assertEqual([r.stack for r in results], [[3], [20], [1, 2]])
+        self.assertEqual([r.index for r in results], [0, 1, 2])
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(results[2].value, 2)
+
+    def test_bindings(self):
+        bindings = [{"x": 2, "y": 3}, {"x": 4, "y": 5}, {"x": 1, "y": 0}]
+        results = self.stacker.eval_many("x y * double", bindings)
+        self.assertEqual([r.value for r in results], [12, 40, 0])
+
+    def test_error_does_not_stop_batch(self):
+        results = self.stacker.eval_many(["1 2 +", "3 undefined", "4"])
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertIsInstance(results[1].error, UndefinedSymbolError)
+        self.assertEqual(results[2].stack, [4])
+
+    def test_items_are_isolated(self):
+        results = self.stacker.eval_many(
+            ["{y} {y 1 +} $inc defun 5 $v set 1 inc", "v", "1 inc", "ten"]
+        )
+        self.assertEqual(results[0].stack, [2])
+        self.assertFalse(results[1].ok)
+        self.assertFalse(results[2].ok)
+        self.assertEqual(results[3].stack, [10])
+        self.assertNotIn("inc", self.stacker.sfunctions)
+        self.assertNotIn("v", self.stacker.variables)
+        self.assertEqual(list(self.stacker.stack), [99])
+
+    def test_bindings_do_not_leak(self):
+        results = self.stacker.eval_many("x", [{"x": 1}, {}])
+        self.assertEqual(results[0].stack, [1])
+        self.assertFalse(results[1].ok)
+
+    def test_lazy(self):
+        results = self.stacker.eval_many(["1", "2"], lazy=True)
+        self.assertIsInstance(results, types.GeneratorType)
+        self.assertEqual([r.value for r in results], [1, 2])
+
+    def test_expression_compiled_once(self):
+        self.stacker.eval_many("n 1 +", [{"n": n} for n in range(10)])
+        stats = self.stacker.get_parse_cache_stats()["code"]
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 9)
+
+    def test_wrong_arguments(self):
+        with self.assertRaises(TypeError):
+            self.stacker.eval_many("1 2 +")
+        with self.assertRaises(TypeError):
+            self.stacker.eval_many(["x"], [{"x": 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from stacker.exec_modes.batch_mode import CHUNK_SIZE, BatchMode, Outcome
+from stacker.stacker import Stacker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def warm_stacker():
+    stacker = Stacker()
+    stacker.process_expression("{x} {x 2 *} $double defun")
+    return stacker
+
+
+class TestBatchMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def script(self, name, source):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(source)
+        return path
+
+    def test_scripts_in_input_order(self):
+        paths = [self.script(f"s{i}.stk", f"{i} double echo\n") for i in range(10)]
+        outcomes = list(BatchMode(warm_stacker, jobs=3).iter_scripts(paths))
+        self.assertEqual(
+            [o.output for o in outcomes], [f"{2 * i}\n" for i in range(10)]
+        )
+        self.assertTrue(all(o.status == 0 for o in outcomes))
+
+    def test_scripts_are_isolated(self):
+        paths = [
+            self.script("a.stk", "5 $v set v echo\n"),
+            self.script("b.stk", "v echo\n"),
+        ]
+        first, second = BatchMode(warm_stacker, jobs=1).iter_scripts(paths)
+        self.assertEqual(first, Outcome("5\n"))
+        self.assertEqual(second.status, 1)
+        self.assertIn("UndefinedSymbolError", second.error)
+
+    def test_script_errors_and_exit(self):
+        paths = [
+            self.script("fail.stk", '"before" echo\n1 0 /\n'),
+            self.script("exit.stk", "3 exit-code\n"),
+            self.script("ok.stk", "1 echo\n"),
+            os.path.join(self.tmp.name, "missing.stk"),
+        ]
+        outcomes = list(BatchMode(warm_stacker, jobs=2).iter_scripts(paths))
+        self.assertEqual(outcomes[0].output, "before\n")
+        self.assertIn("ZeroDivisionError", outcomes[0].error)
+        self.assertEqual(outcomes[1], Outcome("", status=3))
+        self.assertEqual(outcomes[2], Outcome("1\n"))
+        self.assertIn("ScriptReadError", outcomes[3].error)
+
+    def test_lines(self):
+        lines = [
+            "1 2 +\n",
+            "\n",
+            "# comment\n",
+            '"hi" echo 4 double\n',
+            "x\n",
+            "exit\n",
+        ]
+        lines += [f"{i}\n" for i in range(2 * CHUNK_SIZE)]
+        outcomes = list(BatchMode(warm_stacker, jobs=2).iter_lines(lines))
+        self.assertEqual(outcomes[0], Outcome("", "[3]"))
+        self.assertEqual(outcomes[1], Outcome("hi\n", "[8]"))
+        self.assertEqual(outcomes[2].status, 1)
+        self.assertIn("`x` is not defined", outcomes[2].error)
+        self.assertEqual(outcomes[3], Outcome(""))
+        self.assertEqual([o.stack for o in outcomes[4:]], [f"[{i}]" for i in range(64)])
+
+    def test_jobs_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            BatchMode(warm_stacker, jobs=0)
+
+
+class TestBatchCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = dict(os.environ, HOME=self.tmp.name, PYTHONPATH=ROOT)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_stacker(self, *args, input=None):
+        return subprocess.run(
+            [sys.executable, "-m", "stacker", *args],
+            capture_output=True,
+            text=True,
+            env=self.env,
+            cwd=self.tmp.name,
+            input=input,
+        )
+
+    def test_jobs(self):
+        for name, source in (("a.stk", "1 2 + echo\n"), ("b.stk", "x\n")):
+            with open(os.path.join(self.tmp.name, name), "w") as f:
+                f.write(source)
+        result = self.run_stacker("--jobs", "2", "a.stk", "b.stk", "a.stk")
+        self.assertEqual(result.returncode, 1)
+        lines = result.stdout.splitlines()
+        self.assertEqual(lines[0], "3")
+        self.assertTrue(lines[1].startswith("File:"))
+        self.assertEqual(lines[2:], ["UndefinedSymbolError: `x` is not defined.", "3"])
+
+    def test_batch_from_stdin(self):
+        result = self.run_stacker("--batch", "-", input="1 2 +\n3 4\n")
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.splitlines(), ["[3]", "[3 4]"])
+
+
+if __name__ == "__main__":
+    unittest.main()
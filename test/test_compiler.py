@@ -0,0 +1,100 @@
+import unittest
+
+from stacker.data_type import String
+from stacker.engine.instruction import (
+    CallOperator,
+    LoadName,
+    MakeBlock,
+    MakeList,
+    MakeTuple,
+    PushLiteral,
+)
+from stacker.error import UndefinedSymbolError
+from stacker.stacker import Stacker
+
+
+class TestCompiler(unittest.TestCase):
+    def setUp(self):
+        self.stacker = Stacker()
+        self.compiler = self.stacker.compiler
+
+    def test_compile_token_types(self):
+        code = self.compiler.compile(
+            ["1", "2.5", "'abc'", "$x", "[1 2]", "(1 2)", "{1 +}", "+", "foo"]
+        )
+        self.assertEqual(
+            [type(instruction) for instruction in code],
+            [
+                PushLiteral,
+                PushLiteral,
+                PushLiteral,
+                PushLiteral,
+                MakeList,
+                MakeTuple,
+                MakeBlock,
+                CallOperator,
+                LoadName,
+            ],
+        )
+        self.assertEqual(code.tokens[0], "1")
+        self.assertEqual(code.instructions[0].value, 1)
+        self.assertIsInstance(code.instructions[2].value, String)
+        self.assertEqual(code.instructions[3].value, "x")
+
+    def test_undefined_symbol_is_raised_at_runtime(self):
+        self.stacker.process_expression("1 2")
+        with self.assertRaises(UndefinedSymbolError):
+            self.stacker.process_expression("3 undefined_symbol")
+        self.assertEqual(list(self.stacker.stack), [1, 2, 3])
+
+    def test_block_code_is_shared(self):
+        code = self.compiler.compile_expression("{1 2 +} {1 2 +}")
+        make_block = code.instructions[0]
+        self.stacker.evaluate(code, stack=self.stacker.stack)
+        self.stacker.evaluate(code, stack=self.stacker.stack)
+        blocks = list(self.stacker.stack)
+        self.assertEqual(blocks[0].tokens, [1, 2, "+"])
+        self.assertIs(blocks[0].code, make_block.code)
+        self.assertIs(blocks[2].code, make_block.code)
+
+    def test_loop_body_is_compiled_once(self):
+        self.stacker.process_expression("0 $s set 1 10 $i {s i + $s set} do")
+        self.assertEqual(self.stacker.variables["s"], 55)
+
+    def test_names_are_resolved_at_runtime(self):
+        # `x` is undefined when the block is compiled and defined later.
+        self.stacker.process_expression("{x 1 +} $f defmacro 1 $x set f")
+        self.assertEqual(self.stacker.stack[-1], 2)
+
+    def test_macro_shadows_operator(self):
+        self.stacker.process_expression("{100} $dup defmacro 1 dup")
+        self.assertEqual(list(self.stacker.stack), [1, 100])
+
+    def test_list_literal_is_not_shared(self):
+        code = self.compiler.compile_expression("[1 2; 3 4]")
+        self.stacker.evaluate(code, stack=self.stacker.stack)
+        self.stacker.evaluate(code, stack=self.stacker.stack)
+        first, second = self.stacker.stack
+        self.assertEqual(first, second)
+        self.assertIsNot(first[0], second[0])
+
+    def test_list_literal_names_are_resolved_at_runtime(self):
+        code = self.compiler.compile_expression("[1 x] (x 2) (x)")
+        self.assertEqual([instruction.names for instruction in code], [True] * 3)
+        self.stacker.process_expression("5 $x set")
+        self.stacker.evaluate(code, stack=self.stacker.stack)
+        self.assertEqual(list(self.stacker.stack), [[1, 5], (5, 2), 5])
+
+    def test_numeric_literals_are_not_resolved(self):
+        code = self.compiler.compile_expression("[1 2.5; 3 4] (1 2) ([1 2])")
+        self.assertEqual([instruction.names for instruction in code], [False] * 3)
+        self.stacker.evaluate(code, stack=self.stacker.stack)
+        self.stacker.evaluate(code, stack=self.stacker.stack)
+        self.assertEqual(
+            list(self.stacker.stack), [[[1, 2.5], [3, 4]], (1, 2), [1, 2]] * 2
+        )
+        self.assertIsNot(self.stacker.stack[2], self.stacker.stack[5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from stacker.error import UndefinedSymbolError
+from stacker.stacker import Stacker
+
+FIB = [0, 1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89]
+
+
+class TestDefaultStack(unittest.TestCase):
+    def test_eval_uses_own_stack(self):
+        first, second = Stacker(), Stacker()
+        self.assertEqual(list(first.eval("1 2 +")), [3])
+        self.assertEqual(list(second.eval("4")), [4])
+        self.assertIs(first.eval("5"), first.stack)
+        self.assertEqual(list(first.stack), [3, 5])
+
+    def test_control_flow_in_eval(self):
+        self.assertEqual(list(Stacker().eval("true {1 2 +} if")), [3])
+        self.assertEqual(list(Stacker().eval("0 {1 +} 3 times")), [3])
+
+    def test_block_evaluated_twice(self):
+        stacker = Stacker()
+        stacker.process_expression("{1 2 +} dup 1 + swap 1 +")
+        self.assertEqual(list(stacker.stack), [4, 4])
+
+
+class TestContext(unittest.TestCase):
+    def setUp(self):
+        self.shared = Stacker()
+        self.shared.process_expression(
+            "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun "
+            "{x} {x 2 *} $double defun 10 $ten set 99"
+        )
+
+    def test_sees_shared_definitions(self):
+        context = self.shared.context()
+        self.assertEqual(list(context.eval("ten double 10 fib")), [20, 55])
+
+    def test_definitions_stay_in_context(self):
+        context = self.shared.context()
+        context.process_expression(
+            "1 $ten set {x} {x 3 *} $double defun {dup} $twice defmacro"
+        )
+        self.assertEqual(list(context.eval("ten double 4 twice")), [3, 4, 4])
+        self.assertEqual(self.shared.variables["ten"], 10)
+        self.assertNotIn("twice", self.shared.macros)
+        self.assertEqual(list(self.shared.context().eval("ten double")), [20])
+        self.assertEqual(list(self.shared.stack), [99])
+
+    def test_error_trace_stays_in_context(self):
+        trace = self.shared.get_trace_copy()
+        context = self.shared.context()
+        with self.assertRaises(UndefinedSymbolError):
+            context.eval("1 undefined_name")
+        self.assertEqual(context.get_trace_ref(), ["1", "undefined_name"])
+        self.assertEqual(self.shared.get_trace_ref(), trace)
+
+    def test_threads(self):
+        def job(i):
+            context = self.shared.context()
+            context.process_expression(f"{{x}} {{x {i} +}} $add defun {i} $ten set")
+            context.process_expression("0 1 100 {k} {k +} do")
+            context.process_expression(f"{i % 12} fib 1 add ten double")
+            return list(context.stack)
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(job, range(200)))
+        for i, result in enumerate(results):
+            self.assertEqual(result, [5050, FIB[i % 12], 1 + i, 2 * i])
+        self.assertEqual(self.shared.variables["ten"], 10)
+        self.assertNotIn("add", self.shared.sfunctions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,3 +30,24 @@ class TestStacker(unittest.TestCase):
         self.stacker.eval("{xs} {xs sum} $test_sum defun")
         ans = self.stacker.eval("{(7 8 9)} test_sum")
         self.assertEqual(ans[-1], 24)
+
+    def test_arguments_are_local(self):
+        self.stacker.stack.clear()
+        self.stacker.eval("1 $x set")
+        self.stacker.eval("{x} {x 10 * $y set y} $f defun")
+        ans = self.stacker.eval("5 f")
+        self.assertEqual(ans[-1], 50)
+        self.assertEqual(self.stacker.variables["x"], 1)
+        self.assertNotIn("y", self.stacker.variables)
+
+    def test_globals_are_visible(self):
+        self.stacker.stack.clear()
+        self.stacker.eval("{x} {x k *} $f defun 3 $k set")
+        ans = self.stacker.eval("2 f")
+        self.assertEqual(ans[-1], 6)
+
+    def test_recursive_call(self):
+        self.stacker.stack.clear()
+        self.stacker.eval("{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun")
+        ans = self.stacker.eval("15 fib")
+        self.assertEqual(ans[-1], 610)
@@ -0,0 +1,38 @@
+import unittest
+
+from stacker.stacker import Stacker
+
+
+class TestDispatchTable(unittest.TestCase):
+    def setUp(self):
+        self.stacker = Stacker()
+        self.operator_manager = self.stacker.operator_manager
+
+    def test_every_operator_has_a_handler(self):
+        self.assertEqual(
+            set(self.operator_manager.dispatch_table),
+            self.operator_manager.built_in_operators,
+        )
+
+    def test_register_operator_updates_handler(self):
+        self.stacker.register_operator("+", lambda x1, x2: x1 * x2, 2, True)
+        ans = self.stacker.eval("3 4 +")
+        self.assertEqual(ans[-1], 12)
+
+    def test_stack_operator_handler(self):
+        ans = self.stacker.eval("1 2 3 2 dupn")
+        self.assertEqual(list(ans)[-5:], [1, 2, 3, 2, 3])
+
+    def test_sfunction_shadows_operator(self):
+        self.stacker.eval("{x y} {x y -} $+ defun")
+        ans = self.stacker.eval("5 3 +")
+        self.assertEqual(ans[-1], 2)
+
+    def test_exit_code(self):
+        with self.assertRaises(SystemExit) as context:
+            self.stacker.eval("3 exit-code")
+        self.assertEqual(context.exception.code, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 
 from stacker.stacker import Stacker
 
@@ -22,6 +23,15 @@ class TestUnit(unittest.TestCase):
         ans = stacker.eval("(1 2 3) {2 *} map")
         self.assertEqual(ans[-1], (2, 4, 6))
 
+    def test_map_does_not_copy_interpreter(self):
+        # Each element runs on a fresh frame of the block, not on a copy of
+        # the interpreter, so the cost per element does not grow with it.
+        stacker = Stacker()
+        with mock.patch("copy.deepcopy", side_effect=AssertionError):
+            ans = stacker.eval("[1 2 3] {$x set x x *} map [4 5] {2 >} filter")
+        self.assertEqual(list(ans), [[1, 4, 9], [4, 5]])
+        self.assertNotIn("x", stacker.variables)
+
     ############################
     # filter
     ############################
@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from stacker.include.image import restore_image, save_image
+from stacker.stacker import Stacker
+
+PLUGIN = textwrap.dedent("""
+    def double(x):
+        return x * 2
+
+
+    def depth(stacker):
+        return len(stacker.stack)
+
+
+    def setup(stacker):
+        stacker.register_plugin("double", double, desc="Doubles")
+        stacker.register_plugin("depth", depth, pass_core=True)
+    """)
+
+
+class TestStartupImage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.plugin = self.dir / "image_test_plugin.py"
+        self.plugin.write_text(PLUGIN)
+        self.library = self.dir / "lib.stk"
+        self.library.write_text("{n} {n 1 +} $inc defun\n")
+        self.image = self.dir / "startup.image"
+
+    def tearDown(self):
+        sys.modules.pop("image_test_plugin", None)
+        self.tmp.cleanup()
+
+    def load(self):
+        stacker = Stacker()
+        sys.path.insert(0, self.tmp.name)
+        try:
+            __import__("image_test_plugin").setup(stacker)
+        finally:
+            sys.path.pop(0)
+        stacker.include(str(self.library))
+        stacker.process_expression(
+            "{x y} {x y * 2 +} $mul2 defun {dup *} $sq defmacro "
+            "{x} {x 10 +} lambda $add10 set 42 $answer set $inc memoize 7"
+        )
+        stacker.register_label("start", 0)
+        stacker.process_expression("disable_disp_stack")
+        return stacker
+
+    def check(self, stacker):
+        stacker.process_expression("3 4 mul2 answer 5 inc 3 sq 1 add10 21 double depth")
+        self.assertEqual(list(stacker.stack), [7, 14, 42, 6, 9, 11, 42, 7])
+        self.assertEqual(stacker.labels, {"start": 0})
+        self.assertFalse(stacker.disp_stack_mode)
+        self.assertEqual(stacker.get_plugin_descriptions()["double"], "Doubles")
+        self.assertIn("inc", stacker.get_memo_stats())
+
+    def test_restore(self):
+        stacker = self.load()
+        self.assertTrue(save_image(stacker, self.image, [self.plugin]))
+        restored = Stacker()
+        self.assertTrue(restore_image(restored, self.image))
+        self.check(self.load())
+        self.check(restored)
+
+    def test_changed_source_invalidates(self):
+        self.assertTrue(save_image(self.load(), self.image, [self.plugin]))
+        os.utime(self.library, ns=(0, 0))  # recorded because it was included
+        self.assertFalse(restore_image(Stacker(), self.image))
+        self.assertTrue(save_image(self.load(), self.image, [self.dir / "rc"]))
+        (self.dir / "rc").write_text("1\n")
+        self.assertFalse(restore_image(Stacker(), self.image))
+
+    def test_missing_or_broken_image(self):
+        self.assertFalse(restore_image(Stacker(), self.image))
+        self.image.write_bytes(b"STKI\x00garbage")
+        stacker = Stacker()
+        self.assertFalse(restore_image(stacker, self.image))
+        self.assertNotIn("mul2", stacker.sfunctions)
+
+    def test_closure_plugin_is_not_saved(self):
+        stacker = self.load()
+        stacker.register_plugin("five", lambda: 5)
+        self.assertFalse(save_image(stacker, self.image))
+        self.assertFalse(self.image.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
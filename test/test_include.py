@@ -1,9 +1,15 @@
+import os
+import tempfile
 import unittest
 
 from stacker.stacker import Stacker
 from pathlib import Path
 from stacker.error import IncludeError
-from stacker.include.include import include_stacker_script
+from stacker.include.include import (
+    include_cache,
+    include_stacker_script,
+    load_included_script,
+)
 
 
 # class TestImportStacker(unittest.TestCase):
@@ -48,5 +54,46 @@ class TestImportStacker(unittest.TestCase):
         self.assertIsInstance(stacker, Stacker)
 
 
+class TestIncludeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "lib.stk"
+        self.path.write_text("[1 2 3] $xs set\n{x} {x 1 +} $inc defun\n")
+
+    def tearDown(self):
+        include_cache.pop(self.path.resolve(), None)
+        self.tmp.cleanup()
+
+    def include(self, stacker):
+        stacker.process_expression(f"'{self.path}' include")
+
+    def test_evaluated_once(self):
+        first = load_included_script(self.path)
+        self.assertIs(load_included_script(str(self.path)), first)
+        self.assertEqual(set(first.variables), {"xs"})
+        self.assertEqual(set(first.sfunctions), {"inc"})
+
+    def test_merged_by_reference(self):
+        stacker = Stacker()
+        stacker.process_expression("3 $pi set")
+        self.include(stacker)
+        self.include(stacker)
+        script = load_included_script(self.path)
+        self.assertIs(stacker.variables["xs"], script.stacker.variables["xs"])
+        self.assertIs(stacker.sfunctions["inc"], script.stacker.sfunctions["inc"])
+        # Constants of the included script do not overwrite the includer's.
+        self.assertEqual(stacker.variables["pi"], 3)
+        stacker.process_expression("41 inc")
+        self.assertEqual(stacker.stack[-1], 42)
+
+    def test_reloaded_when_changed(self):
+        first = load_included_script(self.path)
+        self.path.write_text("7 $xs set\n")
+        os.utime(self.path, ns=(0, 0))
+        second = load_included_script(self.path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.variables, {"xs": 7})
+
+
 if __name__ == "__main__":
     unittest.main()
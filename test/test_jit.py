@@ -0,0 +1,87 @@
+import unittest
+
+from stacker.error import UndefinedSymbolError
+from stacker.stacker import Stacker
+
+
+class TestLoopJIT(unittest.TestCase):
+    expressions = [
+        "0 $s set 1 100 $i {s i 2 ^ + $s set} do s",
+        "0 1 100 $i {i +} do",
+        "1 20 $i {i} do",
+        "1 1 30 $i {dup 1 +} do",
+        "1 20 $i {i 0.5 * i 3 % -} do",
+        "0 [1 2 3 4 5 6 7 8 9 10 11 12] $x {x dup * +} dolist",
+        "0 $c set {c 1 + $c set} 20 times c",
+        "0 $s set 1 30 $i {s 2 pi * i / + $s set} do s",
+        "0 $s set 1 30 $i {s i sqrt + $s set} do s",
+        # Not compiled: the body evaluates a block.
+        "0 $s set 1 30 $i {i 10 > {s i + $s set} if} do s",
+    ]
+
+    def run_both(self, expression, vm=False):
+        interpreted = Stacker(jit=False, vm=vm)
+        compiled = Stacker(vm=vm)
+        for stacker in (interpreted, compiled):
+            try:
+                stacker.process_expression(expression)
+            except Exception as e:
+                stacker.stack.append(type(e))
+        return interpreted, compiled
+
+    def test_same_result_as_interpreter(self):
+        for vm in (False, True):
+            for expression in self.expressions:
+                with self.subTest(expression=expression, vm=vm):
+                    interpreted, compiled = self.run_both(expression, vm)
+                    self.assertEqual(list(compiled.stack), list(interpreted.stack))
+
+    def test_loop_variables(self):
+        interpreted, compiled = self.run_both("0 $s set 1 50 $i {s i + $s set} do")
+        for name in ("s", "i"):
+            self.assertEqual(compiled.variables[name], interpreted.variables[name])
+
+    def test_body_is_compiled(self):
+        stacker = Stacker()
+        stacker.process_expression("0 $s set {s i + $s set}")
+        body = stacker.stack[-1]
+        stacker.process_expression("1 100 $i")
+        stacker.stack.append(body)
+        stacker.process_expression("do")
+        self.assertEqual(stacker.variables["s"], 5050)
+        self.assertEqual(len(body.code.loop_trace.variants), 1)
+
+    def test_error_in_compiled_iteration(self):
+        # 1 / (i - 15) raises at i = 15, after the loop has been compiled.
+        expression = "0 $s set 1 20 $i {s 1 i 15 - / + $s set} do"
+        interpreted, compiled = self.run_both(expression)
+        self.assertEqual(compiled.stack[-1], ZeroDivisionError)
+        self.assertEqual(list(compiled.stack), list(interpreted.stack))
+        self.assertEqual(compiled.variables["s"], interpreted.variables["s"])
+        self.assertEqual(compiled.variables["i"], 15)
+
+    def test_guard_on_types(self):
+        # A string element stops the compiled loop; the interpreter reports it.
+        expression = "0 $s set [1 2 3 4 5 6 7 8 9 10 'a' 12] $x {s x + $s set} dolist"
+        interpreted, compiled = self.run_both(expression)
+        self.assertEqual(list(compiled.stack), list(interpreted.stack))
+        self.assertEqual(compiled.variables["s"], interpreted.variables["s"])
+
+    def test_guard_on_shadowed_operator(self):
+        stacker = Stacker()
+        stacker.process_expression("0 $s set {s i + $s set}")
+        body = stacker.stack.pop()
+        for expression in ("1 20 $i", "{*} $+ defmacro 1 $s set 1 5 $i"):
+            stacker.process_expression(expression)
+            stacker.stack.append(body)
+            stacker.process_expression("do")
+        self.assertEqual(stacker.variables["s"], 120)
+
+    def test_undefined_variable(self):
+        stacker = Stacker()
+        with self.assertRaises(UndefinedSymbolError):
+            stacker.process_expression("1 20 $i {undefined_name i +} do")
+
+
+if __name__ == "__main__":
+    unittest.main()
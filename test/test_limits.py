@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+
+from stacker.engine.limits import Limits
+from stacker.error import ResourceLimitError
+from stacker.stacker import Stacker
+
+FIB = "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun"
+RECURSE = "{n} {n 1 + recurse} $recurse defun"
+
+
+class TestLimits(unittest.TestCase):
+    def setUp(self):
+        self.stacker = Stacker()
+        self.stacker.process_expression(f"{FIB} {RECURSE}")
+
+    def fresh_eval(self, expression):
+        self.stacker.stack.clear()
+        return self.stacker.eval(expression)
+
+    def assertLimit(self, limit, expression):
+        for vm in (False, True):
+            self.stacker.vm = vm
+            with self.assertRaises(ResourceLimitError) as cm:
+                self.stacker.stack.clear()
+                self.stacker.eval(expression)
+            self.assertEqual(cm.exception.limit, limit)
+
+    def test_within_limits(self):
+        self.stacker.set_limits(
+            max_instructions=1_000_000,
+            timeout=10.0,
+            max_stack_depth=100,
+            max_call_depth=50,
+            max_memory=1 << 30,
+        )
+        self.assertEqual(list(self.stacker.eval("15 fib")), [610])
+
+    def test_max_instructions(self):
+        self.stacker.set_limits(max_instructions=10_000)
+        self.assertLimit("max_instructions", "0 {1 +} 1000000000 times")
+        self.assertLimit("max_instructions", "{x} {x} $f defun {1 f drop} 100000 times")
+        # Each evaluation starts counting anew.
+        self.assertEqual(list(self.fresh_eval("0 {1 +} 1000 times")), [1000])
+
+    def test_timeout(self):
+        self.stacker.set_limits(timeout=0.05)
+        self.assertLimit("timeout", "0 {1 +} 1000000000 times")
+
+    def test_max_stack_depth(self):
+        self.stacker.set_limits(max_stack_depth=1000)
+        self.assertLimit("max_stack_depth", "{1} 1000000000 times")
+
+    def test_max_call_depth(self):
+        self.stacker.set_limits(max_call_depth=50)
+        self.assertLimit("max_call_depth", "1 recurse")
+        self.assertEqual(list(self.fresh_eval("10 fib")), [55])
+
+    def test_max_memory(self):
+        self.stacker.set_limits(max_memory=50 << 20)
+        self.assertLimit("max_memory", "{[1 2 3 4 5 6 7 8]} 1000000000 times")
+
+    def test_max_memory_with_fast_growth(self):
+        # Each `dup +` doubles the list: 100 of them would never fit.
+        self.stacker.set_limits(max_memory=50 << 20, interval=1)
+        self.assertLimit("max_memory", "[1 2 3] {dup +} 100 times")
+
+    def test_max_memory_with_default_interval(self):
+        # The 512 MiB list is gone again by the end, after `len`.
+        self.stacker.set_limits(max_memory=50_000_000)
+        self.assertLimit("max_memory", "[1] {dup +} 26 times len")
+
+    def test_limits_checked_when_evaluation_ends(self):
+        self.stacker.set_limits(max_stack_depth=100)
+        self.assertLimit("max_stack_depth", "{1} 150 times")
+
+    def test_iferror_does_not_catch_limits(self):
+        self.stacker.set_limits(max_call_depth=50)
+        self.assertLimit("max_call_depth", "{1 recurse} {2} iferror")
+        self.assertEqual(list(self.fresh_eval("{1 0 /} {2} iferror")), [2])
+
+    def test_remove_limits(self):
+        self.stacker.set_limits(max_call_depth=50)
+        self.assertIsInstance(self.stacker.get_limits(), Limits)
+        self.stacker.set_limits()
+        self.assertIsNone(self.stacker.get_limits())
+        self.assertEqual(list(self.fresh_eval("{1} 2000 times"))[-1], 1)
+
+    def test_invalid_limits(self):
+        for kwargs in ({"max_instructions": 0}, {"timeout": -1.0}, {"interval": 0}):
+            with self.assertRaises(ValueError):
+                self.stacker.set_limits(**kwargs)
+
+    def test_contexts_inherit_limits(self):
+        self.stacker.set_limits(max_call_depth=50)
+        context = self.stacker.context()
+        with self.assertRaises(ResourceLimitError):
+            context.eval("1 recurse")
+
+    def test_eval_many_limits_each_item(self):
+        self.stacker.set_limits(max_instructions=10_000)
+        results = self.stacker.eval_many(
+            ["0 {1 +} 4000 times", "0 {1 +} 1000000000 times", "0 {1 +} 4000 times"]
+        )
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertIsInstance(results[1].error, ResourceLimitError)
+
+    def test_aeval_applies_limits(self):
+        self.stacker.set_limits(max_call_depth=50)
+        with self.assertRaises(ResourceLimitError):
+            asyncio.run(self.stacker.aeval("1 recurse"))
+
+
+if __name__ == "__main__":
+    unittest.main()
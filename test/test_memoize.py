@@ -0,0 +1,133 @@
+import tempfile
+import unittest
+
+from stacker.data_type import String
+from stacker.error import StackerSyntaxError, UndefinedSymbolError
+from stacker.sfunction import _memo_key
+from stacker.stacker import Stacker
+from stacker.util.diskcache import DiskCache
+from stacker.util.lru import LRUCache
+
+FIB = "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun"
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_order(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now the oldest
+        cache.put("c", 3)
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertEqual(
+            cache.stats(),
+            {"hits": 1, "misses": 0, "evictions": 1, "size": 2, "maxsize": 2},
+        )
+
+    def test_miss(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get("x"))
+        self.assertEqual(cache.misses, 1)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+
+class TestMemoize(unittest.TestCase):
+    def setUp(self):
+        self.stacker = Stacker()
+        self.stacker.process_expression(FIB)
+
+    def test_memoize_operator(self):
+        self.stacker.process_expression("$fib memoize 60 fib")
+        self.assertEqual(self.stacker.stack[-1], 1548008755920)
+        stats = self.stacker.get_memo_stats()["fib"]
+        self.assertEqual(stats["misses"], 61)
+        self.assertEqual(stats["hits"], 58)
+        self.assertEqual(stats["evictions"], 0)
+
+    def test_eviction(self):
+        function = self.stacker.sfunctions["fib"]["func"]
+        self.stacker.register_sfunction("fib", function, 1, memoize=4)
+        self.stacker.process_expression("20 fib")
+        self.assertEqual(self.stacker.stack[-1], 6765)
+        stats = self.stacker.get_memo_stats()["fib"]
+        self.assertEqual(stats["size"], 4)
+        self.assertEqual(stats["maxsize"], 4)
+        self.assertGreater(stats["evictions"], 0)
+
+    def test_sequence_and_string_arguments(self):
+        self.stacker.process_expression("{xs} {xs sum} $total defun $total memoize")
+        self.stacker.process_expression("[1 2 3] total [1 2 3] total (1 2 3) total")
+        self.assertEqual(list(self.stacker.stack), [6, 6, 6])
+        self.stacker.process_expression("{s} {s 'x' +} $suffix defun $suffix memoize")
+        self.stacker.process_expression("'a' suffix 'a' suffix")
+        self.assertEqual(self.stacker.stack[-1], "ax")
+        stats = self.stacker.get_memo_stats()
+        self.assertEqual(stats["total"]["hits"], 1)  # [1 2 3] and (1 2 3) differ
+        self.assertEqual(stats["suffix"]["hits"], 1)
+
+    def test_memo_key_types(self):
+        self.assertNotEqual(_memo_key([1]), _memo_key([1.0]))
+        self.assertNotEqual(_memo_key([String("a")]), _memo_key(["a"]))
+        self.assertIsNone(_memo_key([{}]))
+
+    def test_memoize_unknown_function(self):
+        with self.assertRaises(UndefinedSymbolError):
+            self.stacker.process_expression("$nothing memoize")
+        self.stacker.register_sfunction("py", lambda x: x, 1)
+        with self.assertRaises(StackerSyntaxError):
+            self.stacker.process_expression("$py memoize")
+
+
+class TestDiskMemo(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def run_fib(self, body=FIB, n=20):
+        store = DiskCache(self.directory.name, max_entries=100)
+        self.addCleanup(store.close)
+        stacker = Stacker()
+        stacker.set_memo_store(store)
+        stacker.process_expression(body)
+        stacker.process_expression(f"$fib memoize {n} fib")
+        return stacker.stack[-1], store.stats()
+
+    def test_results_survive_restart(self):
+        result, stats = self.run_fib()
+        self.assertEqual(result, 6765)
+        self.assertEqual(stats["hits"], 0)
+        self.assertEqual(stats["size"], 21)
+        result, stats = self.run_fib()
+        self.assertEqual(result, 6765)
+        self.assertEqual(stats, {**stats, "hits": 1, "misses": 0})
+
+    def test_redefinition_invalidates(self):
+        self.run_fib()
+        body = FIB.replace("n 2 <", "n 1 + 3 <")  # same function, new body
+        result, stats = self.run_fib(body)
+        self.assertEqual(result, 6765)
+        self.assertEqual(stats["hits"], 0)
+
+    def test_size_cap(self):
+        store = DiskCache(self.directory.name, max_entries=10)
+        self.addCleanup(store.close)
+        for i in range(25):
+            store.put(str(i), i)
+        self.assertLessEqual(len(store), 10)
+        self.assertGreater(store.stats()["evictions"], 0)
+        self.assertEqual(store.get("24"), 24)
+        self.assertIsNone(store.get("0"))
+
+    def test_unpicklable_value_is_skipped(self):
+        store = DiskCache(self.directory.name)
+        self.addCleanup(store.close)
+        store.put("f", lambda: None)
+        self.assertIsNone(store.get("f"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from stacker.engine.instruction import CallOperator, PushLiteral
+from stacker.engine.optimizer import Folded
+from stacker.stacker import Stacker
+
+
+class TestOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.stacker = Stacker(opt_level=2)
+        self.compiler = self.stacker.compiler
+
+    def evaluate(self, expression):
+        self.stacker.stack.clear()
+        self.stacker.process_expression(expression)
+        return list(self.stacker.stack)
+
+    def test_constant_folding(self):
+        code = self.compiler.compile_expression("2 3 + 4 *")
+        self.assertEqual(len(code.instructions), 1)
+        self.assertIsInstance(code.instructions[0], Folded)
+        self.assertEqual(code.instructions[0].values, (20,))
+        self.assertEqual(self.evaluate("2 3 + 4 *"), [20])
+
+    def test_fold_constants_and_lists(self):
+        self.assertEqual(self.evaluate("pi 2 /"), [3.141592653589793 / 2])
+        self.assertEqual(self.evaluate("[1 2 3] sum [4 5] len +"), [8])
+        code = self.compiler.compile_expression("[1 2 3] sum")
+        self.assertEqual(code.instructions[0].values, (6,))
+
+    def test_partial_folding(self):
+        code = self.compiler.compile_expression("x 2 3 * +")
+        self.assertEqual(
+            [type(i).__name__ for i in code.instructions],
+            ["LoadName", "Folded", "CallOperator"],
+        )
+        self.assertEqual(self.evaluate("1 $x set x 2 3 * +"), [7])
+
+    def test_errors_are_not_folded(self):
+        code = self.compiler.compile_expression("1 0 /")
+        self.assertEqual(
+            [type(i) for i in code.instructions],
+            [PushLiteral, PushLiteral, CallOperator],
+        )
+        with self.assertRaises(ZeroDivisionError):
+            self.evaluate("1 0 /")
+
+    def test_impure_operators_are_not_folded(self):
+        code = self.compiler.compile_expression("1 2 rand")
+        self.assertNotIsInstance(code.instructions[-1], Folded)
+
+    def test_noop_pairs(self):
+        code = self.compiler.compile_expression("1 2 dup drop swap swap")
+        self.assertEqual(len(code.instructions), 4)
+        self.assertEqual(self.evaluate("1 2 dup drop swap swap"), [1, 2])
+
+    def test_shadowed_operator(self):
+        self.evaluate("{2 3 +} $f defmacro")
+        self.assertEqual(self.evaluate("f"), [5])
+        self.evaluate("{*} $+ defmacro")
+        self.assertEqual(self.evaluate("f"), [6])
+
+    def test_redefined_constant(self):
+        self.evaluate("{pi 2 *} $f defmacro")
+        self.assertEqual(self.evaluate("f"), [3.141592653589793 * 2])
+        self.evaluate("3 $pi set")
+        self.assertEqual(self.evaluate("f"), [6])
+
+    def test_registered_operator(self):
+        self.evaluate("{2 3 +} $f defmacro")
+        self.assertEqual(self.evaluate("f"), [5])
+        self.stacker.register_operator("+", lambda x1, x2: x1 - x2, 2, True)
+        self.assertEqual(self.evaluate("f"), [-1])
+
+    def test_opt_level_0(self):
+        stacker = Stacker(opt_level=0)
+        code = stacker.compiler.compile_expression("2 3 + dup drop")
+        self.assertEqual(len(code.instructions), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
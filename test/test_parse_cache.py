@@ -0,0 +1,63 @@
+import unittest
+
+from stacker.engine.compiler import block_cache
+from stacker.stacker import Stacker
+from stacker.syntax.parser import (
+    DEFAULT_PARSE_CACHE_SIZE,
+    parse_cache,
+    parse_expression,
+)
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        parse_cache.clear()
+        block_cache.clear()
+
+    def tearDown(self):
+        parse_cache.resize(DEFAULT_PARSE_CACHE_SIZE)
+        block_cache.resize(DEFAULT_PARSE_CACHE_SIZE)
+
+    def test_returns_new_lists(self):
+        tokens = parse_expression("1 2 + {3 4}")
+        tokens.append("x")
+        self.assertEqual(parse_expression("1 2 + {3 4}"), ["1", "2", "+", "{3 4}"])
+        self.assertEqual(parse_cache.stats()["hits"], 1)
+
+    def test_block_literal_is_a_cache_hit(self):
+        stacker = Stacker()
+        for _ in range(3):
+            stacker.process_expression("'n 1 -' read-from-string")
+            stacker.process_expression("{n 1 -}")
+        self.assertEqual(block_cache.stats()["misses"], 1)
+        self.assertEqual(block_cache.stats()["hits"], 5)
+        self.assertEqual(stacker.stack[-1].tokens, ["n", 1, "-"])
+
+    def test_block_tokens_are_not_shared(self):
+        stacker = Stacker()
+        stacker.process_expression("{1 2}")
+        stacker.stack[-1].tokens.append(3)
+        stacker.process_expression("{1 2}")
+        self.assertEqual(stacker.stack[-1].tokens, [1, 2])
+
+    def test_mutable_tokens_are_not_cached(self):
+        stacker = Stacker()
+        stacker.process_expression("{[1,2]}")
+        self.assertNotIn("[1,2]", block_cache)
+        self.assertEqual(stacker.stack[-1].tokens, [[1, 2]])
+
+    def test_size_and_stats(self):
+        stacker = Stacker()
+        stacker.set_parse_cache_size(2)
+        for expression in ("1", "2", "3", "3"):
+            stacker.process_expression(expression)
+        stats = stacker.get_parse_cache_stats()["expressions"]
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hit_rate"], 0.25)
+        with self.assertRaises(ValueError):
+            stacker.set_parse_cache_size(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
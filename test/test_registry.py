@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from stacker.manager.operator_index import OPERATOR_INDEX
+from stacker.manager.operator_manager import OperatorManager
+from stacker.manager.registry import LazyOperator, build_index, dispatch_table
+from stacker.stacker import Stacker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestRegistry(unittest.TestCase):
+    def test_index_is_up_to_date(self):
+        # Regenerate with stacker.manager.registry.write_index().
+        self.assertEqual(build_index(), OPERATOR_INDEX)
+
+    def test_modules_are_imported_on_first_use(self):
+        code = (
+            "import sys\n"
+            "from stacker.stacker import Stacker\n"
+            "stacker = Stacker()\n"
+            "stacker.process_expression('1 2 +')\n"
+            "print('stacker.lib.function.math' in sys.modules)\n"
+            "stacker.process_expression('16 sqrt')\n"
+            "print('stacker.lib.function.math' in sys.modules, stacker.stack[-1])\n"
+        )
+        self.assertEqual(self.run_cold(code), ["False", "True", "4.0"])
+
+    def run_cold(self, code):
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONPATH=ROOT),
+        )
+        return result.stdout.split()
+
+    def test_optimized_code_keeps_lazy_handlers(self):
+        # Code compiled before an operator is first called must still match
+        # the dispatch table after the call.
+        code = (
+            "from stacker.engine.instruction import Guarded\n"
+            "from stacker.stacker import Stacker\n"
+            "stacker = Stacker()\n"
+            "folded = stacker.compiler.compile_expression('5 2 3 + *')\n"
+            "stacker.eval('1 $x set x x + x *')\n"
+            "print(all(i.valid(stacker) for i in folded if isinstance(i, Guarded)))\n"
+        )
+        self.assertEqual(self.run_cold(code), ["True"])
+        code = (
+            "from stacker.engine import jit\n"
+            "from stacker.stacker import Stacker\n"
+            "ran = []\n"
+            "run = jit.LoopTrace._run\n"
+            "jit.LoopTrace._run = lambda *args: ran.append(run(*args)) or ran[-1]\n"
+            "stacker = Stacker()\n"
+            "stacker.eval('0 $s set 1 20000 $i {s i 2 3 + * + $s set} do')\n"
+            "print(sum(ran) > 19000, stacker.variables['s'])\n"
+        )
+        self.assertEqual(self.run_cold(code), ["True", "1000050000"])
+
+    def test_lazy_operator(self):
+        op = LazyOperator(
+            "stacker.lib.function.algebra", "alge_operators", "neg", {"arg_count": 1}
+        )
+        self.assertEqual(op.get("func"), None)
+        self.assertFalse(op.loaded)
+        self.assertEqual(op["func"](3), -3)
+        self.assertTrue(op.loaded)
+        with self.assertRaises(KeyError):
+            op["missing"]
+
+    def test_tables_are_shared_and_copied(self):
+        first = OperatorManager()
+        second = OperatorManager()
+        self.assertIs(
+            first.oprerators["regular"]["+"], second.oprerators["regular"]["+"]
+        )
+        first.register_operator("+", lambda x, y: x * y, 2, True)
+        self.assertIsNot(
+            first.oprerators["regular"]["+"], second.oprerators["regular"]["+"]
+        )
+        stacker = Stacker()
+        stacker.process_expression("3 4 +")
+        self.assertEqual(stacker.stack[-1], 7)
+
+    def test_handler_replaces_itself(self):
+        stacker = Stacker()
+        stacker.process_expression("5 neg")
+        handler = stacker.operator_manager.dispatch_table["neg"]
+        stacker.process_expression("neg")
+        self.assertIs(stacker.operator_manager.dispatch_table["neg"], handler)
+        self.assertEqual(list(stacker.stack), [5])
+        # Later interpreters start with the imported handler.
+        self.assertIs(dispatch_table()["neg"], handler)
+
+    def test_copy(self):
+        stacker = Stacker()
+        stacker.process_expression("2 3 ^")
+        copied = stacker.copy()
+        copied.process_expression("2 sqrt 1 +")
+        self.assertEqual(copied.stack[0], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
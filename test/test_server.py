@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from stacker.client import Client
+from stacker.error import ServerError
+from stacker.exec_modes.server_mode import ServerMode
+from stacker.stacker import Stacker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestServerMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "stacker.sock")
+        template = Stacker()
+        template.process_expression("{x} {x 2 *} $double defun")
+        self.mode = ServerMode(template, workers=2)
+        self.thread = threading.Thread(target=self.mode.run, args=(self.path,))
+        self.thread.start()
+        while self.mode.server is None or not os.path.exists(self.path):
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.mode.shutdown()
+        self.thread.join()
+        self.tmp.cleanup()
+
+    def test_session(self):
+        with Client(self.path) as client:
+            self.assertEqual(client.eval("21 double"), [42])
+            self.assertEqual(client.eval("{n} {n 1 +} $inc defun 1 inc"), [42, 2])
+            response = client.request("3 echo")
+            self.assertEqual(response["output"], "3\n")
+            self.assertEqual(response["stack"], [42, 2])
+
+    def test_sessions_are_isolated(self):
+        with Client(self.path) as first, Client(self.path) as second:
+            first.eval("7 $x set {n} {n 1 -} $down defun")
+            self.assertEqual(first.eval("x down"), [6])
+            with self.assertRaises(ServerError) as context:
+                second.eval("1 down")
+            self.assertEqual(context.exception.error_type, "UndefinedSymbolError")
+            self.assertEqual(second.eval("2 double"), [4])
+
+    def test_error_keeps_stack(self):
+        with Client(self.path) as client:
+            client.eval("1 2")
+            with self.assertRaises(ServerError):
+                client.eval("3 undefined_name")
+            self.assertEqual(client.eval("4"), [1, 2, 4])
+
+    def test_bad_request(self):
+        session = self.mode.new_session()
+        for line in ("not json", "[1]", '{"id": 5}', '{"expr": 1}'):
+            response = self.mode.handle(session, line)
+            self.assertFalse(response["ok"])
+        self.assertEqual(response["error"]["type"], "ValueError")
+
+    def test_command_line_client(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "stacker.client", self.path, "1 2 +", "5 double"],
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONPATH=ROOT),
+        )
+        self.assertEqual(result.stdout.splitlines(), ["[3]", "[3, 10]"])
+        self.assertEqual(result.returncode, 0)
+
+    def test_conflicting_options(self):
+        for args in (
+            ["--client", self.path, "1 2 +"],
+            ["--client", self.path, "--jobs", "2"],
+            ["--serve", self.path, "script.stk"],
+            ["--serve", self.path, "-e", "1 2 +"],
+        ):
+            result = subprocess.run(
+                [sys.executable, "-m", "stacker", *args],
+                capture_output=True,
+                text=True,
+                env=dict(os.environ, PYTHONPATH=ROOT),
+            )
+            self.assertEqual(result.returncode, 2, args)
+            self.assertIn("cannot be combined", result.stderr)
+
+    def test_exit_closes_session(self):
+        with Client(self.path) as client:
+            response = client.request("1 exit")
+            self.assertTrue(response["exit"])
+            with self.assertRaises(ServerError):
+                client.eval("1")
+
+
+if __name__ == "__main__":
+    unittest.main()
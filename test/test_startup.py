@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run `python -m stacker ARGS`, then print the interactive modules imported.
+CHECK = """
+import runpy, sys
+sys.argv = ["stacker", *sys.argv[1:]]
+runpy.run_module("stacker", run_name="__main__")
+print(*sorted(m for m in ("prompt_toolkit", "pkg_resources") if m in sys.modules))
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = dict(os.environ, HOME=self.tmp.name, PYTHONPATH=ROOT)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_stacker(self, *args):
+        result = subprocess.run(
+            [sys.executable, "-c", CHECK, *args],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=self.env,
+        )
+        return result.stdout.splitlines()
+
+    def test_one_shot_skips_interactive_dependencies(self):
+        self.assertEqual(self.run_stacker("-e", "1 2 + echo"), ["3", ""])
+
+    def test_script_skips_interactive_dependencies(self):
+        script = os.path.join(self.tmp.name, "script.stk")
+        with open(script, "w") as f:
+            f.write("6 7 * echo\n")
+        self.assertEqual(self.run_stacker(script), ["42", ""])
+
+    def test_repl_mode_is_still_exported(self):
+        from stacker.exec_modes import ReplMode
+        from stacker.exec_modes.repl_mode import ReplMode as repl_mode
+
+        self.assertIs(ReplMode, repl_mode)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+from stacker.include.stk_file_read import iter_statements, read_lines, readtxt
+
+SCRIPT = """\
+# comment
+1 2 +
+\"\"\"
+block comment {
+\"\"\"
+{n} {
+  n 2 * # double
+} $f defun
+
+[1 2;
+ 3 4]
+3 f
+{ unclosed
+"""
+
+
+def is_balanced(expression):
+    return all(
+        expression.count(open_char) == expression.count(close_char)
+        for open_char, close_char in ("[]", "()", "{}")
+    ) and (expression.count('"""') % 2 == expression.count("'''") % 2 == 0)
+
+
+def split(code, strip_comments):
+    """The statement splitting `iter_statements` replaced."""
+    statements = []
+    expression = ""
+    for line in code.splitlines():
+        if strip_comments:
+            sharp_index = line.find("#")
+            if sharp_index != -1:
+                line = line[:sharp_index]
+        expression += line.strip() + " "
+        if is_balanced(expression):
+            if not expression.isspace():
+                statements.append(expression)
+            expression = ""
+    return statements
+
+
+class TestStkFileRead(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".stk")
+        with os.fdopen(fd, "w") as f:
+            f.write(SCRIPT)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_read_lines(self):
+        self.assertEqual(
+            "".join(read_lines(self.path)).rstrip("\n"), readtxt(self.path)
+        )
+        self.assertNotIn("block comment {\n", list(read_lines(self.path)))
+
+    def test_same_statements_as_accumulating(self):
+        code = readtxt(self.path)
+        for strip_comments in (False, True):
+            with self.subTest(strip_comments=strip_comments):
+                statements = list(
+                    iter_statements(read_lines(self.path), strip_comments)
+                )
+                self.assertEqual(statements, split(code, strip_comments))
+
+    def test_statements(self):
+        statements = list(iter_statements(read_lines(self.path), strip_comments=True))
+        self.assertEqual(
+            statements,
+            ["1 2 + ", "{n} { n 2 * } $f defun ", "[1 2; 3 4] ", "3 f "],
+        )
+
+    def test_lines_are_consumed_lazily(self):
+        def lines():
+            yield "1 {"
+            yield "2 }"
+            raise AssertionError("read past the statement")
+
+        self.assertEqual(next(iter_statements(lines())), "1 { 2 } ")
+
+
+if __name__ == "__main__":
+    unittest.main()
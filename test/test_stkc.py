@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from stacker.include import stkc
+from stacker.include.stkc import CompiledCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def tokenize(path):
+    return stkc._script_tokens(path)
+
+
+class TestCompiledCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.script = Path(self.tmp.name) / "script.stk"
+        self.script.write_text("1 2 +\n{n} {\n n 2 *\n} $f defun # comment\n")
+        self.cache = CompiledCache(Path(self.tmp.name) / "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def load(self):
+        return list(self.cache.load(self.script, "script", tokenize))
+
+    def test_hit_after_miss(self):
+        expected = [["1", "2", "+"], ["{n}", "{ n 2 * }", "$f", "defun"]]
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+        self.assertEqual(len(list(self.cache.directory.glob("*.stkc"))), 1)
+
+    def test_changed_source_is_reloaded(self):
+        self.load()
+        self.script.write_text("3 4 *\n")
+        os.utime(self.script, ns=(0, 0))
+        self.assertEqual(self.load(), [["3", "4", "*"]])
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 2})
+
+    def test_stale_or_broken_entries_are_ignored(self):
+        self.load()
+        path = self.cache.path_for(self.script.resolve(), "script")
+        for data in (b"", b"STKC\x00garbage", path.read_bytes()[:-3]):
+            path.write_bytes(data)
+            self.assertEqual(self.load()[0], ["1", "2", "+"])
+        version = stkc.FORMAT_VERSION
+        try:
+            stkc.FORMAT_VERSION += 1
+            self.load()
+        finally:
+            stkc.FORMAT_VERSION = version
+        self.assertEqual(self.cache.stats()["misses"], 5)
+
+    def test_damaged_entry_resumes_from_source(self):
+        self.script.write_text("".join(f"{i} drop\n" for i in range(100)))
+        expected = self.load()
+        path = self.cache.path_for(self.script.resolve(), "script")
+        path.write_bytes(path.read_bytes()[: path.stat().st_size // 2])
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 2})
+
+    def test_large_script_is_streamed(self):
+        self.script.write_text("1 2 + drop\n" * 20000)
+        for _ in range(2):  # a miss, then a hit
+            tracemalloc.start()
+            count = sum(1 for _ in self.cache.load(self.script, "script", tokenize))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertEqual(count, 20000)
+            self.assertLess(peak, 1 << 20)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_tokens_are_not_shared(self):
+        self.load()
+        self.load()[0].append("x")
+        self.assertEqual(self.load()[0], ["1", "2", "+"])
+
+    def test_disabled_and_clear(self):
+        self.cache.enabled = False
+        self.load()
+        self.assertFalse(self.cache.directory.exists())
+        self.cache.enabled = True
+        self.load()
+        self.cache.clear()
+        self.assertEqual(list(self.cache.directory.glob("*.stkc")), [])
+
+    def test_command_line(self):
+        env = dict(os.environ, HOME=self.tmp.name, PYTHONPATH=ROOT)
+        cache_dir = Path(self.tmp.name) / ".cache" / "stacker"
+        self.script.write_text("1 2 + echo\n")
+        for flags in (["--no-compiled-cache"], [], []):
+            result = subprocess.run(
+                [sys.executable, "-m", "stacker", *flags, str(self.script)],
+                check=True,
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+            self.assertEqual(result.stdout.splitlines()[0], "3")
+            self.assertEqual(bool(list(cache_dir.glob("script-*.stkc"))), not flags)
+        subprocess.run(
+            [sys.executable, "-m", "stacker", "--clear-compiled-cache"],
+            check=True,
+            env=env,
+        )
+        self.assertEqual(list(cache_dir.glob("*.stkc")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+
+from stacker.engine.superinstruction import Fused, load_profile
+from stacker.stacker import Stacker
+
+FIB = "{n} {n 2 < {n} {n 1 - fib n 2 - fib +} ifelse} $fib defun"
+
+PATTERNS = [
+    ("dup", "*"),
+    ("<num>", "+"),
+    ("<name>", "<num>", "-", "<name>"),
+    ("<name>", "<num>", "<"),
+    ("over", "over"),
+    ("<num>", "<num>", "swap"),
+]
+
+
+def fusing_stacker(vm=False):
+    stacker = Stacker(vm=vm)
+    stacker.compiler.load_superinstructions(write_profile(PATTERNS))
+    return stacker
+
+
+def write_profile(patterns):
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(
+            {
+                "format": "stacker-superinstructions",
+                "version": 1,
+                "sequences": [{"pattern": list(p), "count": 1} for p in patterns],
+            },
+            f,
+        )
+    return path
+
+
+class TestSuperinstruction(unittest.TestCase):
+    expressions = [
+        "7 dup *",
+        "1 2 3 + 4 +",
+        "3 4 over over",
+        "1 2 swap",
+        FIB + " 15 fib",
+        "0 $s set 1 10 $i {s i dup * + $s set} do s",
+        "{1 dup * 0 /} {'caught'} iferror",
+    ]
+
+    def test_same_result_as_unfused(self):
+        for vm in (False, True):
+            for expression in self.expressions:
+                with self.subTest(expression=expression, vm=vm):
+                    plain = Stacker(vm=vm)
+                    fused = fusing_stacker(vm=vm)
+                    plain.process_expression(expression)
+                    fused.process_expression(expression)
+                    self.assertEqual(list(fused.stack), list(plain.stack))
+
+    def test_sequences_are_fused(self):
+        stacker = fusing_stacker()
+        code = stacker.compiler.compile(["x", "dup", "*", "1", "+"])
+        self.assertEqual([type(i) for i in code.instructions][1:], [Fused, Fused])
+
+    def test_falls_back_when_operator_is_shadowed(self):
+        stacker = fusing_stacker()
+        stacker.process_expression("{+} $* defmacro")
+        stacker.process_expression("5 dup *")
+        self.assertEqual(stacker.stack[-1], 10)
+
+    def test_error_leaves_stack_as_unfused(self):
+        plain = Stacker()
+        fused = fusing_stacker()
+        for stacker in (plain, fused):
+            with self.assertRaises(Exception):
+                stacker.process_expression("'a' 1 +")
+        self.assertEqual(list(fused.stack), list(plain.stack))
+
+    def test_profile_round_trip(self):
+        stacker = Stacker()
+        profiler = stacker.compiler.start_profiling()
+        stacker.process_expression(FIB)
+        stacker.process_expression("12 fib")
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        profiler.save(path, limit=8)
+        patterns = load_profile(path)
+        self.assertEqual(len(patterns), 8)
+        self.assertIn(("<name>", "<num>", "-", "<name>"), patterns)
+        self.assertNotIn(("<name>", "<num>"), patterns)
+
+        fused = Stacker()
+        fused.compiler.load_superinstructions(path)
+        fused.process_expression(FIB)
+        fused.process_expression("12 fib")
+        self.assertEqual(fused.stack[-1], 144)
+
+    def test_rejects_other_files(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"sequences": []}, f)
+        with self.assertRaises(ValueError):
+            load_profile(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
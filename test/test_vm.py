@@ -0,0 +1,64 @@
+import sys
+import unittest
+
+from stacker.error import UndefinedSymbolError
+from stacker.stacker import Stacker
+
+
+class TestVirtualMachine(unittest.TestCase):
+    expressions = [
+        "1 2 + 3 *",
+        "0 $s set 1 10 $i {s i + $s set} do s",
+        "1 {2 3 +} 3 times",
+        "[1 2 3] $x {x 5 == {break} if x} dolist",
+        "1 10 $i {i 5 == {break} if i} do",
+        "{1 2 <} {10} {20} ifelse",
+        "{1 0 /} {-1} iferror",
+        "{x y} {x y +} $add defun 2 3 add",
+        "{dup *} $square defmacro 4 square",
+        "{x} {x 1 +} lambda $inc set 41 inc",
+        "'1 2 +' eval {3 4 *} eval",
+        "{n} {n 1 <= {1} {n 1 - fact n *} ifelse} $fact defun 10 fact",
+    ]
+
+    def test_same_result_as_recursive_evaluation(self):
+        for expression in self.expressions:
+            with self.subTest(expression=expression):
+                recursive = Stacker()
+                vm = Stacker(vm=True)
+                recursive.process_expression(expression)
+                vm.process_expression(expression)
+                self.assertEqual(list(vm.stack), list(recursive.stack))
+
+    def test_blocks_inherit_vm_flag(self):
+        stacker = Stacker(vm=True)
+        stacker.process_expression("{1 2 +}")
+        self.assertTrue(stacker.stack[-1].vm)
+
+    def test_deep_recursion(self):
+        # Far deeper than recursive evaluation can go (several Python frames
+        # per Stacker call).
+        depth = sys.getrecursionlimit() + 200
+        stacker = Stacker(vm=True)
+        stacker.process_expression(
+            "{n} {n 0 == {0} {n 1 - count 1 +} ifelse} $count defun"
+        )
+        stacker.process_expression(f"{depth} count")
+        self.assertEqual(stacker.stack[-1], depth)
+
+    def test_iferror_catches_error_from_nested_call(self):
+        stacker = Stacker(vm=True)
+        stacker.process_expression("{x} {x undefined_symbol} $f defun")
+        stacker.process_expression("{1 f} {'caught'} iferror")
+        self.assertEqual(stacker.stack[-1], "caught")
+
+    def test_uncaught_error(self):
+        stacker = Stacker(vm=True)
+        with self.assertRaises(UndefinedSymbolError):
+            stacker.process_expression("1 3 $i {i undefined_symbol} do")
+        stacker.process_expression("1 2 +")
+        self.assertEqual(stacker.stack[-1], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()